@@ -1,19 +1,40 @@
-from fastapi import APIRouter, Request, HTTPException
+from fastapi import APIRouter, Request, HTTPException, Query
 from fastapi.responses import StreamingResponse
 import asyncio
+from typing import Optional
 from backend.app.services.chat_service import chat_service
+from backend.app.rag.rag_service import rag_service
+from backend.app.core.sse import sse_encoder
 
 from backend.app.core.exceptions import ValidationError, NotFoundError
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
 @router.get("/history/{thread_id}")
-async def get_chat_history(thread_id: str):
-    return {"messages": await chat_service.get_history(thread_id)}
+async def get_chat_history(
+    thread_id: str,
+    limit: int = Query(50, ge=1, le=200),
+    before: Optional[int] = Query(None, ge=0),
+    include_details: bool = False
+):
+    """Latest `limit` messages; pass `next_cursor` as `before` to load older ones."""
+    return await chat_service.get_history(thread_id, limit, before, include_details)
+
+@router.post("/sources/hydrate")
+async def hydrate_sources(request: Request):
+    """Resolve compact source references to chunk text (e.g. when a citation is opened)."""
+    data = await request.json()
+    sources = data.get("sources")
+    if not isinstance(sources, list):
+        raise ValidationError("sources must be a list")
+    return {"sources": await rag_service.hydrate_sources(sources, data.get("workspace_id", "default"))}
 
 @router.get("/threads")
-async def list_chat_threads(workspace_id: str = "default"):
-    return {"threads": await chat_service.list_threads(workspace_id)}
+async def list_chat_threads(workspace_id: str = "default", limit: int = Query(50, ge=1, le=200), cursor: Optional[str] = None):
+    threads = await chat_service.list_threads(workspace_id, limit, cursor)
+    # Pass next_cursor back as `cursor` to fetch the following page
+    next_cursor = chat_service.thread_cursor(threads[-1]) if len(threads) == limit else None
+    return {"threads": threads, "next_cursor": next_cursor}
 
 @router.patch("/threads/{thread_id}/title")
 async def update_thread_title(thread_id: str, request: Request):
@@ -40,6 +61,7 @@ async def chat_stream(request: Request):
     asyncio.create_task(chat_service.generate_title(message, thread_id, workspace_id))
     
     return StreamingResponse(
-        chat_service.stream_updates(message, thread_id, workspace_id),
-        media_type="text/event-stream"
+        sse_encoder.frames(chat_service.stream_updates(message, thread_id, workspace_id)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
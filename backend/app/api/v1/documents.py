@@ -1,5 +1,8 @@
-from fastapi import APIRouter, Request, UploadFile, File, HTTPException, BackgroundTasks
-from backend.app.services.document_service import document_service
+from fastapi import APIRouter, Request, UploadFile, File, HTTPException, BackgroundTasks, Query, Header
+from fastapi.responses import Response, StreamingResponse
+from typing import Literal, Optional
+from backend.app.core.text_artifacts import text_artifacts
+from backend.app.services.document_service import document_service, DOCUMENT_PAGE_SIZE
 
 from backend.app.core.exceptions import ValidationError, NotFoundError
 
@@ -26,12 +29,65 @@ async def upload_document(
     }
 
 @router.get("/documents")
-async def list_documents(workspace_id: str = "default"):
-    return await document_service.list_by_workspace(workspace_id)
+async def list_documents(
+    workspace_id: str = "default",
+    limit: int = Query(DOCUMENT_PAGE_SIZE, ge=1, le=500),
+    cursor: Optional[str] = None,
+    sort: Literal["created_at", "filename"] = "created_at",
+    order: Literal["asc", "desc"] = "desc"
+):
+    return await document_service.list_by_workspace(workspace_id, limit, cursor, sort, order)
 
 @router.get("/documents-all")
-async def list_all_documents():
-    return await document_service.list_all()
+async def list_all_documents(
+    limit: int = Query(DOCUMENT_PAGE_SIZE, ge=1, le=500),
+    cursor: Optional[str] = None,
+    sort: Literal["created_at", "filename"] = "created_at",
+    order: Literal["asc", "desc"] = "desc"
+):
+    return await document_service.list_all(limit, cursor, sort, order)
+
+# Declared before /documents/{name:path}, which would otherwise capture the suffix
+@router.get("/documents/{name:path}/chunks")
+async def get_document_chunks(
+    name: str,
+    limit: int = Query(100, ge=1, le=500),
+    start: int = Query(0, ge=0, description="Chunk index to start from (next_offset of the previous page)")
+):
+    return await document_service.get_chunks(name, limit=limit, start=start)
+
+@router.get("/documents/{name:path}/inspect")
+async def inspect_document(name: str, limit: int = Query(100, ge=1, le=500), start: int = Query(0, ge=0)):
+    return await document_service.inspect(name, limit=limit, start=start)
+
+@router.get("/documents/{name:path}/content")
+async def get_document_content(name: str, range_header: Optional[str] = Header(None, alias="Range")):
+    """
+    Extracted text of a document as UTF-8, streamed from its text artifact.
+    Honors a single `Range: bytes=...` request (206), so long documents can be read in pieces.
+    """
+    meta = await document_service.get_text_artifact(name)
+    if not meta:
+        raise NotFoundError(f"No extracted text available for '{name}'")
+
+    length = meta["length"]
+    try:
+        byte_range = text_artifacts.parse_range(range_header, length)
+    except ValueError:
+        return Response(status_code=416, headers={"Content-Range": f"bytes */{length}"})
+
+    start, end = byte_range or (0, length - 1)
+    headers = {"Accept-Ranges": "bytes", "Content-Length": str(max(end - start + 1, 0))}
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end}/{length}"
+    # The iterator blocks on MinIO; Starlette runs sync iterators in its threadpool
+    body = text_artifacts.iter_range(meta, start, end) if length else iter(())
+    return StreamingResponse(
+        body,
+        status_code=206 if byte_range else 200,
+        media_type="text/plain; charset=utf-8",
+        headers=headers
+    )
 
 @router.get("/documents/{name:path}")
 async def get_document(name: str):
@@ -48,14 +104,6 @@ async def delete_document(name: str, workspace_id: str = "default", vault_delete
     await document_service.delete(name, workspace_id, vault_delete=vault_delete)
     return {"status": "success", "message": f"Document {name} deleted."}
 
-@router.get("/documents/{name:path}/chunks")
-async def get_document_chunks(name: str, limit: int = 100):
-    return await document_service.get_chunks(name, limit=limit)
-
-@router.get("/documents/{name:path}/inspect")
-async def inspect_document(name: str):
-    return await document_service.inspect(name)
-
 @router.post("/documents/update-workspaces")
 async def update_document_workspaces(request: Request):
     data = await request.json()
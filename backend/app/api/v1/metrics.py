@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+from backend.app.rag.retrieval_cache import retrieval_cache
+from backend.app.rag.semantic_cache import semantic_cache
+from backend.app.graph.prompt import prompt_cache_stats
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+@router.get("/")
+async def get_metrics():
+    """Expose in-process cache statistics."""
+    return {
+        "retrieval_cache": retrieval_cache.stats(),
+        "semantic_cache": semantic_cache.stats(),
+        "prompt_cache": prompt_cache_stats.stats()
+    }
@@ -1,9 +1,20 @@
 from fastapi import APIRouter, Query
-from typing import Optional
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from backend.app.core.config import ai_settings
+from backend.app.core.exceptions import ValidationError
+from backend.app.core.sse import sse_encoder
+from backend.app.rag.rag_service import rag_service
 from backend.app.services.search_service import search_service
 
 router = APIRouter(prefix="/search", tags=["search"])
 
+class FederatedSearchRequest(BaseModel):
+    query: str = Field(..., min_length=2)
+    workspace_ids: List[str] = Field(..., min_length=1)
+    limit: Optional[int] = Field(None, ge=1, le=50)
+
 @router.get("/")
 async def global_search(
     q: str = Query(..., min_length=2, description="Search query"),
@@ -13,3 +24,30 @@ async def global_search(
     Perform a unified search across all architectural entities.
     """
     return await search_service.global_search(q, workspace_id)
+
+
+@router.get("/stream")
+async def global_search_stream(
+    q: str = Query(..., min_length=2, description="Search query"),
+    workspace_id: Optional[str] = Query(None, description="Optional workspace scope")
+):
+    """
+    Same search as `/search`, streamed as server-sent events so that fast
+    sources (metadata, small collections) are shown before slow ones finish.
+    """
+    return StreamingResponse(
+        sse_encoder.frames(search_service.stream_search(q, workspace_id)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/federated")
+async def federated_search(request: FederatedSearchRequest):
+    """
+    Retrieve chunks from several workspaces at once, whatever their embedding
+    configuration. `legs` reports the status of every collection queried.
+    """
+    if len(set(request.workspace_ids)) > ai_settings.FEDERATED_MAX_WORKSPACES:
+        raise ValidationError(f"At most {ai_settings.FEDERATED_MAX_WORKSPACES} workspaces can be searched at once")
+    return await rag_service.federated_search(request.query, request.workspace_ids, request.limit)
@@ -1,5 +1,5 @@
 from typing import List, Optional, Literal
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
 from pydantic import BaseModel
 from backend.app.services.workspace_service import workspace_service
 from backend.app.core.exceptions import ValidationError, NotFoundError
@@ -9,6 +9,8 @@ router = APIRouter(prefix="/workspaces", tags=["workspaces"])
 class WorkspaceStats(BaseModel):
     thread_count: int = 0
     doc_count: int = 0
+    chunk_count: int = 0
+    size_bytes: int = 0
 
 class Workspace(BaseModel):
     id: str
@@ -19,6 +21,7 @@ class Workspace(BaseModel):
 class WorkspaceDetail(Workspace):
     threads: List[dict] = []
     documents: List[dict] = []
+    documents_next_cursor: Optional[str] = None
     settings: Optional[dict] = None
 
 class WorkspaceCreate(BaseModel):
@@ -30,6 +33,7 @@ class WorkspaceCreate(BaseModel):
     embedding_dim: Optional[int] = 1536
     chunk_size: Optional[int] = 800
     chunk_overlap: Optional[int] = 150
+    chunking_mode: Optional[Literal["character", "token"]] = "character"
     neo4j_uri: Optional[str] = None
     neo4j_user: Optional[str] = None
     neo4j_password: Optional[str] = None
@@ -56,11 +60,17 @@ async def update_workspace(workspace_id: str, ws: WorkspaceUpdate):
     return await workspace_service.update(workspace_id, update_data)
 
 @router.delete("/{workspace_id}")
-async def delete_workspace(workspace_id: str, vault_delete: bool = False):
+async def delete_workspace(workspace_id: str, background_tasks: BackgroundTasks, vault_delete: bool = False):
     if workspace_id == "default":
         raise ValidationError("Cannot delete default workspace")
-    await workspace_service.delete(workspace_id, vault_delete=vault_delete)
-    return {"status": "success", "message": f"Workspace {workspace_id} deleted"}
+    # The workspace disappears from listings now; its data is removed by the background teardown
+    task_id = await workspace_service.delete(workspace_id, vault_delete=vault_delete)
+    background_tasks.add_task(workspace_service.run_teardown, task_id, workspace_id, vault_delete)
+    return {
+        "status": "pending",
+        "task_id": task_id,
+        "message": f"Workspace {workspace_id} deletion started in background."
+    }
 
 @router.get("/{workspace_id}/details", response_model=WorkspaceDetail)
 async def get_workspace_details(workspace_id: str):
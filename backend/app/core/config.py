@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import Literal, Optional
 
 class AISettings(BaseSettings):
     # LLM Configuration
@@ -12,20 +12,35 @@ class AISettings(BaseSettings):
     LLAMACPP_BASE_URL: str = "http://localhost:8081/v1"
     BACKEND_PORT: int = 8000
     
+    # Streaming Configuration
+    SSE_COALESCE_MS: float = 20  # Max delay before buffered content deltas are flushed
+    SSE_COALESCE_BYTES: int = 256  # Flush buffered content once it reaches this size
+    SSE_HEARTBEAT_SECONDS: float = 15  # Idle interval before a keep-alive comment is sent
+    
     # Embedding Configuration
     EMBEDDING_PROVIDER: str = "openai"  # openai, voyage, local, ollama, vllm, llama-cpp
     EMBEDDING_MODEL: str = "text-embedding-3-small"
     VOYAGE_API_KEY: Optional[str] = None
     LOCAL_EMBEDDING_MODEL: str = "BAAI/bge-large-en-v1.5"
+    EMBEDDING_BATCH_MAX_TOKENS: int = 100000  # Upper bound on tokens sent per embedding request
     
     # RAG Configuration
     QDRANT_HOST: str = "localhost"
     QDRANT_PORT: int = 6333
     HYBRID_SEARCH_ALPHA: float = 0.5  # Balance between vector and keyword
+    RETRIEVAL_CACHE_SIZE: int = 512  # Max cached search results per process (0 disables)
+    SEMANTIC_CACHE_MAX_ENTRIES: int = 256  # Cached answers kept per workspace
+    CHUNK_TEXT_CACHE_SIZE: int = 4096  # Chunk texts kept in memory for source hydration (0 disables)
+    SEARCH_COLLECTION_TIMEOUT_SECONDS: float = 2.0  # Per-collection budget of the chunk content search
+    FEDERATED_LEG_TIMEOUT_SECONDS: float = 5.0  # Deadline of each federated search leg from the start of the request (query embedding included)
+    FEDERATED_MAX_WORKSPACES: int = 50  # Workspaces accepted by one federated search
+    GRAPH_CACHE_SIZE: int = 64  # Workspace document graphs kept per process (0 disables)
     
     # MongoDB Configuration
     MONGO_URI: str = "mongodb://localhost:27017"
     MONGO_DB: str = "ai_architect"
+    WORKSPACE_STATS_RECONCILE_SECONDS: float = 900  # Interval of the workspace counter drift correction (0 disables)
+    CHECKPOINT_DURABILITY: Literal["sync", "async", "exit"] = "async"  # sync: every step, async: flushed in background, exit: end of turn only
 
     # MinIO Configuration
     MINIO_ENDPOINT: str = "localhost:9000"
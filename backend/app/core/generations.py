@@ -0,0 +1,47 @@
+from typing import Iterable, Optional
+from backend.app.core.mongodb import mongodb_manager
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ContentGenerationManager:
+    """
+    Tracks a monotonically increasing content generation per workspace.
+    Any write that changes what a workspace can retrieve (ingest, delete, share, move)
+    bumps it, so caches keyed on the generation never serve stale results.
+    """
+    collection_name = "workspace_generations"
+
+    async def get(self, workspace_id: Optional[str]) -> int:
+        db = mongodb_manager.get_async_database()
+        doc = await db[self.collection_name].find_one(
+            {"workspace_id": workspace_id or "default"},
+            {"generation": 1}
+        )
+        return doc.get("generation", 0) if doc else 0
+
+    async def bump(self, *workspace_ids: Optional[str]):
+        """Increment the generation of every given workspace (duplicates and empty ids are ignored)."""
+        ids = self._unique(workspace_ids)
+        if not ids:
+            return
+        db = mongodb_manager.get_async_database()
+        for ws_id in ids:
+            try:
+                await db[self.collection_name].update_one(
+                    {"workspace_id": ws_id},
+                    {"$inc": {"generation": 1}},
+                    upsert=True
+                )
+            except Exception as e:
+                logger.error(f"Failed to bump content generation for workspace {ws_id}: {e}")
+
+    @staticmethod
+    def _unique(workspace_ids: Iterable[Optional[str]]) -> list:
+        seen = []
+        for ws_id in workspace_ids:
+            if ws_id and ws_id not in seen:
+                seen.append(ws_id)
+        return seen
+
+content_generations = ContentGenerationManager()
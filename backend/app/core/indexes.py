@@ -0,0 +1,85 @@
+import logging
+from typing import Dict, List
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+from backend.app.core.mongodb import mongodb_manager
+
+logger = logging.getLogger(__name__)
+
+# Declarative index registry, applied idempotently at startup (see main.lifespan).
+# Keep it in step with the queries in app/services and app/core; scripts/audit_queries.py
+# explains those queries and flags any that still fall back to a collection scan.
+INDEXES: Dict[str, List[IndexModel]] = {
+    "documents": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        # Not unique: documents moved to the vault may share a filename.
+        # The (.., sort field, id) keys also serve the keyset-paginated listings
+        IndexModel([("workspace_id", ASCENDING), ("filename", ASCENDING), ("id", ASCENDING)]),
+        IndexModel([("workspace_id", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)]),
+        IndexModel([("shared_with", ASCENDING), ("filename", ASCENDING), ("id", ASCENDING)]),
+        IndexModel([("shared_with", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)]),
+        IndexModel([("filename", ASCENDING), ("id", ASCENDING)]),
+        IndexModel([("created_at", ASCENDING), ("id", ASCENDING)]),
+        IndexModel([("content_hash", ASCENDING)]),
+        IndexModel([("minio_path", ASCENDING)]),
+        # Multikey edge n-gram indexes for the global search (core/search_keys.py)
+        IndexModel([("search_keys", ASCENDING)]),
+        IndexModel([("workspace_id", ASCENDING), ("search_keys", ASCENDING)]),
+    ],
+    "workspaces": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("name", ASCENDING)], unique=True),
+        IndexModel([("search_keys", ASCENDING)]),
+    ],
+    "workspace_settings": [
+        IndexModel([("workspace_id", ASCENDING)], unique=True),
+    ],
+    "workspace_generations": [
+        IndexModel([("workspace_id", ASCENDING)], unique=True),
+    ],
+    "thread_metadata": [
+        IndexModel([("thread_id", ASCENDING)], unique=True),
+        IndexModel([("workspace_id", ASCENDING), ("last_active", DESCENDING), ("thread_id", DESCENDING)]),
+        IndexModel([("search_keys", ASCENDING)]),
+        IndexModel([("workspace_id", ASCENDING), ("search_keys", ASCENDING)]),
+    ],
+    "chat_messages": [
+        IndexModel([("thread_id", ASCENDING), ("seq", DESCENDING)], unique=True),
+    ],
+    # Same keys the LangGraph checkpointer creates on first use, declared so a fresh
+    # deployment has them before the first turn and the audit can check them
+    "checkpoints": [
+        IndexModel(
+            [("thread_id", ASCENDING), ("checkpoint_ns", ASCENDING), ("checkpoint_id", DESCENDING)],
+            unique=True
+        ),
+    ],
+    "checkpoint_writes": [
+        IndexModel(
+            [("thread_id", ASCENDING), ("checkpoint_ns", ASCENDING), ("checkpoint_id", DESCENDING),
+             ("task_id", ASCENDING), ("idx", ASCENDING)],
+            unique=True
+        ),
+    ],
+}
+
+async def ensure_indexes() -> Dict[str, List[str]]:
+    """
+    Create every registered index that does not exist yet.
+    Failures (e.g. duplicates blocking a unique index) are logged per index
+    and never stop startup. Returns the index names ensured per collection.
+    """
+    db = mongodb_manager.get_async_database()
+    applied: Dict[str, List[str]] = {}
+    failed = 0
+    for collection, models in INDEXES.items():
+        applied[collection] = []
+        # One command per index so a single conflict does not block the others
+        for model in models:
+            try:
+                applied[collection] += await db[collection].create_indexes([model])
+            except OperationFailure as e:
+                failed += 1
+                logger.error(f"Failed to create index {model.document['key']} on '{collection}': {e}")
+    logger.info(f"MongoDB indexes ensured ({failed} failed)")
+    return applied
@@ -1,8 +1,10 @@
 from minio import Minio
+from minio.deleteobjects import DeleteObject
 from minio.error import S3Error
 from backend.app.core.config import ai_settings
 import logging
 import io
+from typing import List
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +57,16 @@ class MinioManager:
             logger.error(f"MinIO upload error: {e}")
             raise
 
+    def file_exists(self, object_name: str) -> bool:
+        """Whether an object exists; a missing key is an expected answer, not an error."""
+        try:
+            self.client.stat_object(ai_settings.MINIO_BUCKET, object_name)
+            return True
+        except S3Error as e:
+            if e.code != "NoSuchKey":
+                logger.error(f"MinIO stat error: {e}")
+            return False
+
     def get_file(self, object_name: str):
         """Get file content."""
         try:
@@ -68,6 +80,19 @@ class MinioManager:
                 response.close()
                 response.release_conn()
 
+    def get_file_range(self, object_name: str, offset: int, length: int):
+        """Get `length` bytes of an object starting at `offset`."""
+        try:
+            response = self.client.get_object(ai_settings.MINIO_BUCKET, object_name, offset=offset, length=length)
+            return response.read()
+        except S3Error as e:
+            logger.error(f"MinIO ranged download error: {e}")
+            return None
+        finally:
+            if 'response' in locals():
+                response.close()
+                response.release_conn()
+
     def get_presigned_url(self, object_name: str, expires_hours: int = 1):
         """Generate a presigned URL for preview/download."""
         try:
@@ -88,4 +113,19 @@ class MinioManager:
         except S3Error as e:
             logger.error(f"MinIO delete error: {e}")
 
+    def delete_files(self, object_names: List[str], batch_size: int = 1000) -> int:
+        """Remove many objects with multi-object delete requests; returns the number of failures."""
+        failed = 0
+        for start in range(0, len(object_names), batch_size):
+            batch = [DeleteObject(name) for name in object_names[start:start + batch_size]]
+            try:
+                # remove_objects is lazy, iterating the result sends the request
+                for error in self.client.remove_objects(ai_settings.MINIO_BUCKET, batch):
+                    failed += 1
+                    logger.error(f"MinIO delete error for {error.name}: {error.message}")
+            except S3Error as e:
+                failed += len(batch)
+                logger.error(f"MinIO bulk delete error: {e}")
+        return failed
+
 minio_manager = MinioManager()
@@ -17,10 +17,18 @@ class AppSettings(BaseModel):
     retrieval_mode: Literal["hybrid", "vector", "keyword"] = Field(default="hybrid", description="Search strategy")
     search_limit: int = Field(default=5, ge=1, le=20, description="Top-K results")
     hybrid_alpha: float = Field(default=0.5, ge=0.0, le=1.0, description="Weight between vector and keyword")
+    context_token_budget: int = Field(default=3000, ge=256, description="Max tokens of retrieved context sent to the LLM (capped by the model window)")
+    retrieval_strategy: Literal["flat", "hierarchical"] = Field(default="flat", description="hierarchical: pick documents by centroid first, then search their chunks")
+    hierarchical_top_documents: int = Field(default=20, ge=1, le=200, description="Documents kept by the centroid stage of hierarchical retrieval")
+    
+    # Semantic Answer Cache (opt-in)
+    semantic_cache_enabled: bool = Field(default=False, description="Replay answers for near-duplicate questions")
+    semantic_cache_threshold: float = Field(default=0.95, ge=0.5, le=1.0, description="Minimum query similarity for a cache hit")
     
     # RAG Config (Fixed at workspace creation for consistency)
     chunk_size: int = Field(default=800, ge=100, le=2000)
     chunk_overlap: int = Field(default=150, ge=0, le=500)
+    chunking_mode: Literal["character", "token"] = Field(default="character", description="Unit for chunk_size/chunk_overlap")
     embedding_dim: int = Field(default=1536, description="Fixed dimension for vector consistency")
     
     # Neo4j Graph Settings (Used if rag_engine='graph')
@@ -28,6 +36,9 @@ class AppSettings(BaseModel):
     neo4j_user: Optional[str] = Field(default=None)
     neo4j_password: Optional[str] = Field(default=None)
     
+    # Conversation Memory
+    summary_trigger_tokens: int = Field(default=2000, ge=256, description="History size (tokens) that triggers background summarization")
+    
     # UI/System Settings
     theme: str = Field(default="dark", description="App theme")
     show_reasoning: bool = Field(default=True, description="Toggle reasoning steps visibility")
@@ -36,6 +47,17 @@ class AppSettings(BaseModel):
         """Generate a hash based on core RAG parameters affecting embeddings."""
         import hashlib
         config_str = f"{self.embedding_provider}|{self.embedding_model}|{self.chunk_size}|{self.chunk_overlap}|{self.embedding_dim}|{self.rag_engine}"
+        # Only token mode extends the hash so existing character-mode documents stay compatible
+        if self.chunking_mode != "character":
+            config_str += f"|{self.chunking_mode}"
+        return hashlib.sha256(config_str.encode()).hexdigest()[:12]
+
+    def get_retrieval_hash(self) -> str:
+        """Generate a hash of the parameters that shape search results for a query."""
+        import hashlib
+        config_str = f"{self.get_rag_hash()}|{self.retrieval_mode}|{self.hybrid_alpha}|{self.search_limit}"
+        if self.retrieval_strategy != "flat":
+            config_str += f"|{self.retrieval_strategy}|{self.hierarchical_top_documents}"
         return hashlib.sha256(config_str.encode()).hexdigest()[:12]
 
 class DocumentMetadata(BaseModel):
@@ -0,0 +1,50 @@
+import re
+from typing import Iterable, List, Optional
+
+# Edge n-gram keys backing the global search box. Each searchable entity stores
+# the lowercase prefixes of its words in a multikey `search_keys` array, so
+# search-as-you-type becomes an indexed equality match instead of a regex scan.
+MIN_PREFIX = 2
+MAX_PREFIX = 16
+
+_WORD_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase words of a text; underscores, dots and dashes separate words."""
+    return _WORD_RE.findall((text or "").lower())
+
+def search_keys(*texts: Optional[str]) -> List[str]:
+    """All word prefixes (MIN_PREFIX..MAX_PREFIX chars) of the given texts."""
+    keys = set()
+    for text in texts:
+        for word in tokenize(text):
+            for end in range(MIN_PREFIX, min(len(word), MAX_PREFIX) + 1):
+                keys.add(word[:end])
+    return sorted(keys)
+
+def query_keys(query: str) -> List[str]:
+    """Keys a query must match: one per word, capped at the stored prefix length."""
+    return sorted({word[:MAX_PREFIX] for word in tokenize(query) if len(word) >= MIN_PREFIX})
+
+def rank(query: str, primary: Optional[str], secondary: Iterable[Optional[str]] = ()) -> float:
+    """
+    Relevance of an entity whose keys already matched the query.
+    Whole-field matches on the primary field (name/title) score highest,
+    then phrase prefixes, then word-prefix hits on primary vs. secondary fields.
+    """
+    q = " ".join(tokenize(query))
+    name = " ".join(tokenize(primary))
+    words = tokenize(query)
+    name_words = name.split()
+    score = 0.0
+    if name == q:
+        score += 100
+    elif name.startswith(q):
+        score += 50
+    elif q in name:
+        score += 25
+    score += 10 * sum(any(w.startswith(qw) for w in name_words) for qw in words)
+    other_words = [w for text in secondary for w in tokenize(text)]
+    score += 2 * sum(any(w.startswith(qw) for w in other_words) for qw in words)
+    # Shorter names are closer matches for the same hits
+    return score - len(name) / 1000
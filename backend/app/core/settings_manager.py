@@ -82,7 +82,7 @@ class SettingsManager:
         """Update settings for a workspace or global."""
         
         # 1. Audit: Prevent modification of core RAG parameters if they break consistency
-        immutable_fields = ["embedding_provider", "embedding_model", "chunk_size", "chunk_overlap", "embedding_dim", "rag_engine"]
+        immutable_fields = ["embedding_provider", "embedding_model", "chunk_size", "chunk_overlap", "chunking_mode", "embedding_dim", "rag_engine"]
         
         if workspace_id and workspace_id != "default":
             if any(k in updates for k in immutable_fields):
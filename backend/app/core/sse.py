@@ -0,0 +1,116 @@
+import asyncio
+import json
+import time
+import logging
+from typing import Any, AsyncIterator, Dict, List
+from backend.app.core.config import ai_settings
+
+try:
+    import orjson
+
+    def dumps(obj: Any) -> str:
+        return orjson.dumps(obj, default=str).decode()
+except ImportError:  # pragma: no cover - orjson is listed in requirements
+    def dumps(obj: Any) -> str:
+        return json.dumps(obj, separators=(",", ":"), default=str)
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_FRAME = ": keep-alive\n\n"
+_END = object()
+
+def encode_event(event: Dict[str, Any]) -> str:
+    """Serialize a single event as an SSE data frame."""
+    return f"data: {dumps(event)}\n\n"
+
+class SSEEncoder:
+    """
+    Turns an async stream of event dicts into SSE frames.
+    Consecutive `content` deltas are merged until `coalesce_ms` elapses or `coalesce_bytes`
+    accumulate; any other event flushes pending content first so ordering is preserved.
+    A comment frame is sent after `heartbeat_seconds` of silence to keep proxies from closing the stream.
+    """
+
+    def __init__(self, coalesce_ms: float = 20, coalesce_bytes: int = 256, heartbeat_seconds: float = 15):
+        self.coalesce_seconds = coalesce_ms / 1000
+        self.coalesce_bytes = coalesce_bytes
+        self.heartbeat_seconds = heartbeat_seconds
+
+    async def frames(self, events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+        queue: asyncio.Queue = asyncio.Queue()
+        producer = asyncio.create_task(self._pump(events, queue))
+
+        pending: List[str] = []
+        pending_bytes = 0
+        deadline = 0.0
+        try:
+            while True:
+                if queue.empty():
+                    if pending and time.monotonic() >= deadline:
+                        yield self._content_frame(pending)
+                        pending, pending_bytes = [], 0
+                    timeout = max(deadline - time.monotonic(), 0) if pending else self.heartbeat_seconds
+                    try:
+                        # asyncio.timeout avoids the per-call Task that wait_for creates
+                        async with asyncio.timeout(timeout):
+                            item = await queue.get()
+                    except TimeoutError:
+                        if pending:
+                            yield self._content_frame(pending)
+                            pending, pending_bytes = [], 0
+                        else:
+                            yield HEARTBEAT_FRAME
+                        continue
+                else:
+                    # Drain whatever is already queued without suspending
+                    item = queue.get_nowait()
+
+                if item is _END:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+
+                if item.get("type") == "content":
+                    delta = item.get("delta", "")
+                    if not pending:
+                        deadline = time.monotonic() + self.coalesce_seconds
+                    pending.append(delta)
+                    pending_bytes += len(delta.encode())
+                    if pending_bytes >= self.coalesce_bytes or self.coalesce_seconds <= 0:
+                        yield self._content_frame(pending)
+                        pending, pending_bytes = [], 0
+                    continue
+
+                if pending:
+                    yield self._content_frame(pending)
+                    pending, pending_bytes = [], 0
+                yield encode_event(item)
+
+            if pending:
+                yield self._content_frame(pending)
+        finally:
+            if not producer.done():
+                producer.cancel()
+
+    @staticmethod
+    async def _pump(events: AsyncIterator[Dict[str, Any]], queue: asyncio.Queue):
+        try:
+            async for event in events:
+                await queue.put(event)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"SSE event source failed: {e}")
+            await queue.put(e)
+            return
+        await queue.put(_END)
+
+    @staticmethod
+    def _content_frame(deltas: List[str]) -> str:
+        return encode_event({"type": "content", "delta": "".join(deltas)})
+
+sse_encoder = SSEEncoder(
+    coalesce_ms=ai_settings.SSE_COALESCE_MS,
+    coalesce_bytes=ai_settings.SSE_COALESCE_BYTES,
+    heartbeat_seconds=ai_settings.SSE_HEARTBEAT_SECONDS
+)
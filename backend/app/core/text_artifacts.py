@@ -0,0 +1,79 @@
+import gzip
+import io
+import logging
+from typing import Dict, Iterator, List, Optional, Tuple
+from backend.app.core.minio import minio_manager
+
+logger = logging.getLogger(__name__)
+
+TEXT_SUFFIX = ".text.gz"
+BLOCK_SIZE = 64 * 1024  # Uncompressed bytes per gzip member
+
+def text_path(minio_path: str) -> str:
+    """Derived text artifact stored next to the original file."""
+    return f"{minio_path}{TEXT_SUFFIX}"
+
+class TextArtifactStore:
+    """
+    Extracted document text, persisted once per physical file as a gzip artifact in MinIO.
+    The text is compressed in independent BLOCK_SIZE members (a valid multi-member gzip
+    file as a whole); the member offsets are kept on the document record so any byte
+    range of the text is served by reading and inflating only the blocks it covers.
+    """
+
+    @staticmethod
+    def build(text: str) -> Tuple[bytes, Dict]:
+        raw = text.encode("utf-8")
+        buffer = io.BytesIO()
+        offsets: List[int] = [0]
+        for start in range(0, len(raw), BLOCK_SIZE):
+            buffer.write(gzip.compress(raw[start:start + BLOCK_SIZE], mtime=0))
+            offsets.append(buffer.tell())
+        return buffer.getvalue(), {"length": len(raw), "block_size": BLOCK_SIZE, "offsets": offsets}
+
+    async def save(self, minio_path: str, text: str) -> Dict:
+        """Upload the artifact; returns the metadata to store on the document record(s) as `text`."""
+        data, index = self.build(text)
+        path = text_path(minio_path)
+        await minio_manager.upload_file(path, io.BytesIO(data), len(data), content_type="application/gzip")
+        return {"path": path, **index}
+
+    @staticmethod
+    def parse_range(header: Optional[str], length: int) -> Optional[Tuple[int, int]]:
+        """
+        Inclusive (start, end) of a single `bytes=` range, or None to serve everything.
+        Raises ValueError for a range that cannot be satisfied.
+        """
+        if not header or not header.startswith("bytes=") or "," in header:
+            return None
+        first, _, last = header[len("bytes="):].strip().partition("-")
+        if not first:
+            # Suffix range: the last N bytes
+            if not last.isdigit() or int(last) == 0:
+                raise ValueError(header)
+            return max(0, length - int(last)), length - 1
+        if not first.isdigit() or (last and not last.isdigit()):
+            raise ValueError(header)
+        start, end = int(first), int(last) if last else length - 1
+        if start >= length or end < start:
+            raise ValueError(header)
+        return start, min(end, length - 1)
+
+    @staticmethod
+    def iter_range(meta: Dict, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        """Blocking generator over bytes [start, end] of the text (run in a thread by the caller)."""
+        end = meta["length"] - 1 if end is None else end
+        block_size, offsets = meta["block_size"], meta["offsets"]
+        for block in range(start // block_size, end // block_size + 1):
+            compressed = minio_manager.get_file_range(meta["path"], offsets[block], offsets[block + 1] - offsets[block])
+            if compressed is None:
+                raise IOError(f"Text artifact {meta['path']} is unreadable")
+            raw = gzip.decompress(compressed)
+            base = block * block_size
+            yield raw[max(start - base, 0):end - base + 1]
+
+    def read(self, meta: Dict) -> str:
+        """Whole text (blocking)."""
+        return b"".join(self.iter_range(meta)).decode("utf-8")
+
+text_artifacts = TextArtifactStore()
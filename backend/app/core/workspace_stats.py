@@ -0,0 +1,71 @@
+import asyncio
+import logging
+from typing import Dict, Optional
+from pymongo import UpdateOne
+from backend.app.core.mongodb import mongodb_manager
+
+logger = logging.getLogger(__name__)
+
+STAT_FIELDS = ("doc_count", "thread_count", "chunk_count", "size_bytes")
+
+def empty_stats() -> Dict[str, int]:
+    return {field: 0 for field in STAT_FIELDS}
+
+class WorkspaceStatsManager:
+    """
+    Maintains per-workspace counters on the workspace document (`stats.*`).
+    Writers apply deltas with $inc as documents and threads change hands;
+    reconcile() recomputes everything from source collections to correct drift.
+    """
+
+    async def inc(self, workspace_id: Optional[str], **deltas: int):
+        """Apply counter deltas to one workspace (unknown ids, e.g. 'vault', are ignored)."""
+        update = {f"stats.{field}": value for field, value in deltas.items() if value}
+        if not workspace_id or not update:
+            return
+        try:
+            db = mongodb_manager.get_async_database()
+            await db.workspaces.update_one({"id": workspace_id}, {"$inc": update})
+        except Exception as e:
+            logger.error(f"Failed to update stats for workspace {workspace_id}: {e}")
+
+    async def reconcile(self) -> int:
+        """Recompute every workspace's counters; returns the number of workspaces corrected."""
+        db = mongodb_manager.get_async_database()
+        actual: Dict[str, Dict[str, int]] = {}
+
+        doc_totals = db.documents.aggregate([
+            {"$group": {
+                "_id": "$workspace_id",
+                "doc_count": {"$sum": 1},
+                "chunk_count": {"$sum": {"$ifNull": ["$chunks", 0]}},
+                "size_bytes": {"$sum": {"$ifNull": ["$size_bytes", 0]}}
+            }}
+        ])
+        async for row in doc_totals:
+            actual.setdefault(row["_id"], empty_stats()).update(
+                {k: row[k] for k in ("doc_count", "chunk_count", "size_bytes")}
+            )
+        async for row in db.thread_metadata.aggregate([{"$group": {"_id": "$workspace_id", "n": {"$sum": 1}}}]):
+            actual.setdefault(row["_id"], empty_stats())["thread_count"] = row["n"]
+
+        ops = []
+        async for ws in db.workspaces.find({}, {"id": 1, "stats": 1}):
+            expected = actual.get(ws["id"], empty_stats())
+            if {**empty_stats(), **ws.get("stats", {})} != expected:
+                ops.append(UpdateOne({"_id": ws["_id"]}, {"$set": {"stats": expected}}))
+        if ops:
+            await db.workspaces.bulk_write(ops, ordered=False)
+            logger.info(f"Reconciled stats for {len(ops)} workspaces")
+        return len(ops)
+
+    async def run_periodic(self, interval_seconds: float):
+        """Reconcile immediately (seeds counters on upgrade), then every interval."""
+        while True:
+            try:
+                await self.reconcile()
+            except Exception as e:
+                logger.error(f"Workspace stats reconciliation failed: {e}")
+            await asyncio.sleep(interval_seconds)
+
+workspace_stats = WorkspaceStatsManager()
@@ -1,7 +1,7 @@
 from langgraph.graph import StateGraph, START, END
 from langgraph.prebuilt import ToolNode
 from backend.app.graph.state import AgentState
-from backend.app.graph.nodes import retrieval_node, reason_node, generate_node, summarize_node
+from backend.app.graph.nodes import retrieval_node, reason_node, generate_node
 from backend.app.tools.registry import get_tools
 
 # 1. Initialize Graph
@@ -12,7 +12,6 @@ workflow.add_node("retrieve", retrieval_node)
 workflow.add_node("reason", reason_node)
 workflow.add_node("tools", ToolNode(get_tools()))
 workflow.add_node("generate", generate_node)
-workflow.add_node("summarize", summarize_node)
 
 # 3. Define Edges
 workflow.add_edge(START, "retrieve")
@@ -36,28 +35,13 @@ workflow.add_conditional_edges(
 
 workflow.add_edge("tools", "reason")
 
-def should_summarize(state: AgentState):
-    """Router to decide if history should be summarized."""
-    # We summarize if history is getting long (> 6 messages)
-    if len(state["messages"]) > 6:
-        return "summarize"
-    return END
+# Summarization runs as a post-turn background job (see graph/summarization.py)
+# so the turn ends as soon as the answer is generated.
+workflow.add_edge("generate", END)
 
-workflow.add_conditional_edges(
-    "generate",
-    should_summarize,
-    {
-        "summarize": "summarize",
-        END: END
-    }
-)
-
-workflow.add_edge("summarize", END)
-
-from langgraph.checkpoint.mongodb import MongoDBSaver
 from backend.app.core.config import ai_settings
-from backend.app.core.mongodb import mongodb_manager
+from backend.app.graph.checkpointer import LazyMongoDBSaver
 
-# 4. Compile with Persistence
-checkpointer = MongoDBSaver(mongodb_manager.client, db_name=ai_settings.MONGO_DB)
+# 4. Compile with Persistence (connected on first use; durability is chosen per run, see chat_service)
+checkpointer = LazyMongoDBSaver(db_name=ai_settings.MONGO_DB)
 app = workflow.compile(checkpointer=checkpointer)
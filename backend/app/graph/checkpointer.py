@@ -0,0 +1,83 @@
+import asyncio
+import threading
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Sequence, Tuple
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver, ChannelVersions, Checkpoint, CheckpointMetadata, CheckpointTuple
+from langgraph.checkpoint.mongodb import MongoDBSaver
+from backend.app.core.mongodb import mongodb_manager
+
+class LazyMongoDBSaver(BaseCheckpointSaver):
+    """
+    LangGraph checkpointer backed by the library's MongoDBSaver, created on first use.
+
+    The graph is compiled at import time, while MongoDBSaver connects (and checks its
+    indexes) in its constructor; deferring it keeps imports free of MongoDB round trips.
+    Only the public checkpointer interface is used: every call is delegated, and the
+    async methods are MongoDBSaver's own, which run the driver calls in a thread pool
+    so the event loop never waits on a checkpoint write.
+    """
+
+    def __init__(
+        self,
+        db_name: str,
+        checkpoint_collection_name: str = "checkpoints",
+        writes_collection_name: str = "checkpoint_writes",
+        ttl: Optional[int] = None,
+    ) -> None:
+        super().__init__()
+        self._options: Dict[str, Any] = {
+            "db_name": db_name,
+            "checkpoint_collection_name": checkpoint_collection_name,
+            "writes_collection_name": writes_collection_name,
+            "ttl": ttl,
+        }
+        self._saver: Optional[MongoDBSaver] = None
+        self._lock = threading.Lock()
+
+    @property
+    def saver(self) -> MongoDBSaver:
+        """The underlying saver (blocking on first access)."""
+        if self._saver is None:
+            with self._lock:
+                if self._saver is None:
+                    self._saver = MongoDBSaver(mongodb_manager.client, **self._options)
+        return self._saver
+
+    async def _asaver(self) -> MongoDBSaver:
+        if self._saver is None:
+            await asyncio.to_thread(lambda: self.saver)
+        return self._saver
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return self.saver.get_tuple(config)
+
+    def list(self, config: Optional[RunnableConfig], **kwargs: Any) -> Iterator[CheckpointTuple]:
+        return self.saver.list(config, **kwargs)
+
+    def put(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata, new_versions: ChannelVersions) -> RunnableConfig:
+        return self.saver.put(config, checkpoint, metadata, new_versions)
+
+    def put_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str, task_path: str = "") -> None:
+        return self.saver.put_writes(config, writes, task_id, task_path)
+
+    def delete_thread(self, thread_id: str) -> None:
+        return self.saver.delete_thread(thread_id)
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await (await self._asaver()).aget_tuple(config)
+
+    async def alist(self, config: Optional[RunnableConfig], **kwargs: Any) -> AsyncIterator[CheckpointTuple]:
+        async for item in (await self._asaver()).alist(config, **kwargs):
+            yield item
+
+    async def aput(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata, new_versions: ChannelVersions) -> RunnableConfig:
+        return await (await self._asaver()).aput(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str, task_path: str = "") -> None:
+        return await (await self._asaver()).aput_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        return await (await self._asaver()).adelete_thread(thread_id)
+
+    def get_next_version(self, current, channel):
+        return self.saver.get_next_version(current, channel)
@@ -7,6 +7,9 @@ from backend.app.rag.rag_service import rag_service
 from backend.app.tools.registry import get_tools
 from backend.app.providers.llm import get_llm
 from backend.app.core.settings_manager import settings_manager
+from backend.app.providers.tokenizer import get_tokenizer
+from backend.app.rag.context_packer import context_packer, format_source, get_context_window, RESPONSE_RESERVE_TOKENS
+from backend.app.graph.prompt import build_prompt, cache_usage, prompt_cache_stats
 
 # Initialize Logger
 logger = logging.getLogger(__name__)
@@ -24,24 +27,24 @@ async def retrieval_node(state: AgentState) -> Dict:
         workspace_id=workspace_id
     )
     
-    context = []
-    sources = []
-    for i, res in enumerate(results):
-        text = res["payload"]["text"]
-        source_name = res["payload"].get("source", "Unknown")
-        context.append(text)
-        sources.append({
+    # Only references go into graph state (and so into checkpoints), chunk text is hydrated on demand
+    sources = [
+        {
             "id": i + 1,
-            "name": source_name,
-            "content": text
-        })
+            "point_id": res["id"],
+            "doc_id": res["payload"].get("doc_id"),
+            "index": res["payload"].get("index"),
+            "score": res.get("score"),
+            "name": res["payload"].get("source", "Unknown")
+        }
+        for i, res in enumerate(results)
+    ]
         
-    logger.info(f"Retrieved {len(context)} context chunks")
+    logger.info(f"Retrieved {len(sources)} context chunks")
     
     engine_name = "Graph-Aware" if results and results[0]["payload"].get("rag_engine") == "graph" else "Basic Hybrid"
     
     return {
-        "context": context,
         "sources": sources,
         "reasoning_steps": [f"Retrieved context using {engine_name} engine"]
     }
@@ -54,16 +57,7 @@ async def reason_node(state: AgentState, config: RunnableConfig) -> Dict:
     llm = await get_llm(workspace_id)
     llm_with_tools = llm.bind_tools(get_tools())
     
-    context_str = ""
-    for s in state.get("sources", []):
-        context_str += f"[{s['id']}] Source: {s['name']}\nContent: {s['content']}\n\n"
-    
-    logger.info(f"WS [{workspace_id}] - Context string for reasoning: {context_str[:200]}...")
-
-    summary = state.get("summary", "")
-    summary_context = f"\n\n--- PREVIOUS CONVERSATION SUMMARY ---\n{summary}" if summary else ""
-
-    system_prompt = SystemMessage(content=(
+    instructions = (
         "You are an advanced reasoning assistant. Use the provided context and conversation summary to answer the user's question. "
         "If you need more information, you can use the available tools. "
         "\n\n--- CITATION RULES ---\n"
@@ -72,18 +66,39 @@ async def reason_node(state: AgentState, config: RunnableConfig) -> Dict:
         "If multiple sources support a point, use [1][2]. "
         "\n\n--- REASONING OPTIMIZATION (NOWAIT) ---\n"
         "Be direct and efficient in your reasoning. Avoid unnecessary self-reflection tokens. "
-        + summary_context +
-        "\n\n--- CONTEXT ---\n" + context_str
-    ))
+        "\n\nThe context blocks for the current question are attached to the latest user message."
+    )
+    summary = state.get("summary", "")
+
+    # Fit sources into what the model window leaves after instructions, history and the answer
+    settings = await settings_manager.get_settings(workspace_id)
+    tokenizer = await get_tokenizer(workspace_id, kind="llm")
+    prompt_tokens = sum(tokenizer.count_batch([instructions, summary] + [str(m.content) for m in state["messages"]]))
+    window = get_context_window(settings.llm_provider, settings.llm_model)
+    budget = max(min(settings.context_token_budget, window - RESPONSE_RESERVE_TOKENS - prompt_tokens), 0)
+    hydrated = await rag_service.hydrate_sources(state.get("sources", []), workspace_id)
+    sources, stats = context_packer.pack(hydrated, tokenizer, budget)
+    context_str = "".join(format_source(s) for s in sources)
+    
+    logger.info(f"WS [{workspace_id}] - Context string for reasoning: {context_str[:200]}...")
+
+    # Stable prefix first, volatile context last, so provider prompt caches can reuse earlier turns
+    messages = build_prompt(settings.llm_provider, instructions, summary, state["messages"], context_str)
     
     logger.info("Starting reasoning step...")
-    messages = [system_prompt] + state["messages"]
     response = await llm_with_tools.ainvoke(messages, config=config)
+    usage = cache_usage(response)
+    prompt_cache_stats.record(usage)
     
     # Attach reasoning data to the message for history persistence
-    current_steps = state.get("reasoning_steps", []) + ["Reasoning about the query and context"]
+    packing_step = (
+        f"Packed {len(sources)} sources into {stats['packed_tokens']}/{stats['budget']} context tokens"
+        f" (dropped {stats['dropped_tokens']} tokens, {stats['dropped_sources']} sources)"
+    )
+    cache_step = f"Prompt cache reused {usage['cache_read']}/{usage['input_tokens']} input tokens"
+    current_steps = state.get("reasoning_steps", []) + [packing_step, cache_step, "Reasoning about the query and context"]
     response.additional_kwargs["reasoning_steps"] = current_steps
-    response.additional_kwargs["sources"] = state.get("sources", [])
+    response.additional_kwargs["sources"] = [rag_service.source_ref(s) for s in sources]
     
     logger.info(f"LLM Response: {response.content[:200]}...")
     
@@ -125,10 +140,9 @@ async def generate_node(state: AgentState) -> Dict:
     }
 
 async def summarize_node(state: AgentState) -> Dict:
-    """Summarize the conversation history if it gets too long."""
-    # Only summarize if we have more than a certain number of messages
+    """Fold all but the latest exchange into the running summary (triggered by graph/summarization.py)."""
     messages = state["messages"]
-    if len(messages) <= 6:
+    if len(messages) <= 2:
         return {}
         
     workspace_id = state.get("workspace_id", "default")
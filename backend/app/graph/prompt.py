@@ -0,0 +1,89 @@
+from typing import Any, Dict, List
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+# Providers that need explicit cache breakpoints in the request body.
+# OpenAI and vLLM cache matching prefixes automatically; llama.cpp is told to via `cache_prompt` (see providers/llm.py).
+BREAKPOINT_PROVIDERS = {"anthropic"}
+
+def _with_breakpoint(message: BaseMessage) -> BaseMessage:
+    """Copy a message with an Anthropic cache_control marker on its last content block."""
+    content = message.content
+    if isinstance(content, str):
+        if not content:
+            return message
+        blocks = [{"type": "text", "text": content}]
+    else:
+        blocks = [b if isinstance(b, dict) else {"type": "text", "text": str(b)} for b in content]
+        if not blocks:
+            return message
+    blocks[-1] = {**blocks[-1], "cache_control": {"type": "ephemeral"}}
+    return message.model_copy(update={"content": blocks})
+
+def build_prompt(
+    provider: str, instructions: str, summary: str, messages: List[BaseMessage], context: str
+) -> List[BaseMessage]:
+    """
+    Assemble the reasoning prompt so consecutive turns share the longest possible prefix.
+
+    Order: instructions + summary (stable) -> earlier conversation (append-only) ->
+    latest user turn carrying this turn's retrieval context -> tool exchanges of the current turn.
+    The context is attached to a copy of the user message only, state keeps the original.
+    """
+    system = instructions
+    if summary:
+        system += f"\n\n--- PREVIOUS CONVERSATION SUMMARY ---\n{summary}"
+    prompt: List[BaseMessage] = [SystemMessage(content=system)]
+
+    last_human = max((i for i, m in enumerate(messages) if isinstance(m, HumanMessage)), default=None)
+    if last_human is None:
+        return prompt + list(messages) + ([HumanMessage(content=f"--- CONTEXT ---\n{context}")] if context else [])
+
+    history = list(messages[:last_human])
+    question = messages[last_human]
+    if context:
+        question = question.model_copy(update={
+            "content": f"--- CONTEXT ---\n{context}\n--- QUESTION ---\n{question.content}"
+        })
+
+    if provider.lower() in BREAKPOINT_PROVIDERS:
+        prompt[0] = _with_breakpoint(prompt[0])
+        if history:
+            history[-1] = _with_breakpoint(history[-1])
+
+    return prompt + history + [question] + list(messages[last_human + 1:])
+
+def cache_usage(message: Any) -> Dict[str, int]:
+    """Extract input and cache-read token counts from a model response's usage metadata."""
+    usage = getattr(message, "usage_metadata", None) or {}
+    details = usage.get("input_token_details") or {}
+    return {
+        "input_tokens": usage.get("input_tokens", 0),
+        "cache_read": details.get("cache_read", 0) or 0,
+        "cache_creation": details.get("cache_creation", 0) or 0,
+    }
+
+class PromptCacheStats:
+    """Process-wide counters of provider prompt-cache reuse, exposed on /metrics."""
+
+    def __init__(self):
+        self.calls = 0
+        self.input_tokens = 0
+        self.cache_read_tokens = 0
+        self.cache_creation_tokens = 0
+
+    def record(self, usage: Dict[str, int]) -> None:
+        self.calls += 1
+        self.input_tokens += usage["input_tokens"]
+        self.cache_read_tokens += usage["cache_read"]
+        self.cache_creation_tokens += usage["cache_creation"]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "input_tokens": self.input_tokens,
+            "cache_read_tokens": self.cache_read_tokens,
+            "cache_creation_tokens": self.cache_creation_tokens,
+            "cache_read_ratio": round(self.cache_read_tokens / self.input_tokens, 4) if self.input_tokens else 0.0
+        }
+
+prompt_cache_stats = PromptCacheStats()
@@ -0,0 +1,72 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional
+from langchain_core.messages import BaseMessage
+from backend.app.graph.builder import app as graph_app
+from backend.app.graph.nodes import summarize_node
+from backend.app.providers.tokenizer import get_tokenizer
+from backend.app.core.settings_manager import settings_manager
+
+logger = logging.getLogger(__name__)
+
+def _message_text(message: BaseMessage) -> str:
+    content = message.content
+    return content if isinstance(content, str) else str(content)
+
+async def count_history_tokens(messages: List[BaseMessage], workspace_id: str) -> int:
+    """Count prompt tokens held by the conversation using the workspace LLM tokenizer."""
+    tokenizer = await get_tokenizer(workspace_id, kind="llm")
+    return sum(tokenizer.count_batch([_message_text(m) for m in messages]))
+
+async def summarize_thread(thread_id: str, workspace_id: str, min_tokens: Optional[int] = None) -> bool:
+    """
+    Summarize a thread's history into its checkpoint once it exceeds the token budget.
+    Writes the new summary and RemoveMessage pruning as a state update attributed to
+    `generate`, so the graph still ends at END on the next turn.
+    """
+    config = {"configurable": {"thread_id": thread_id}}
+    state = await graph_app.aget_state(config)
+    messages = state.values.get("messages", []) if state else []
+    if len(messages) <= 2:
+        return False
+
+    if min_tokens is None:
+        settings = await settings_manager.get_settings(workspace_id)
+        min_tokens = settings.summary_trigger_tokens
+    history_tokens = await count_history_tokens(messages, workspace_id)
+    if history_tokens < min_tokens:
+        return False
+
+    logger.info(f"Thread [{thread_id}] - Summarizing {len(messages)} messages ({history_tokens} tokens)")
+    update = await summarize_node({**state.values, "workspace_id": workspace_id})
+    if not update:
+        return False
+    await graph_app.aupdate_state(config, update, as_node="generate")
+    return True
+
+class SummarizationScheduler:
+    """Runs summarization after a turn has been streamed, one job per thread at a time."""
+
+    def __init__(self):
+        self._jobs: Dict[str, asyncio.Task] = {}
+
+    def schedule(self, thread_id: str, workspace_id: str):
+        if thread_id in self._jobs:
+            return
+        task = asyncio.create_task(self._run(thread_id, workspace_id))
+        self._jobs[thread_id] = task
+        task.add_done_callback(lambda _: self._jobs.pop(thread_id, None))
+
+    async def wait(self, thread_id: str):
+        """Block a new turn until the thread's pending summary has been checkpointed."""
+        task = self._jobs.get(thread_id)
+        if task:
+            await asyncio.shield(task)
+
+    async def _run(self, thread_id: str, workspace_id: str):
+        try:
+            await summarize_thread(thread_id, workspace_id)
+        except Exception as e:
+            logger.error(f"Background summarization failed for thread {thread_id}: {e}")
+
+summarization_scheduler = SummarizationScheduler()
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
@@ -24,8 +25,11 @@ async def lifespan(app: FastAPI):
     from backend.app.core.minio import minio_manager
     from backend.app.rag.qdrant_provider import qdrant
     from backend.app.services.workspace_service import workspace_service
+    from backend.app.core.indexes import ensure_indexes
+    from backend.app.core.workspace_stats import workspace_stats
     
     logger.info("Initializing Infrastructure...")
+    await ensure_indexes()
     minio_manager.ensure_bucket()
     # Ensure default collections exist (1536 for OpenAI/Deep, 768 for Local/Fast)
     await qdrant.create_collection("knowledge_base_1536", 1536)
@@ -35,8 +39,15 @@ async def lifespan(app: FastAPI):
     logger.info("Ensuring default workspace...")
     await workspace_service.ensure_default_workspace()
     
+    stats_task = None
+    if ai_settings.WORKSPACE_STATS_RECONCILE_SECONDS > 0:
+        stats_task = asyncio.create_task(workspace_stats.run_periodic(ai_settings.WORKSPACE_STATS_RECONCILE_SECONDS))
+    
     logger.info("Infrastructure ready.")
     yield
+    
+    if stats_task:
+        stats_task.cancel()
 
 def create_app() -> FastAPI:
     logger.info("Initializing FastAPI app...")
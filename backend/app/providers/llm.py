@@ -15,7 +15,8 @@ async def get_llm(workspace_id: Optional[str] = None):
         return ChatOpenAI(
             model=model,
             api_key=ai_settings.OPENAI_API_KEY,
-            streaming=True
+            streaming=True,
+            stream_usage=True  # Reports cached prompt tokens (automatic prefix caching)
         )
     elif provider == "anthropic":
         return ChatAnthropic(
@@ -33,14 +34,17 @@ async def get_llm(workspace_id: Optional[str] = None):
             model=model,
             api_key="EMPTY",
             base_url=ai_settings.VLLM_BASE_URL,
-            streaming=True
+            streaming=True,
+            stream_usage=True
         )
     elif provider == "llama-cpp":
         return ChatOpenAI(
             model=model,
             api_key="EMPTY",
             base_url=ai_settings.LLAMACPP_BASE_URL,
-            streaming=True
+            streaming=True,
+            stream_usage=True,
+            extra_body={"cache_prompt": True}  # Reuse the KV cache for the shared prompt prefix
         )
     else:
         raise ValueError(f"Unsupported LLM provider: {provider}")
@@ -0,0 +1,78 @@
+import asyncio
+import logging
+from functools import lru_cache
+from typing import List, Optional
+from backend.app.core.settings_manager import settings_manager
+
+logger = logging.getLogger(__name__)
+
+# Encoding used when the model has no resolvable tokenizer of its own.
+FALLBACK_ENCODING = "cl100k_base"
+
+class Tokenizer:
+    """Thin wrapper giving tiktoken and HuggingFace tokenizers a common interface."""
+
+    def __init__(self, name: str, backend, kind: str):
+        self.name = name
+        self._backend = backend
+        self._kind = kind  # "tiktoken" or "hf"
+
+    def encode(self, text: str) -> List[int]:
+        if self._kind == "tiktoken":
+            return self._backend.encode_ordinary(text)
+        return self._backend.encode(text, add_special_tokens=False)
+
+    def decode(self, tokens: List[int]) -> str:
+        if self._kind == "tiktoken":
+            return self._backend.decode(tokens)
+        return self._backend.decode(tokens, skip_special_tokens=True)
+
+    def count(self, text: str) -> int:
+        return len(self.encode(text))
+
+    def count_batch(self, texts: List[str]) -> List[int]:
+        """Count tokens for many texts in one native call (threaded in tiktoken, Rust in HF fast tokenizers)."""
+        if not texts:
+            return []
+        if self._kind == "tiktoken":
+            return [len(t) for t in self._backend.encode_ordinary_batch(texts)]
+        encoded = self._backend(texts, add_special_tokens=False)["input_ids"]
+        return [len(ids) for ids in encoded]
+
+def _load_tiktoken(model: str) -> Tokenizer:
+    import tiktoken
+    try:
+        encoding = tiktoken.encoding_for_model(model)
+    except KeyError:
+        encoding = tiktoken.get_encoding(FALLBACK_ENCODING)
+    return Tokenizer(encoding.name, encoding, "tiktoken")
+
+def _load_hf(model: str) -> Tokenizer:
+    from transformers import AutoTokenizer
+    return Tokenizer(model, AutoTokenizer.from_pretrained(model), "hf")
+
+@lru_cache(maxsize=16)
+def load_tokenizer(provider: str, model: str) -> Tokenizer:
+    """Load (once per process) the tokenizer matching a provider/model pair."""
+    provider = provider.lower()
+    loaders = [_load_tiktoken] if provider in ("openai", "anthropic") else [_load_hf, _load_tiktoken]
+    for loader in loaders:
+        try:
+            tokenizer = loader(model)
+            logger.info(f"Loaded tokenizer '{tokenizer.name}' for {provider}/{model}")
+            return tokenizer
+        except Exception as e:
+            logger.warning(f"Tokenizer loader {loader.__name__} failed for {provider}/{model}: {e}")
+    logger.warning(f"Falling back to {FALLBACK_ENCODING} for {provider}/{model}")
+    return _load_tiktoken(FALLBACK_ENCODING)
+
+async def get_tokenizer(workspace_id: Optional[str] = None, kind: str = "embedding") -> Tokenizer:
+    """Factory to get the cached tokenizer for a workspace's embedding or LLM model."""
+    settings = await settings_manager.get_settings(workspace_id)
+    if kind == "llm":
+        provider, model = settings.llm_provider, settings.llm_model
+    else:
+        provider, model = settings.embedding_provider, settings.embedding_model
+
+    # First load may hit disk or network, keep it off the event loop
+    return await asyncio.to_thread(load_tokenizer, provider, model)
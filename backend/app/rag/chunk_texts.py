@@ -0,0 +1,68 @@
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+from qdrant_client.http import models as qmodels
+from backend.app.core.config import ai_settings
+
+# Payload fields kept with each text: visibility (workspace_id, shared_with) and the
+# fields chunk deletes filter on, so deleted chunks can be dropped from the cache
+CACHED_FIELDS = ("workspace_id", "shared_with", "doc_id", "content_hash", "source")
+
+class ChunkTextCache:
+    """
+    In-process LRU of point_id -> chunk text for recently retrieved chunks, so source
+    hydration rarely hits Qdrant. A text is only served to workspaces that can see the
+    chunk, and entries matching a chunk delete or payload update are dropped
+    (QdrantProvider.delete_points / set_payload call forget).
+    """
+
+    def __init__(self, max_size: int = 4096):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Any, Dict]" = OrderedDict()
+
+    def remember(self, points: Iterable[Tuple[Any, Dict]]):
+        """Cache (point_id, payload) pairs that carry a `text`."""
+        if self.max_size <= 0:
+            return
+        for point_id, payload in points:
+            if payload.get("text") is None:
+                continue
+            self._entries[point_id] = {"text": payload["text"], **{f: payload.get(f) for f in CACHED_FIELDS}}
+            self._entries.move_to_end(point_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def get(self, point_id: Any, workspace_id: str) -> Optional[str]:
+        entry = self._entries.get(point_id)
+        if entry is None or not self._visible(entry, workspace_id):
+            return None
+        return entry["text"]
+
+    def forget(self, points_filter: qmodels.Filter):
+        """Drop every entry the filter may select (conditions it cannot evaluate count as a match)."""
+        for point_id in [k for k, e in self._entries.items() if self._matches(e, points_filter)]:
+            del self._entries[point_id]
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _visible(entry: Dict, workspace_id: str) -> bool:
+        return entry.get("workspace_id") == workspace_id or workspace_id in (entry.get("shared_with") or [])
+
+    @staticmethod
+    def _matches(entry: Dict, points_filter: qmodels.Filter) -> bool:
+        for condition in points_filter.must or []:
+            match = getattr(condition, "match", None)
+            value = entry.get(getattr(condition, "key", None))
+            if isinstance(match, qmodels.MatchValue):
+                if value != match.value:
+                    return False
+            elif isinstance(match, qmodels.MatchAny):
+                if value not in match.any:
+                    return False
+        return True
+
+chunk_texts = ChunkTextCache(max_size=ai_settings.CHUNK_TEXT_CACHE_SIZE)
@@ -0,0 +1,129 @@
+import logging
+from typing import Dict, List, Tuple
+from backend.app.providers.tokenizer import Tokenizer
+
+logger = logging.getLogger(__name__)
+
+# Known context windows by model-name prefix (longest prefix wins)
+MODEL_CONTEXT_WINDOWS = {
+    "gpt-4o": 128000,
+    "gpt-4.1": 1000000,
+    "gpt-4-turbo": 128000,
+    "gpt-4": 8192,
+    "gpt-3.5-turbo": 16385,
+    "o1": 200000,
+    "o3": 200000,
+    "claude": 200000,
+}
+
+# Self-hosted servers are configured with small windows (see docker-compose.yml)
+PROVIDER_CONTEXT_WINDOWS = {
+    "llama-cpp": 2048,
+    "ollama": 2048,
+    "vllm": 4096,
+}
+
+DEFAULT_CONTEXT_WINDOW = 8192
+RESPONSE_RESERVE_TOKENS = 512  # Left free for the model's answer
+MIN_TRUNCATED_TOKENS = 64  # Below this a partial source is not worth including
+MIN_OVERLAP_CHARS = 20
+
+def get_context_window(provider: str, model: str) -> int:
+    provider = provider.lower()
+    if provider in PROVIDER_CONTEXT_WINDOWS:
+        return PROVIDER_CONTEXT_WINDOWS[provider]
+    matches = [prefix for prefix in MODEL_CONTEXT_WINDOWS if model.lower().startswith(prefix)]
+    if matches:
+        return MODEL_CONTEXT_WINDOWS[max(matches, key=len)]
+    return DEFAULT_CONTEXT_WINDOW
+
+def format_source(source: Dict) -> str:
+    return f"[{source['id']}] Source: {source['name']}\nContent: {source['content']}\n\n"
+
+def _suffix_prefix_overlap(a: str, b: str) -> int:
+    """Length of the longest suffix of `a` that is also a prefix of `b`."""
+    probe = b[:MIN_OVERLAP_CHARS]
+    if len(probe) < MIN_OVERLAP_CHARS:
+        return 0
+    start = a.find(probe, max(len(a) - len(b), 0))
+    while start != -1:
+        if b.startswith(a[start:]):
+            return len(a) - start
+        start = a.find(probe, start + 1)
+    return 0
+
+class ContextPacker:
+    """
+    Fits ranked retrieval sources into a token budget.
+    Sources are deduplicated, overlap shared with an adjacent chunk of the same document
+    is removed, then sources are taken in rank order until the budget is spent.
+    """
+
+    def pack(self, sources: List[Dict], tokenizer: Tokenizer, budget: int) -> Tuple[List[Dict], Dict]:
+        candidates, removed_chars = self._dedupe(sources)
+
+        packed: List[Dict] = []
+        stats = {"budget": budget, "packed_tokens": 0, "dropped_tokens": 0, "dropped_sources": len(sources) - len(candidates)}
+        counts = tokenizer.count_batch([format_source(s) for s in candidates])
+        remaining = budget
+        for source, tokens in zip(candidates, counts):
+            if tokens <= remaining:
+                packed.append(source)
+                remaining -= tokens
+                stats["packed_tokens"] += tokens
+                continue
+
+            if remaining >= MIN_TRUNCATED_TOKENS:
+                header_tokens = tokens - tokenizer.count(source["content"])
+                keep = tokenizer.encode(source["content"])[:max(remaining - header_tokens, 0)]
+                if keep:
+                    truncated = {**source, "content": tokenizer.decode(keep), "truncated": True}
+                    used = header_tokens + len(keep)
+                    packed.append(truncated)
+                    stats["packed_tokens"] += used
+                    stats["dropped_tokens"] += tokens - used
+                    remaining -= used
+                    continue
+
+            stats["dropped_sources"] += 1
+            stats["dropped_tokens"] += tokens
+
+        if removed_chars:
+            logger.info(f"Context packer removed {removed_chars} redundant characters")
+        stats["redundant_chars"] = removed_chars
+        return packed, stats
+
+    @staticmethod
+    def _dedupe(sources: List[Dict]) -> Tuple[List[Dict], int]:
+        kept: List[Dict] = []
+        seen_texts = set()
+        removed = 0
+        for source in sources:
+            text = source.get("content", "")
+            key = " ".join(text.split())
+            if not key or key in seen_texts:
+                removed += len(text)
+                continue
+
+            trimmed = text
+            for other in kept:
+                if not source.get("doc_id") or other.get("doc_id") != source.get("doc_id"):
+                    continue
+                if other.get("index") is None or source.get("index") is None:
+                    continue
+                if source["index"] == other["index"] + 1:
+                    overlap = _suffix_prefix_overlap(other["content"], trimmed)
+                    trimmed = trimmed[overlap:]
+                elif source["index"] == other["index"] - 1:
+                    overlap = _suffix_prefix_overlap(trimmed, other["content"])
+                    trimmed = trimmed[:len(trimmed) - overlap]
+
+            if not trimmed.strip():
+                removed += len(text)
+                continue
+            removed += len(text) - len(trimmed)
+            seen_texts.add(key)
+            kept.append({**source, "content": trimmed.strip()} if trimmed is not text else source)
+        return kept, removed
+
+context_packer = ContextPacker()
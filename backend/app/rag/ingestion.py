@@ -1,8 +1,11 @@
 import uuid
 import os
-from typing import List, Dict, Union
+import asyncio
+from typing import List, Dict, Optional, Union
+from langchain_core.documents import Document
 from backend.app.rag.qdrant_provider import qdrant
 from backend.app.rag.rag_service import rag_service
+from backend.app.rag.parse_cache import parse_cache
 from langchain_community.document_loaders import (
     PyPDFLoader,
     TextLoader,
@@ -26,16 +29,12 @@ class IngestionPipeline:
         await qdrant.create_collection(name, vector_size=dim)
         return name
 
-    async def process_file(self, file_path: str, metadata: Dict = None):
+    def load_documents(self, file_path: str) -> List[Document]:
         """
-        Process various file types: PDF, TXT, MD, DOCX.
+        Parse a file into LangChain documents (PDF, TXT, MD, DOCX).
         Automatically selects the appropriate loader based on extension.
         """
         ext = os.path.splitext(file_path)[1].lower()
-        workspace_id = (metadata or {}).get("workspace_id", "default")
-        
-        target_collection, _ = await self.get_target_collection(workspace_id)
-        
         if ext == '.pdf':
             loader = PyPDFLoader(file_path)
         elif ext in ['.txt', '.log', '.md']:
@@ -44,9 +43,24 @@ class IngestionPipeline:
             loader = Docx2txtLoader(file_path)
         else:
             raise ValueError(f"Unsupported file extension: {ext}")
+        return loader.load()
+
+    async def parse(self, file_path: str, content_hash: Optional[str] = None) -> List[Document]:
+        """Load step: parse a file, reusing and filling the parse cache when the content hash is known."""
+        if content_hash:
+            cached = await parse_cache.load(content_hash)
+            if cached is not None:
+                return cached
+        # Loaders are blocking (PDF parsing is CPU-bound)
+        documents = await asyncio.to_thread(self.load_documents, file_path)
+        if content_hash:
+            await parse_cache.save(content_hash, documents)
+        return documents
 
-        # Load and split
-        documents = loader.load()
+    async def index_documents(self, documents: List[Document], metadata: Dict = None, extension: str = ""):
+        """Index step: chunk, embed and store parsed documents. Returns the number of chunks."""
+        workspace_id = (metadata or {}).get("workspace_id", "default")
+        target_collection, _ = await self.get_target_collection(workspace_id)
         
         all_chunks = []
         for doc in documents:
@@ -65,8 +79,8 @@ class IngestionPipeline:
             {
                 **(metadata or {}), 
                 "text": chunk, 
-                "source": (metadata or {}).get("filename") or os.path.basename(file_path),
-                "extension": ext,
+                "source": (metadata or {}).get("filename"),
+                "extension": extension,
                 "index": i,
                 "workspace_id": workspace_id,
                 "shared_with": (metadata or {}).get("shared_with", []),
@@ -88,6 +102,14 @@ class IngestionPipeline:
         )
         return len(all_chunks)
 
+    async def process_file(self, file_path: str, metadata: Dict = None):
+        """
+        Process various file types: PDF, TXT, MD, DOCX (load, then index).
+        """
+        metadata = {"filename": os.path.basename(file_path), **(metadata or {})}
+        documents = await self.parse(file_path, metadata.get("content_hash"))
+        return await self.index_documents(documents, metadata, extension=os.path.splitext(file_path)[1].lower())
+
     async def process_text(self, text: str, metadata: Dict = None):
         """Process raw text: chunk, embed, and store."""
         workspace_id = (metadata or {}).get("workspace_id", "default")
@@ -116,4 +138,8 @@ class IngestionPipeline:
         )
         return len(chunks)
 
+def documents_text(documents: List[Document]) -> str:
+    """Plain text of parsed documents (pages separated by a blank line)."""
+    return "\n\n".join(doc.page_content for doc in documents)
+
 ingestion_pipeline = IngestionPipeline()
@@ -0,0 +1,52 @@
+import asyncio
+import gzip
+import io
+import json
+import logging
+from typing import List, Optional
+from langchain_core.documents import Document
+from backend.app.core.minio import minio_manager
+
+logger = logging.getLogger(__name__)
+
+# Bump when loader selection or loader output changes, so stale parses are ignored
+PARSER_VERSION = "1"
+
+def parsed_path(content_hash: str) -> str:
+    return f"parsed/{content_hash}/v{PARSER_VERSION}.json.gz"
+
+class ParsedDocumentCache:
+    """
+    Loader output (page texts and their metadata) of a physical file, stored in MinIO
+    under its content hash and PARSER_VERSION. Re-indexing a file for another
+    embedding configuration starts from here instead of downloading and re-parsing it.
+    """
+
+    async def load(self, content_hash: str) -> Optional[List[Document]]:
+        path = parsed_path(content_hash)
+        # Misses are the common case (first index of a file), keep them out of the error log
+        if not await asyncio.to_thread(minio_manager.file_exists, path):
+            return None
+        data = await asyncio.to_thread(minio_manager.get_file, path)
+        if not data:
+            return None
+        try:
+            pages = json.loads(gzip.decompress(data))
+            return [Document(page_content=p["page_content"], metadata=p["metadata"]) for p in pages]
+        except Exception as e:
+            logger.error(f"Corrupt parse cache entry for {content_hash}: {e}")
+            return None
+
+    async def save(self, content_hash: str, documents: List[Document]):
+        # `source` is the temporary file the loader read, meaningless once cached
+        pages = [
+            {"page_content": d.page_content, "metadata": {k: v for k, v in d.metadata.items() if k != "source"}}
+            for d in documents
+        ]
+        data = gzip.compress(json.dumps(pages, default=str).encode("utf-8"))
+        try:
+            await minio_manager.upload_file(parsed_path(content_hash), io.BytesIO(data), len(data), content_type="application/gzip")
+        except Exception as e:
+            logger.error(f"Failed to cache parse output for {content_hash}: {e}")
+
+parse_cache = ParsedDocumentCache()
@@ -1,8 +1,24 @@
 import os
+import uuid
+import numpy as np
 from typing import List, Dict, Optional
 from qdrant_client import AsyncQdrantClient
 from qdrant_client.http import models as qmodels
 from backend.app.core.config import ai_settings
+from backend.app.rag.chunk_texts import chunk_texts
+
+# Payload indexes every knowledge collection carries: full-text search on chunk
+# text, per-document filtering, and ordered chunk browsing (order_by needs a range index)
+PAYLOAD_INDEXES = {
+    "text": qmodels.TextIndexParams(type=qmodels.TextIndexType.TEXT),
+    "doc_id": qmodels.KeywordIndexParams(type=qmodels.KeywordIndexType.KEYWORD),
+    "index": qmodels.IntegerIndexParams(type=qmodels.IntegerIndexType.INTEGER, lookup=False, range=True),
+}
+
+# Centroid collections hold one point per (document, workspace) of the matching knowledge
+# collection and carry the chunk payload fields used in chunk delete/update filters
+CENTROID_PAYLOAD_INDEXES = ("doc_id", "workspace_id", "shared_with", "content_hash", "source")
+CENTROID_PAGE_SIZE = 256
 
 class QdrantProvider:
     def __init__(self):
@@ -10,6 +26,7 @@ class QdrantProvider:
             host=ai_settings.QDRANT_HOST,
             port=ai_settings.QDRANT_PORT
         )
+        self._indexed = set()  # Collections whose payload indexes were ensured by this process
 
     def get_collection_name(self, vector_size: int = 1536) -> str:
         """Standardized naming for dimension-specific collections."""
@@ -29,17 +46,59 @@ class QdrantProvider:
                     indexing_threshold=10000,
                 ),
             )
-            # Add payload indexing for common fields to speed up filtering/keyword search
+            await self.ensure_payload_indexes(collection_name)
+            return True
+        # Collections created before an index was added to PAYLOAD_INDEXES get it here
+        await self.ensure_payload_indexes(collection_name)
+        return False
+
+    async def ensure_payload_indexes(self, collection_name: str):
+        """Create the PAYLOAD_INDEXES (idempotent on the Qdrant side), once per collection and process."""
+        if collection_name in self._indexed:
+            return
+        for field_name, schema in PAYLOAD_INDEXES.items():
             await self.client.create_payload_index(
                 collection_name=collection_name,
-                field_name="text",
-                field_schema="text",
+                field_name=field_name,
+                field_schema=schema,
             )
-            return True
-        return False
+        self._indexed.add(collection_name)
+
+    async def get_vector_size(self, collection_name: str) -> int:
+        """Vector dimension from the collection config (no vectors are transferred)."""
+        info = await self.client.get_collection(collection_name)
+        vectors = info.config.params.vectors
+        if isinstance(vectors, dict):
+            # Named vectors: report the first one
+            vectors = next(iter(vectors.values()))
+        return vectors.size
+
+    async def scroll_document_chunks(
+        self,
+        collection_name: str,
+        doc_id: str,
+        start: int = 0,
+        limit: int = 100,
+        with_payload=True
+    ):
+        """
+        Chunks of one document ordered by their `index` payload, starting at chunk `start`.
+        Uses the integer range index, so any position is reached without scanning the ones before it.
+        """
+        points, _ = await self.client.scroll(
+            collection_name=collection_name,
+            scroll_filter=qmodels.Filter(must=[
+                qmodels.FieldCondition(key="doc_id", match=qmodels.MatchValue(value=doc_id))
+            ]),
+            order_by=qmodels.OrderBy(key="index", direction=qmodels.Direction.ASC, start_from=start),
+            limit=limit,
+            with_payload=with_payload,
+            with_vectors=False
+        )
+        return points
 
     async def upsert_documents(self, collection_name: str, vectors, ids, payloads):
-        """Upsert vectors into the collection."""
+        """Upsert vectors into the collection and fold them into their documents' centroids."""
         await self.client.upsert(
             collection_name=collection_name,
             points=qmodels.Batch(
@@ -49,6 +108,150 @@ class QdrantProvider:
             ),
             wait=True
         )
+        await self.update_centroids(collection_name, vectors, payloads)
+
+    async def delete_points(self, collection_name: str, points_filter: qmodels.Filter):
+        """
+        Delete the chunks matching a filter, along with the centroids of the documents
+        they belong to. Filters must select whole documents (doc_id, content_hash,
+        source, workspace_id conditions), which is what every caller removes.
+        """
+        await self.client.delete(collection_name=collection_name, points_selector=points_filter)
+        chunk_texts.forget(points_filter)
+        centroid_collection = self.get_centroid_collection_name(collection_name)
+        if await self.client.collection_exists(centroid_collection):
+            await self.client.delete(collection_name=centroid_collection, points_selector=points_filter)
+
+    async def set_payload(self, collection_name: str, payload: Dict, points_filter: qmodels.Filter):
+        """Set payload fields on the chunks matching a filter, mirrored onto their centroids."""
+        await self.client.set_payload(collection_name=collection_name, payload=payload, points=points_filter)
+        chunk_texts.forget(points_filter)
+        centroid_collection = self.get_centroid_collection_name(collection_name)
+        if await self.client.collection_exists(centroid_collection):
+            await self.client.set_payload(collection_name=centroid_collection, payload=payload, points=points_filter)
+
+    def get_centroid_collection_name(self, collection_name: str) -> str:
+        """knowledge_base_{dim} -> doc_centroids_{dim}."""
+        return collection_name.replace("knowledge_base_", "doc_centroids_", 1)
+
+    @staticmethod
+    def centroid_id(doc_id: str, workspace_id: Optional[str]) -> str:
+        return str(uuid.uuid5(uuid.NAMESPACE_URL, f"centroid/{workspace_id}/{doc_id}"))
+
+    async def ensure_centroid_collection(self, collection_name: str, vector_size: int):
+        if collection_name in self._indexed:
+            return
+        if not await self.client.collection_exists(collection_name):
+            await self.client.create_collection(
+                collection_name=collection_name,
+                vectors_config=qmodels.VectorParams(size=vector_size, distance=qmodels.Distance.COSINE),
+            )
+        for field_name in CENTROID_PAYLOAD_INDEXES:
+            await self.client.create_payload_index(
+                collection_name=collection_name,
+                field_name=field_name,
+                field_schema=qmodels.PayloadSchemaType.KEYWORD,
+            )
+        self._indexed.add(collection_name)
+
+    async def update_centroids(self, collection_name: str, vectors, payloads):
+        """
+        Add chunk vectors to the running sum and count of their (document, workspace)
+        centroid. The sum lives in the payload because cosine collections normalize
+        stored vectors; the stored vector is the mean. Chunks without doc_id are skipped.
+        """
+        groups = {}
+        for vector, payload in zip(vectors, payloads):
+            doc_id = payload.get("doc_id")
+            if not doc_id:
+                continue
+            key = (doc_id, payload.get("workspace_id"))
+            if key not in groups:
+                groups[key] = {"sum": np.zeros(len(vector)), "count": 0, "payload": payload}
+            groups[key]["sum"] += np.asarray(vector, dtype=float)
+            groups[key]["count"] += 1
+        if not groups:
+            return
+
+        centroid_collection = self.get_centroid_collection_name(collection_name)
+        await self.ensure_centroid_collection(centroid_collection, len(vectors[0]))
+        ids = [self.centroid_id(*key) for key in groups]
+        existing = await self.client.retrieve(
+            collection_name=centroid_collection, ids=ids, with_payload=["sum", "count"], with_vectors=False
+        )
+        previous = {str(p.id): p.payload for p in existing}
+
+        points = []
+        for point_id, ((doc_id, workspace_id), group) in zip(ids, groups.items()):
+            before = previous.get(point_id) or {}
+            total = group["sum"] + np.asarray(before.get("sum", 0.0), dtype=float)
+            count = group["count"] + before.get("count", 0)
+            payload = group["payload"]
+            points.append(qmodels.PointStruct(
+                id=point_id,
+                vector=(total / count).tolist(),
+                payload={
+                    "doc_id": doc_id,
+                    "workspace_id": workspace_id,
+                    "shared_with": payload.get("shared_with", []),
+                    "content_hash": payload.get("content_hash"),
+                    "source": payload.get("source"),
+                    "sum": total.tolist(),
+                    "count": count
+                }
+            ))
+        await self.client.upsert(collection_name=centroid_collection, points=points, wait=True)
+
+    async def retrieve_visible(self, collection_name: str, ids: List, workspace_id: str, with_payload=True):
+        """Points among `ids` that belong to, or are shared with, the workspace."""
+        points, _ = await self.client.scroll(
+            collection_name=collection_name,
+            scroll_filter=qmodels.Filter(
+                must=[qmodels.HasIdCondition(has_id=ids)],
+                should=[
+                    qmodels.FieldCondition(key="workspace_id", match=qmodels.MatchValue(value=workspace_id)),
+                    qmodels.FieldCondition(key="shared_with", match=qmodels.MatchValue(value=workspace_id))
+                ]
+            ),
+            limit=len(ids),
+            with_payload=with_payload,
+            with_vectors=False
+        )
+        return points
+
+    async def list_knowledge_collections(self) -> List[str]:
+        """Names of every dimension-specific knowledge collection."""
+        response = await self.client.get_collections()
+        return [c.name for c in response.collections if c.name.startswith("knowledge_base_")]
+
+    async def search_text(
+        self,
+        collection_name: str,
+        query_text: str,
+        limit: int = 20,
+        workspace_id: Optional[str] = None
+    ):
+        """
+        Full-text match on chunk text (uses the `text` payload index).
+        Unranked: the caller scores the returned chunks.
+        """
+        filter_query = qmodels.Filter(
+            must=[qmodels.FieldCondition(key="text", match=qmodels.MatchText(text=query_text))]
+        )
+        if workspace_id:
+            filter_query.should = [
+                qmodels.FieldCondition(key="workspace_id", match=qmodels.MatchValue(value=workspace_id)),
+                qmodels.FieldCondition(key="shared_with", match=qmodels.MatchValue(value=workspace_id))
+            ]
+
+        points, _ = await self.client.scroll(
+            collection_name=collection_name,
+            scroll_filter=filter_query,
+            limit=limit,
+            with_payload=["text", "source", "doc_id", "workspace_id", "index"],
+            with_vectors=False
+        )
+        return points
 
     async def get_effective_collection(self, collection_name: str, workspace_id: Optional[str] = None):
         if collection_name == "knowledge_base":
@@ -72,17 +275,27 @@ class QdrantProvider:
         limit: int = 5,
         mode: str = "hybrid",
         alpha: float = 0.5,
-        workspace_id: Optional[str] = None
+        workspace_id: Optional[str] = None,
+        doc_ids: Optional[List[str]] = None,
+        workspace_ids: Optional[List[str]] = None
     ):
         """
         Perform hybrid search with workspace-level isolation.
-        Filters by current workspace OR shared documents.
+        Filters by current workspace OR shared documents, and to `doc_ids` when given.
+        `workspace_ids` searches several workspaces of the same collection at once.
         """
         collection_name = await self.get_effective_collection(collection_name, workspace_id)
         
         # Define Workspace Filter
         filter_query = None
-        if workspace_id:
+        if workspace_ids:
+            filter_query = qmodels.Filter(
+                should=[
+                    qmodels.FieldCondition(key="workspace_id", match=qmodels.MatchAny(any=workspace_ids)),
+                    qmodels.FieldCondition(key="shared_with", match=qmodels.MatchAny(any=workspace_ids))
+                ]
+            )
+        elif workspace_id:
             filter_query = qmodels.Filter(
                 should=[
                     qmodels.FieldCondition(
@@ -95,6 +308,9 @@ class QdrantProvider:
                     )
                 ]
             )
+        if doc_ids:
+            filter_query = filter_query or qmodels.Filter()
+            filter_query.must = [qmodels.FieldCondition(key="doc_id", match=qmodels.MatchAny(any=doc_ids))]
 
         # 1. Vector Search using the new Query API
         response = await self.client.query_points(
@@ -206,9 +422,9 @@ class QdrantProvider:
         # But our delete in DocumentService now passes workspace_id or we do a full purge.
         if workspace_id:
             collection_name = await self.get_effective_collection(collection_name, workspace_id)
-            await self.client.delete(
-                collection_name=collection_name,
-                points_selector=qmodels.Filter(
+            await self.delete_points(
+                collection_name,
+                qmodels.Filter(
                     must=[
                         qmodels.FieldCondition(
                             key="source",
@@ -227,9 +443,9 @@ class QdrantProvider:
             collections = ["knowledge_base_1536", "knowledge_base_768"]
             for c in collections:
                 if await self.client.collection_exists(c):
-                    await self.client.delete(
-                        collection_name=c,
-                        points_selector=qmodels.Filter(
+                    await self.delete_points(
+                        c,
+                        qmodels.Filter(
                             must=[qmodels.FieldCondition(key="source", match=qmodels.MatchValue(value=source_name))]
                         )
                     )
@@ -263,52 +479,83 @@ class QdrantProvider:
         content = "\n\n".join([p.payload.get("text", "") for p in sorted_points])
         return content
 
-    async def get_document_centroids(self, workspace_id: str):
-        """Calculate the average vector (centroid) for each document in the workspace."""
-        collection_name = await self.get_effective_collection("knowledge_base", workspace_id)
-        
-        # Scroll through all points in the workspace with vectors
-        response = await self.client.scroll(
-            collection_name=collection_name,
-            scroll_filter=qmodels.Filter(
+    async def search_centroids(
+        self,
+        collection_name: str,
+        query_vector: List[float],
+        limit: int,
+        workspace_id: Optional[str] = None
+    ) -> List[str]:
+        """
+        First stage of hierarchical retrieval: ids of the `limit` documents whose centroid
+        is closest to the query. Empty when the centroid collection does not exist yet.
+        """
+        collection_name = await self.get_effective_collection(collection_name, workspace_id)
+        centroid_collection = self.get_centroid_collection_name(collection_name)
+        if not await self.client.collection_exists(centroid_collection):
+            return []
+
+        filter_query = None
+        if workspace_id:
+            filter_query = qmodels.Filter(
                 should=[
                     qmodels.FieldCondition(key="workspace_id", match=qmodels.MatchValue(value=workspace_id)),
                     qmodels.FieldCondition(key="shared_with", match=qmodels.MatchValue(value=workspace_id))
                 ]
-            ),
-            limit=10000,
-            with_payload=True,
-            with_vectors=True
+            )
+        response = await self.client.query_points(
+            collection_name=centroid_collection,
+            query=query_vector,
+            query_filter=filter_query,
+            limit=limit,
+            with_payload=["doc_id"]
         )
-        
-        points = response[0]
-        doc_vectors = {} # doc_id -> list of vectors
-        doc_names = {} # doc_id -> name
-        
-        for p in points:
-            doc_id = p.payload.get("doc_id")
-            if not doc_id: continue
-            
-            if doc_id not in doc_vectors:
-                doc_vectors[doc_id] = []
-                # Prefer source name from payload
-                doc_names[doc_id] = p.payload.get("source", "Unknown Document")
-            
-            if p.vector:
-                doc_vectors[doc_id].append(p.vector)
-            
+        doc_ids = []
+        for point in response.points:
+            doc_id = (point.payload or {}).get("doc_id")
+            if doc_id and doc_id not in doc_ids:
+                doc_ids.append(doc_id)
+        return doc_ids
+
+    async def get_document_centroids(self, workspace_id: str):
+        """
+        Mean chunk vector of every document visible in the workspace, read from the
+        centroid collection (one point per document, see update_centroids).
+        Returns {doc_id: {"vector", "name", "chunks"}}.
+        """
+        collection_name = await self.get_effective_collection("knowledge_base", workspace_id)
+        centroid_collection = self.get_centroid_collection_name(collection_name)
         centroids = {}
-        import numpy as np
-        for doc_id, vectors in doc_vectors.items():
-            if vectors:
-                centroids[doc_id] = {
-                    "vector": np.mean(vectors, axis=0).tolist(),
-                    "name": doc_names[doc_id]
-                }
-        return centroids
+        if not await self.client.collection_exists(centroid_collection):
+            return centroids
 
-# Global instance
-qdrant = QdrantProvider()
+        scroll_filter = qmodels.Filter(
+            should=[
+                qmodels.FieldCondition(key="workspace_id", match=qmodels.MatchValue(value=workspace_id)),
+                qmodels.FieldCondition(key="shared_with", match=qmodels.MatchValue(value=workspace_id))
+            ]
+        )
+        offset = None
+        while True:
+            points, offset = await self.client.scroll(
+                collection_name=centroid_collection,
+                scroll_filter=scroll_filter,
+                limit=CENTROID_PAGE_SIZE,
+                offset=offset,
+                with_payload=["doc_id", "source", "count"],
+                with_vectors=True
+            )
+            for p in points:
+                doc_id = p.payload.get("doc_id")
+                # A document indexed for several workspaces in one collection has one centroid per workspace
+                if doc_id and p.vector and doc_id not in centroids:
+                    centroids[doc_id] = {
+                        "vector": p.vector,
+                        "name": p.payload.get("source") or "Unknown Document",
+                        "chunks": p.payload.get("count", 0)
+                    }
+            if offset is None:
+                return centroids
 
 # Global instance
 qdrant = QdrantProvider()
@@ -1,6 +1,19 @@
-from typing import List, Optional, Dict
+import time
+import asyncio
+import logging
+from typing import Any, List, Optional, Dict, Tuple
 from langchain_text_splitters import RecursiveCharacterTextSplitter
+from backend.app.core.config import ai_settings
+from backend.app.core.generations import content_generations
 from backend.app.providers.embedding import get_embeddings
+from backend.app.providers.tokenizer import get_tokenizer
+from backend.app.rag.retrieval_cache import retrieval_cache
+from backend.app.rag.chunk_texts import chunk_texts, CACHED_FIELDS
+
+logger = logging.getLogger(__name__)
+
+# Fields kept when a source is persisted; chunk text is hydrated back by point_id
+SOURCE_REF_FIELDS = ("id", "point_id", "doc_id", "index", "score", "name")
 
 class RAGService:
     async def chunk_text(self, text: str, workspace_id: Optional[str] = None) -> List[str]:
@@ -8,6 +21,9 @@ class RAGService:
         from backend.app.core.settings_manager import settings_manager
         settings = await settings_manager.get_settings(workspace_id)
         
+        if settings.chunking_mode == "token":
+            return await self.chunk_tokens(text, settings.chunk_size, settings.chunk_overlap, workspace_id)
+
         splitter = RecursiveCharacterTextSplitter(
             chunk_size=settings.chunk_size,
             chunk_overlap=settings.chunk_overlap,
@@ -18,10 +34,49 @@ class RAGService:
         text = " ".join(text.split())
         return splitter.split_text(text)
 
+    async def chunk_tokens(self, text: str, chunk_size: int, chunk_overlap: int, workspace_id: Optional[str] = None) -> List[str]:
+        """Pack text into windows of exactly `chunk_size` tokens of the workspace's embedding tokenizer."""
+        tokenizer = await get_tokenizer(workspace_id)
+        tokens = tokenizer.encode(" ".join(text.split()))
+        if not tokens:
+            return []
+
+        step = max(chunk_size - chunk_overlap, 1)
+        chunks = []
+        for start in range(0, len(tokens), step):
+            chunks.append(tokenizer.decode(tokens[start:start + chunk_size]))
+            if start + chunk_size >= len(tokens):
+                break
+        return chunks
+
     async def get_embeddings(self, texts: List[str], workspace_id: Optional[str] = None) -> List[List[float]]:
         """Generate embeddings using the flexible provider."""
+        from backend.app.core.settings_manager import settings_manager
+        settings = await settings_manager.get_settings(workspace_id)
         provider = await get_embeddings(workspace_id)
-        return await provider.aembed_documents(texts)
+        if settings.chunking_mode != "token":
+            return await provider.aembed_documents(texts)
+
+        # Chunk sizes are exact in token mode, so requests can be packed up to the token budget
+        tokenizer = await get_tokenizer(workspace_id)
+        embeddings = []
+        for batch in self._token_batches(texts, tokenizer.count_batch(texts), ai_settings.EMBEDDING_BATCH_MAX_TOKENS):
+            embeddings.extend(await provider.aembed_documents(batch))
+        return embeddings
+
+    @staticmethod
+    def _token_batches(texts: List[str], counts: List[int], max_tokens: int) -> List[List[str]]:
+        """Group texts in order so each batch stays within `max_tokens`."""
+        batches, current, current_tokens = [], [], 0
+        for text, count in zip(texts, counts):
+            if current and current_tokens + count > max_tokens:
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(text)
+            current_tokens += count
+        if current:
+            batches.append(current)
+        return batches
 
     async def get_query_embedding(self, query: str, workspace_id: Optional[str] = None) -> List[float]:
         """Generate embedding for a single query."""
@@ -40,27 +95,198 @@ class RAGService:
         settings = await settings_manager.get_settings(workspace_id)
         search_limit = limit or settings.search_limit
         
+        # 0. Serve repeated questions from the cache while workspace content is unchanged
+        generation = await content_generations.get(workspace_id)
+        cache_key = retrieval_cache.make_key(workspace_id, query, settings.get_retrieval_hash(), search_limit, generation)
+        cached = retrieval_cache.get(cache_key)
+        if cached is not None:
+            self._remember_chunks(cached)
+            return cached
+        
         # 1. Generate Query Vector
         query_vector = await self.get_query_embedding(query, workspace_id)
         
         # 2. Execute fixed mode (no dynamic switching)
         if settings.rag_engine == "graph":
-            return await graph_provider.search(
+            results = await graph_provider.search(
                 query=query,
                 query_vector=query_vector,
                 workspace_id=workspace_id,
                 limit=search_limit
             )
         else:
-            # Basic Hybrid RAG
-            return await qdrant.hybrid_search(
+            # Basic Hybrid RAG, optionally restricted to the documents closest to the query
+            doc_ids = None
+            if settings.retrieval_strategy == "hierarchical":
+                doc_ids = await qdrant.search_centroids(
+                    "knowledge_base", query_vector, settings.hierarchical_top_documents, workspace_id
+                )
+                # No centroids yet (see scripts/backfill_centroids.py): search everything
+                doc_ids = doc_ids or None
+            results = await qdrant.hybrid_search(
                 collection_name="knowledge_base",
                 query_vector=query_vector,
                 query_text=query,
                 limit=search_limit,
                 mode=settings.retrieval_mode,
                 alpha=settings.hybrid_alpha,
-                workspace_id=workspace_id
+                workspace_id=workspace_id,
+                doc_ids=doc_ids
             )
+        
+        retrieval_cache.put(cache_key, results)
+        self._remember_chunks(results)
+        return results
+
+    async def federated_search(self, query: str, workspace_ids: List[str], limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Search several workspaces in one request. Workspaces are grouped by embedding
+        configuration so the query is embedded once per distinct model; each group then
+        queries its collection(s) concurrently, one leg per (collection, retrieval mode),
+        every leg (its group's query embedding included) bounded by one
+        FEDERATED_LEG_TIMEOUT_SECONDS deadline from the start of the search. Leg scores are min-max
+        normalized before merging, since RRF, cosine and keyword scores are not comparable.
+        """
+        from backend.app.core.settings_manager import settings_manager
+        from backend.app.rag.qdrant_provider import qdrant
+
+        workspace_ids = list(dict.fromkeys(workspace_ids))
+        all_settings = await asyncio.gather(*(settings_manager.get_settings(ws) for ws in workspace_ids))
+        search_limit = limit or max(s.search_limit for s in all_settings)
+
+        # embedding config -> (collection, mode, alpha) -> workspace ids
+        groups: Dict[Tuple, Dict[Tuple, List[str]]] = {}
+        for ws_id, settings in zip(workspace_ids, all_settings):
+            embedding_key = (settings.embedding_provider, settings.embedding_model, settings.embedding_dim)
+            leg_key = (qdrant.get_collection_name(settings.embedding_dim), settings.retrieval_mode, settings.hybrid_alpha)
+            groups.setdefault(embedding_key, {}).setdefault(leg_key, []).append(ws_id)
+
+        started = time.monotonic()
+        grouped_legs = await asyncio.gather(*(
+            self._federated_group(query, legs, search_limit, started) for legs in groups.values()
+        ))
+        legs = [leg for group in grouped_legs for leg in group]
+        return {
+            "results": fuse_normalized([leg.pop("hits") for leg in legs], search_limit),
+            "legs": legs
+        }
+
+    async def _federated_group(self, query: str, legs: Dict[Tuple, List[str]], limit: int, started: float) -> List[Dict]:
+        """
+        Embed once for workspaces sharing an embedding model, then run their legs concurrently.
+        Embedding and legs share a single deadline measured from `started`.
+        """
+        from backend.app.rag.qdrant_provider import qdrant
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + ai_settings.FEDERATED_LEG_TIMEOUT_SECONDS - (time.monotonic() - started)
+        # Any workspace of the group resolves to the same embedding provider
+        first_workspace = next(iter(legs.values()))[0]
+        try:
+            async with asyncio.timeout_at(deadline):
+                query_vector = await self.get_query_embedding(query, first_workspace)
+        except Exception as e:
+            status = "timeout" if isinstance(e, TimeoutError) else "error"
+            logger.warning(f"Federated search: query embedding for {first_workspace} failed ({status}): {e}")
+            return [self._federated_leg_result(key, ws_ids, status, [], started) for key, ws_ids in legs.items()]
+
+        async def run_leg(key: Tuple, ws_ids: List[str]) -> Dict:
+            collection, mode, alpha = key
+            try:
+                async with asyncio.timeout_at(deadline):
+                    hits = await qdrant.hybrid_search(
+                        collection_name=collection,
+                        query_vector=query_vector,
+                        query_text=query,
+                        limit=limit,
+                        mode=mode,
+                        alpha=alpha,
+                        workspace_ids=ws_ids
+                    )
+            except TimeoutError:
+                logger.warning(f"Federated search leg on '{collection}' timed out")
+                return self._federated_leg_result(key, ws_ids, "timeout", [], started)
+            except Exception as e:
+                logger.error(f"Federated search leg on '{collection}' failed: {e}")
+                return self._federated_leg_result(key, ws_ids, "error", [], started)
+            for hit in hits:
+                hit["collection"] = collection
+            return self._federated_leg_result(key, ws_ids, "ok", hits, started)
+
+        return await asyncio.gather(*(run_leg(key, ws_ids) for key, ws_ids in legs.items()))
+
+    @staticmethod
+    def _federated_leg_result(key: Tuple, workspace_ids: List[str], status: str, hits: List[Dict], started: float) -> Dict:
+        return {
+            "collection": key[0],
+            "mode": key[1],
+            "workspace_ids": workspace_ids,
+            "status": status,
+            "count": len(hits),
+            "elapsed_ms": round((time.monotonic() - started) * 1000, 1),
+            "hits": hits
+        }
+
+    @staticmethod
+    def source_ref(source: Dict) -> Dict:
+        """Compact, persistable form of a source (no chunk text)."""
+        return {k: source[k] for k in SOURCE_REF_FIELDS if k in source}
+
+    def _remember_chunks(self, results: List[Dict]):
+        chunk_texts.remember((res["id"], res.get("payload") or {}) for res in results)
+
+    def hydrate_cached(self, sources: List[Dict], workspace_id: str) -> List[Dict]:
+        """
+        Attach chunk text from the in-process cache only (no I/O, safe inside the stream loop).
+        Sources retrieved by the current turn are always cached; a miss hydrates to an empty string.
+        """
+        hydrated = []
+        for s in sources:
+            if "content" in s:
+                hydrated.append(s)
+            else:
+                hydrated.append({**s, "content": chunk_texts.get(s.get("point_id"), workspace_id) or ""})
+        return hydrated
+
+    async def hydrate_sources(self, sources: List[Dict], workspace_id: str) -> List[Dict]:
+        """
+        Attach chunk text to source references, for chunks visible to `workspace_id` only.
+        Texts come from the in-process cache, the rest is fetched in one batched Qdrant lookup.
+        Sources that already carry content (older threads) are returned as-is.
+        """
+        from backend.app.rag.qdrant_provider import qdrant
+
+        missing = list({
+            s["point_id"] for s in sources
+            if "content" not in s and s.get("point_id") is not None and chunk_texts.get(s["point_id"], workspace_id) is None
+        })
+        if missing:
+            collection_name = await qdrant.get_effective_collection("knowledge_base", workspace_id)
+            try:
+                points = await qdrant.retrieve_visible(collection_name, missing, workspace_id, ["text", *CACHED_FIELDS])
+                chunk_texts.remember((p.id, p.payload or {}) for p in points)
+            except Exception as e:
+                logger.warning(f"WS [{workspace_id}] - Failed to hydrate {len(missing)} sources: {e}")
+
+        # Chunks of deleted documents (and chunks of other workspaces) hydrate to an empty string
+        return self.hydrate_cached(sources, workspace_id)
+
+def fuse_normalized(legs: List[List[Dict]], limit: int) -> List[Dict]:
+    """
+    Merge per-leg result lists by min-max normalized score (a leg with equal scores maps
+    them all to 1.0). The raw score is kept as `raw_score`; duplicates keep their best score.
+    """
+    merged: Dict[Tuple, Dict] = {}
+    for hits in legs:
+        if not hits:
+            continue
+        scores = [hit["score"] for hit in hits]
+        low, high = min(scores), max(scores)
+        for hit in hits:
+            score = (hit["score"] - low) / (high - low) if high > low else 1.0
+            key = (hit.get("collection"), hit["id"])
+            if key not in merged or merged[key]["score"] < score:
+                merged[key] = {**hit, "score": score, "raw_score": hit["score"]}
+    return sorted(merged.values(), key=lambda hit: hit["score"], reverse=True)[:limit]
 
 rag_service = RAGService()
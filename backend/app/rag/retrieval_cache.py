@@ -0,0 +1,61 @@
+import copy
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from backend.app.core.config import ai_settings
+
+class RetrievalCache:
+    """
+    In-process LRU of search results keyed by
+    (workspace_id, normalized query, retrieval settings hash, limit, content generation).
+    Entries never need explicit invalidation: content changes bump the generation.
+    """
+
+    def __init__(self, max_size: int = 512):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple, List[Dict]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        return " ".join(query.lower().split())
+
+    def make_key(self, workspace_id: str, query: str, settings_hash: str, limit: int, generation: int) -> Tuple:
+        query_digest = hashlib.sha1(self.normalize_query(query).encode()).hexdigest()
+        return (workspace_id, query_digest, settings_hash, limit, generation)
+
+    def get(self, key: Tuple) -> Optional[List[Dict]]:
+        if self.max_size <= 0:
+            return None
+        results = self._entries.get(key)
+        if results is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        # Callers may annotate payloads, never hand out the cached objects
+        return copy.deepcopy(results)
+
+    def put(self, key: Tuple, results: List[Dict]):
+        if self.max_size <= 0:
+            return
+        self._entries[key] = copy.deepcopy(results)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+retrieval_cache = RetrievalCache(max_size=ai_settings.RETRIEVAL_CACHE_SIZE)
@@ -0,0 +1,100 @@
+import uuid
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import numpy as np
+from backend.app.core.config import ai_settings
+
+logger = logging.getLogger(__name__)
+
+class SemanticCache:
+    """
+    Per-workspace store of answered questions, matched by query embedding similarity.
+    An entry is only replayed while the workspace content generation it was answered
+    under is still current, i.e. the sources it cited have not changed, and only for
+    the LLM (`model` key) that wrote it. Callers only cache and serve the opening
+    question of a thread: a follow-up depends on a conversation the vector does not see.
+    """
+
+    def __init__(self, max_entries_per_workspace: int = 256):
+        self.max_entries = max_entries_per_workspace
+        self._entries: Dict[str, "OrderedDict[str, Dict[str, Any]]"] = {}
+        self.hits = 0
+        self.misses = 0
+        self.saved_tokens = 0
+
+    def lookup(
+        self, workspace_id: str, query_vector: List[float], generation: int, threshold: float, model: str = ""
+    ) -> Optional[Dict[str, Any]]:
+        """Return the most similar fresh entry of `model` at or above `threshold`, or None."""
+        entries = self._entries.get(workspace_id)
+        if entries:
+            # Entries from older generations can never be served again
+            for entry_id in [k for k, e in entries.items() if e["generation"] != generation]:
+                del entries[entry_id]
+
+        ids = [k for k, e in (entries or {}).items() if e["model"] == model]
+        if not ids:
+            self.misses += 1
+            return None
+
+        matrix = np.array([entries[i]["vector"] for i in ids], dtype=np.float32)
+        query = self._normalize(np.asarray(query_vector, dtype=np.float32))
+        scores = matrix @ query
+        best = int(np.argmax(scores))
+
+        if scores[best] < threshold:
+            self.misses += 1
+            return None
+
+        entry = entries[ids[best]]
+        entries.move_to_end(ids[best])
+        self.hits += 1
+        self.saved_tokens += entry.get("tokens", 0)
+        logger.info(f"WS [{workspace_id}] - Semantic cache hit (similarity={scores[best]:.3f})")
+        return {**entry, "similarity": float(scores[best])}
+
+    def store(
+        self,
+        workspace_id: str,
+        query_vector: List[float],
+        generation: int,
+        answer: str,
+        sources: List[Dict],
+        reasoning_steps: List[str],
+        tokens: int = 0,
+        model: str = ""
+    ):
+        entries = self._entries.setdefault(workspace_id, OrderedDict())
+        entries[str(uuid.uuid4())] = {
+            "vector": self._normalize(np.asarray(query_vector, dtype=np.float32)),
+            "generation": generation,
+            "model": model,
+            "answer": answer,
+            "sources": sources,
+            "source_ids": [s.get("id") for s in sources],
+            "reasoning_steps": reasoning_steps,
+            "tokens": tokens,
+            "created_at": datetime.utcnow().isoformat()
+        }
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "workspaces": len(self._entries),
+            "entries": sum(len(e) for e in self._entries.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "saved_tokens": self.saved_tokens
+        }
+
+    @staticmethod
+    def _normalize(vector: np.ndarray) -> np.ndarray:
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+semantic_cache = SemanticCache(max_entries_per_workspace=ai_settings.SEMANTIC_CACHE_MAX_ENTRIES)
@@ -0,0 +1,74 @@
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from backend.app.core.config import ai_settings
+
+SIMILARITY_THRESHOLD = 0.75  # Moderate similarity threshold for graph visualization
+TOP_K = 10  # Neighbours kept per document, keeps the edge count linear in N
+BLOCK_SIZE = 1024  # Rows of the similarity matrix computed at once (BLOCK_SIZE x N floats)
+
+def similarity_edges(
+    doc_ids: List[str],
+    vectors: List[List[float]],
+    threshold: float = SIMILARITY_THRESHOLD,
+    top_k: int = TOP_K,
+    block_size: int = BLOCK_SIZE
+) -> List[Dict]:
+    """
+    Undirected kNN edges between documents: a pair is linked when either document has
+    the other among its top_k most similar (cosine) and the similarity exceeds threshold.
+    Vectors are normalized once into a float32 matrix; similarities are computed one
+    row block at a time by matrix multiplication, so memory stays at block_size x N.
+    """
+    n = len(doc_ids)
+    if n < 2 or top_k <= 0:
+        return []
+    matrix = np.array(vectors, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix /= np.where(norms == 0, 1, norms)
+    k = min(top_k, n - 1)
+
+    pairs: Dict[Tuple[int, int], float] = {}
+    for start in range(0, n, block_size):
+        sims = matrix[start:start + block_size] @ matrix.T
+        rows = np.arange(sims.shape[0])
+        sims[rows, rows + start] = -np.inf  # No self-loops
+        neighbours = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        scores = sims[rows[:, None], neighbours]
+        for row, col in zip(*np.nonzero(scores > threshold)):
+            i, j = start + int(row), int(neighbours[row, col])
+            pairs[(min(i, j), max(i, j))] = float(scores[row, col])
+
+    return [
+        {"source": doc_ids[i], "target": doc_ids[j], "value": round(sim, 4)}
+        for (i, j), sim in sorted(pairs.items())
+    ]
+
+class SimilarityGraphCache:
+    """
+    In-process LRU of workspace document graphs keyed by (workspace_id, embedding_dim, content generation).
+    Like the retrieval cache, entries never need explicit invalidation.
+    """
+
+    def __init__(self, max_size: int = 64):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple, Dict]" = OrderedDict()
+
+    def get(self, key: Tuple) -> Optional[Dict]:
+        graph = self._entries.get(key)
+        if graph is not None:
+            self._entries.move_to_end(key)
+        return graph
+
+    def put(self, key: Tuple, graph: Dict):
+        if self.max_size <= 0:
+            return
+        self._entries[key] = graph
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+similarity_graph_cache = SimilarityGraphCache(max_size=ai_settings.GRAPH_CACHE_SIZE)
@@ -1,82 +1,165 @@
+import base64
 import logging
 import json
 import asyncio
+import uuid
 from datetime import datetime
-from typing import AsyncGenerator, List, Dict, Optional
-from langchain_core.messages import HumanMessage
+from typing import AsyncGenerator, List, Dict, Optional, Tuple
+from pymongo import ReturnDocument
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
 from backend.app.graph.builder import app as graph_app
+from backend.app.graph.summarization import summarization_scheduler
 from backend.app.core.mongodb import mongodb_manager
 from backend.app.providers.llm import get_llm
+from backend.app.providers.tokenizer import get_tokenizer
 from backend.app.core.settings_manager import settings_manager
+from backend.app.core.config import ai_settings
+from backend.app.core.schemas import AppSettings
+from backend.app.core.generations import content_generations
+from backend.app.core.workspace_stats import workspace_stats
+from backend.app.core.search_keys import search_keys
+from backend.app.core.exceptions import ValidationError
+from backend.app.rag.rag_service import rag_service
+from backend.app.rag.semantic_cache import semantic_cache
 
 logger = logging.getLogger(__name__)
 
+PREVIEW_CHARS = 160
+# Heavy per-message fields, only returned by get_history on request
+HISTORY_DETAIL_FIELDS = ("reasoning_steps", "sources")
+
 class ChatService:
     @staticmethod
-    async def get_history(thread_id: str) -> List[Dict]:
-        """Fetch the chat history for a specific thread."""
+    def _message_entry(msg: BaseMessage) -> Dict:
+        """History representation of a graph message (also the chat_messages log document body)."""
+        entry = {
+            "role": "user" if msg.type == "human" else "assistant",
+            "content": msg.content,
+            "id": getattr(msg, "id", None)
+        }
+        for field in HISTORY_DETAIL_FIELDS:
+            if field in msg.additional_kwargs:
+                entry[field] = msg.additional_kwargs[field]
+        return entry
+
+    @staticmethod
+    async def get_history(
+        thread_id: str, limit: int = 50, before: Optional[int] = None, include_details: bool = False
+    ) -> Dict:
+        """
+        Fetch one page of a thread's history from the chat_messages log, oldest message first.
+        `before` is the `next_cursor` of the previous page. Reasoning steps and sources are
+        only returned with include_details (sources are then hydrated in one batched lookup).
+        """
+        db = mongodb_manager.get_async_database()
+        col = db["chat_messages"]
+        query: Dict = {"thread_id": thread_id}
+        if before is not None:
+            query["seq"] = {"$lt": before}
+        projection = {"_id": 0, "thread_id": 0, "workspace_id": 0, "created_at": 0}
+        if not include_details:
+            projection.update({field: 0 for field in HISTORY_DETAIL_FIELDS})
+        
+        docs = await col.find(query, projection).sort("seq", -1).limit(limit).to_list(length=limit)
+        if docs or await col.find_one({"thread_id": thread_id}, {"_id": 1}):
+            messages = docs[::-1]
+            workspace_id = None
+        else:
+            # Thread predates the message log, page over the checkpointed state instead
+            messages, workspace_id = await ChatService._history_from_state(thread_id)
+            if before is not None:
+                messages = messages[:before]
+            messages = messages[-limit:]
+            if not include_details:
+                for m in messages:
+                    for field in HISTORY_DETAIL_FIELDS:
+                        m.pop(field, None)
+        
+        if include_details:
+            refs = [s for m in messages for s in m.get("sources", [])]
+            if refs:
+                if workspace_id is None:
+                    meta = await db["thread_metadata"].find_one({"thread_id": thread_id}, {"workspace_id": 1})
+                    workspace_id = (meta or {}).get("workspace_id", "default")
+                hydrated = iter(await rag_service.hydrate_sources(refs, workspace_id))
+                for m in messages:
+                    if "sources" in m:
+                        m["sources"] = [next(hydrated) for _ in m["sources"]]
+        
+        next_cursor = messages[0]["seq"] if len(messages) == limit and messages[0]["seq"] > 0 else None
+        return {"messages": messages, "next_cursor": next_cursor}
+
+    @staticmethod
+    async def _history_from_state(thread_id: str) -> Tuple[List[Dict], str]:
         config = {"configurable": {"thread_id": thread_id}}
         state = await graph_app.aget_state(config)
-        
         if not state or "messages" not in state.values:
-            return []
-        
-        history = []
-        for msg in state.values["messages"]:
-            msg_data = {
-                "role": "user" if msg.type == "human" else "assistant",
-                "content": msg.content,
-                "id": getattr(msg, "id", None)
-            }
-            if hasattr(msg, "additional_kwargs"):
-                if "reasoning_steps" in msg.additional_kwargs:
-                    msg_data["reasoning_steps"] = msg.additional_kwargs["reasoning_steps"]
-                if "sources" in msg.additional_kwargs:
-                    msg_data["sources"] = msg.additional_kwargs["sources"]
-            history.append(msg_data)
-        return history
+            return [], "default"
+        
+        history = [
+            {**ChatService._message_entry(msg), "seq": seq}
+            for seq, msg in enumerate(state.values["messages"])
+        ]
+        return history, state.values.get("workspace_id", "default")
 
     @staticmethod
-    async def list_threads(workspace_id: str = "default") -> List[Dict]:
-        """List all available chat threads for a workspace."""
+    async def list_threads(workspace_id: str = "default", limit: int = 50, cursor: Optional[str] = None) -> List[Dict]:
+        """
+        List a workspace's chat threads, most recently active first. Keyset-paginated on
+        (last_active, thread_id), so threads sharing a last_active value are never skipped.
+        Threads without last_active (title-only upserts, not yet backfilled) sort last.
+        """
         db = mongodb_manager.get_async_database()
-        checkpoints_col = db["checkpoints"]
-        metadata_col = db["thread_metadata"]
-        
-        workspace_threads = await metadata_col.find({"workspace_id": workspace_id}).to_list(None)
-        thread_ids = [doc["thread_id"] for doc in workspace_threads]
-        
-        pipeline = [
-            {"$match": {"thread_id": {"$in": thread_ids}}},
-            {"$sort": {"_id": -1}},
-            {"$group": {
-                "_id": "$thread_id",
-                "last_active": {"$first": "$_id"}
-            }},
-            {"$sort": {"last_active": -1}}
-        ]
+        query: Dict = {"workspace_id": workspace_id}
+        if cursor is not None:
+            last_active, thread_id = ChatService._decode_thread_cursor(cursor)
+            query["$or"] = [
+                {"last_active": {"$lt": last_active}},
+                {"last_active": last_active, "thread_id": {"$lt": thread_id}}
+            ]
+            if last_active is not None:
+                # $lt never matches null/missing, yet undated threads follow every dated one
+                query["$or"].append({"last_active": None})
         
-        results = await checkpoints_col.aggregate(pipeline).to_list(None)
-        sorted_thread_ids = [res["_id"] for res in results]
-        meta_map = {doc["thread_id"]: doc for doc in workspace_threads}
+        found = db["thread_metadata"].find(
+            query,
+            {"_id": 0, "thread_id": 1, "title": 1, "has_thinking": 1, "tags": 1, "last_active": 1, "message_count": 1, "preview": 1}
+        ).sort([("last_active", -1), ("thread_id", -1)]).limit(limit)
         
         return [
             {
-                "id": tid,
-                "title": meta_map.get(tid, {}).get("title", f"Chat {tid[:8]}"),
-                "has_thinking": meta_map.get(tid, {}).get("has_thinking", False),
-                "tags": meta_map.get(tid, {}).get("tags", [])
+                "id": doc["thread_id"],
+                "title": doc.get("title", f"Chat {doc['thread_id'][:8]}"),
+                "has_thinking": doc.get("has_thinking", False),
+                "tags": doc.get("tags", []),
+                "last_active": doc["last_active"].isoformat() if doc.get("last_active") else None,
+                "message_count": doc.get("message_count", 0),
+                "preview": doc.get("preview", "")
             }
-            for tid in sorted_thread_ids
+            for doc in await found.to_list(length=limit)
         ]
 
+    @staticmethod
+    def thread_cursor(thread: Dict) -> str:
+        """Opaque cursor continuing a thread listing after `thread` (an item of list_threads)."""
+        return base64.urlsafe_b64encode(json.dumps([thread["last_active"], thread["id"]]).encode()).decode()
+
+    @staticmethod
+    def _decode_thread_cursor(cursor: str) -> Tuple[Optional[datetime], str]:
+        try:
+            last_active, thread_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return (datetime.fromisoformat(last_active) if last_active else None), thread_id
+        except Exception:
+            raise ValidationError("Invalid page cursor.")
+
     @staticmethod
     async def update_title(thread_id: str, title: str):
         """Update the title of a specific thread."""
         db = mongodb_manager.get_async_database()
+        meta = await db["thread_metadata"].find_one({"thread_id": thread_id}, {"tags": 1}) or {}
         await db["thread_metadata"].update_one(
             {"thread_id": thread_id},
-            {"$set": {"title": title}},
+            {"$set": {"title": title, "search_keys": search_keys(title, *meta.get("tags", []))}},
             upsert=True
         )
 
@@ -85,7 +168,10 @@ class ChatService:
         """Delete a thread and its history."""
         db = mongodb_manager.get_async_database()
         await db["checkpoints"].delete_many({"thread_id": thread_id})
-        await db["thread_metadata"].delete_one({"thread_id": thread_id})
+        meta = await db["thread_metadata"].find_one_and_delete({"thread_id": thread_id}, projection={"workspace_id": 1})
+        if meta:
+            await workspace_stats.inc(meta.get("workspace_id"), thread_count=-1)
+        await db["chat_messages"].delete_many({"thread_id": thread_id})
 
     @staticmethod
     async def generate_title(message: str, thread_id: str, workspace_id: str = "default"):
@@ -122,50 +208,232 @@ class ChatService:
                 title = content.split("\n")[0][:50]
                 tags = []
             
-            await col.update_one(
+            result = await col.update_one(
                 {"thread_id": thread_id},
                 {"$set": {
                     "title": title, 
                     "tags": tags,
+                    "search_keys": search_keys(title, *tags),
                     "workspace_id": workspace_id,
                     "updated_at": datetime.utcnow().isoformat()
                 }},
                 upsert=True
             )
+            if result.upserted_id is not None:
+                await workspace_stats.inc(workspace_id, thread_count=1)
         except Exception as e:
             logger.error(f"Failed to generate metadata for thread {thread_id}: {e}")
 
     @staticmethod
-    async def stream_updates(message: str, thread_id: str, workspace_id: str) -> AsyncGenerator[str, None]:
-        """Stream event updates from the LangGraph execution."""
-        inputs = {"messages": [HumanMessage(content=message)], "workspace_id": workspace_id}
+    async def stream_updates(message: str, thread_id: str, workspace_id: str) -> AsyncGenerator[Dict, None]:
+        """Stream event updates from the LangGraph execution as plain dicts (framed by the SSE encoder)."""
+        question = HumanMessage(content=message, id=str(uuid.uuid4()))
+        inputs = {"messages": [question], "workspace_id": workspace_id}
         config = {"configurable": {"thread_id": thread_id}}
         
-        async for event in graph_app.astream_events(inputs, config=config, version="v2"):
-            kind = event["event"]
-            name = event.get("name", "")
-            
-            if kind == "on_chain_end" and name in ["retrieve", "reason", "generate"]:
-                output = event["data"].get("output", {})
-                if isinstance(output, dict):
-                    settings = await settings_manager.get_settings(workspace_id)
-                    if settings.show_reasoning and "reasoning_steps" in output:
-                        db = mongodb_manager.get_async_database()
-                        await db["thread_metadata"].update_one(
-                            {"thread_id": thread_id},
-                            {"$set": {"has_thinking": True}}
-                        )
-                        yield f"data: {json.dumps({'type': 'reasoning', 'steps': output['reasoning_steps']})}\n\n"
-                    if "sources" in output:
-                        yield f"data: {json.dumps({'type': 'sources', 'sources': output['sources']})}\n\n"
-            
-            if kind == "on_chat_model_stream":
-                content = event["data"]["chunk"].content
-                if content:
-                    yield f"data: {json.dumps({'type': 'content', 'delta': content})}\n\n"
-            elif kind == "on_tool_start":
-                yield f"data: {json.dumps({'type': 'tool_start', 'tool': event['name']})}\n\n"
-            elif kind == "on_tool_end":
-                yield f"data: {json.dumps({'type': 'tool_end', 'tool': event['name'], 'output': event['data'].get('output')})}\n\n"
+        # A summary still being written would race this turn's checkpoints
+        await summarization_scheduler.wait(thread_id)
+        
+        # Resolved once per request; nothing inside the event loop looks settings up again
+        settings = await settings_manager.get_settings(workspace_id)
+        query_vector = None
+        generation = None
+        llm_key = f"{settings.llm_provider}:{settings.llm_model}"
+        # Only a thread's opening question is self-contained enough to share an answer
+        if settings.semantic_cache_enabled and await ChatService._is_new_thread(config):
+            query_vector = await rag_service.get_query_embedding(message, workspace_id)
+            generation = await content_generations.get(workspace_id)
+            cached = semantic_cache.lookup(workspace_id, query_vector, generation, settings.semantic_cache_threshold, model=llm_key)
+            if cached:
+                async for event in ChatService._replay_cached_answer(cached, question, thread_id, workspace_id, settings, config):
+                    yield event
+                summarization_scheduler.schedule(thread_id, workspace_id)
+                return
+        
+        answer = ""
+        answer_message: Optional[BaseMessage] = None
+        sources: List[Dict] = []
+        reasoning_steps: List[str] = []
+        used_tools = False
+        total_tokens = 0
+        # Thread metadata changes are buffered and written once the turn ends,
+        # the event loop below must never wait on the database.
+        metadata_updates: Dict = {}
+        
+        try:
+            async for event in graph_app.astream_events(
+                inputs, config=config, version="v2", durability=ai_settings.CHECKPOINT_DURABILITY
+            ):
+                kind = event["event"]
+                name = event.get("name", "")
+                
+                if kind == "on_chain_end" and name in ["retrieve", "reason", "generate"]:
+                    output = event["data"].get("output", {})
+                    if isinstance(output, dict):
+                        if settings.show_reasoning and "reasoning_steps" in output:
+                            metadata_updates["has_thinking"] = True
+                            yield {"type": "reasoning", "steps": output["reasoning_steps"]}
+                        if "sources" in output:
+                            # Chunks were just retrieved, so their text is in the in-process cache (no I/O here)
+                            sources = rag_service.hydrate_cached(output["sources"], workspace_id)
+                            yield {"type": "sources", "sources": sources}
+                        reasoning_steps = output.get("reasoning_steps", reasoning_steps)
+                        if name == "generate" and output.get("messages"):
+                            answer_message = output["messages"][-1]
+                            answer = answer_message.content
+                
+                if kind == "on_chat_model_stream":
+                    content = event["data"]["chunk"].content
+                    if content:
+                        yield {"type": "content", "delta": content}
+                elif kind == "on_chat_model_end":
+                    usage = getattr(event["data"].get("output"), "usage_metadata", None) or {}
+                    total_tokens += usage.get("total_tokens", 0)
+                elif kind == "on_tool_start":
+                    used_tools = True
+                    yield {"type": "tool_start", "tool": event["name"]}
+                elif kind == "on_tool_end":
+                    yield {"type": "tool_end", "tool": event["name"], "output": event["data"].get("output")}
+        finally:
+            metadata_updates.update(ChatService._activity_fields(workspace_id, message, answer))
+            turn = [question] + ([answer_message] if answer else [])
+            await ChatService._flush_thread_metadata(thread_id, metadata_updates, new_messages=turn)
+        
+        # Off the critical path: the client already has the full answer
+        summarization_scheduler.schedule(thread_id, workspace_id)
+        
+        # Tool results (e.g. web search) can go stale independently of the workspace, never cache them
+        if query_vector is not None and answer and not used_tools:
+            if not total_tokens:
+                # Provider did not report usage while streaming, count the answer at least
+                total_tokens = (await get_tokenizer(workspace_id, kind="llm")).count(answer)
+            semantic_cache.store(
+                workspace_id, query_vector, generation, answer, sources, reasoning_steps, tokens=total_tokens, model=llm_key
+            )
+
+    @staticmethod
+    async def _is_new_thread(config: Dict) -> bool:
+        """True when the thread has no checkpointed messages yet."""
+        state = await graph_app.aget_state(config)
+        return not (state and state.values.get("messages"))
+
+    @staticmethod
+    async def _replay_cached_answer(
+        cached: Dict, question: HumanMessage, thread_id: str, workspace_id: str, settings: AppSettings, config: Dict
+    ) -> AsyncGenerator[Dict, None]:
+        """Stream a cached answer and record the turn in the thread without running the graph."""
+        steps = cached["reasoning_steps"] + [f"Served from semantic cache (similarity {cached['similarity']:.2f})"]
+        
+        if settings.show_reasoning:
+            yield {"type": "reasoning", "steps": steps}
+        yield {"type": "sources", "sources": cached["sources"]}
+        
+        answer = cached["answer"]
+        for start in range(0, len(answer), 64):
+            yield {"type": "content", "delta": answer[start:start + 64]}
+        
+        # Persist the turn as if the graph had produced it, so history and follow-ups see it
+        source_refs = [rag_service.source_ref(s) for s in cached["sources"]]
+        reply = AIMessage(content=answer, id=str(uuid.uuid4()), additional_kwargs={
+            "reasoning_steps": steps,
+            "sources": source_refs,
+            "semantic_cache_hit": True
+        })
+        await graph_app.aupdate_state(
+            config,
+            {
+                "messages": [question, reply],
+                "workspace_id": workspace_id,
+                "sources": source_refs,
+                "reasoning_steps": steps
+            },
+            as_node="generate"
+        )
+        updates = ChatService._activity_fields(workspace_id, question.content, answer)
+        if settings.show_reasoning:
+            updates["has_thinking"] = True
+        await ChatService._flush_thread_metadata(thread_id, updates, new_messages=[question, reply])
+
+    @staticmethod
+    def _activity_fields(workspace_id: str, message: str, answer: str) -> Dict:
+        """Denormalized listing fields refreshed at the end of every turn."""
+        preview = " ".join((answer or message).split())
+        return {
+            "workspace_id": workspace_id,
+            "last_active": datetime.utcnow(),
+            "preview": preview[:PREVIEW_CHARS]
+        }
+
+    @staticmethod
+    async def _flush_thread_metadata(thread_id: str, updates: Dict, new_messages: Optional[List[BaseMessage]] = None):
+        """
+        Persist the metadata collected during a turn in a single write, and append the
+        turn's messages to the chat_messages log. Sequence numbers come from the
+        message_count increment, so concurrent writers never collide.
+        """
+        new_messages = new_messages or []
+        if not updates and not new_messages:
+            return
+        try:
+            db = mongodb_manager.get_async_database()
+            update: Dict = {"$set": updates}
+            if new_messages:
+                update["$inc"] = {"message_count": len(new_messages)}
+            # Pre-update document: None means this write created the thread
+            previous = await db["thread_metadata"].find_one_and_update(
+                {"thread_id": thread_id}, update,
+                projection={"message_count": 1}, upsert=True, return_document=ReturnDocument.BEFORE
+            )
+            if previous is None:
+                await workspace_stats.inc(updates.get("workspace_id"), thread_count=1)
+            if new_messages:
+                first_seq = (previous or {}).get("message_count")
+                if first_seq is None:
+                    # First logged turn: a thread that predates the log starts it with its checkpointed history
+                    first_seq = await ChatService._seed_message_log(thread_id, updates.get("workspace_id"), new_messages)
+                now = datetime.utcnow()
+                await db["chat_messages"].insert_many([
+                    {
+                        **ChatService._message_entry(msg),
+                        "thread_id": thread_id,
+                        "workspace_id": updates.get("workspace_id"),
+                        "seq": first_seq + i,
+                        "created_at": now
+                    }
+                    for i, msg in enumerate(new_messages)
+                ])
+        except Exception as e:
+            logger.error(f"Failed to update metadata for thread {thread_id}: {e}")
+
+    @staticmethod
+    async def _seed_message_log(thread_id: str, workspace_id: Optional[str], new_messages: List[BaseMessage]) -> int:
+        """
+        Copy the checkpointed messages that precede this turn into the chat_messages log
+        (seq 0..n-1) and count them into message_count. Returns n, the turn's first seq;
+        0 for a thread created by this turn.
+        """
+        new_ids = {msg.id for msg in new_messages}
+        state = await graph_app.aget_state({"configurable": {"thread_id": thread_id}})
+        earlier = [
+            m for m in (state.values.get("messages", []) if state else [])
+            if m.type in ("human", "ai") and m.id not in new_ids
+        ]
+        if not earlier:
+            return 0
+        
+        db = mongodb_manager.get_async_database()
+        now = datetime.utcnow()
+        await db["chat_messages"].insert_many([
+            {
+                **ChatService._message_entry(msg),
+                "thread_id": thread_id,
+                "workspace_id": workspace_id,
+                "seq": seq,
+                "created_at": now
+            }
+            for seq, msg in enumerate(earlier)
+        ])
+        await db["thread_metadata"].update_one({"thread_id": thread_id}, {"$inc": {"message_count": len(earlier)}})
+        return len(earlier)
 
 chat_service = ChatService()
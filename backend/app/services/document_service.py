@@ -5,22 +5,48 @@ import logging
 import hashlib
 import uuid
 import io
+import asyncio
+import json
+import base64
 from datetime import datetime
 from typing import List, Dict, Optional, Tuple
 from fastapi import UploadFile
 import re
 
-from backend.app.rag.ingestion import ingestion_pipeline
+from backend.app.rag.ingestion import ingestion_pipeline, documents_text
+from backend.app.rag.parse_cache import parse_cache, parsed_path
 from backend.app.rag.qdrant_provider import qdrant
 from qdrant_client.http import models as qmodels
 from backend.app.core.minio import minio_manager
 from backend.app.core.mongodb import mongodb_manager
 from backend.app.services.task_service import task_service
 from backend.app.core.settings_manager import settings_manager
+from backend.app.core.generations import content_generations
+from backend.app.core.workspace_stats import workspace_stats
+from backend.app.core.search_keys import search_keys
+from backend.app.core.text_artifacts import text_artifacts
 from backend.app.core.exceptions import ValidationError, ConflictError, NotFoundError
 
 logger = logging.getLogger(__name__)
 
+DOCUMENT_PAGE_SIZE = 100
+DOCUMENT_SORT_FIELDS = ("created_at", "filename")  # Each backed by (.., field, id) indexes
+# Fields the document tables show; internal ones (minio_path, search_keys, hashes) stay in Mongo
+DOCUMENT_LIST_PROJECTION = {
+    "_id": 0, "id": 1, "filename": 1, "extension": 1, "workspace_id": 1, "shared_with": 1,
+    "status": 1, "chunks": 1, "size_bytes": 1, "current_version": 1, "created_at": 1, "updated_at": 1
+}
+
+def _encode_cursor(value, doc_id: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([value, doc_id]).encode()).decode()
+
+def _decode_cursor(cursor: str) -> Tuple:
+    try:
+        value, doc_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return value, doc_id
+    except Exception:
+        raise ValidationError("Invalid page cursor.")
+
 class DocumentService:
     @staticmethod
     async def upload(file: UploadFile, workspace_id: str) -> Tuple[str, bytes, str, str]:
@@ -105,22 +131,28 @@ class DocumentService:
                 "created_at": timestamp, 
                 "updated_at": timestamp, 
                 "shared_with": [],
-                "rag_config_hash": rag_hash  # Traceability
+                "rag_config_hash": rag_hash,  # Traceability
+                "search_keys": search_keys(safe_filename)
             }
+            if existing_vault_doc and existing_vault_doc.get("text_artifact"):
+                # Same physical file, same extracted text
+                doc_record["text_artifact"] = existing_vault_doc["text_artifact"]
             await db.documents.insert_one(doc_record)
+            await workspace_stats.inc(workspace_id, doc_count=1, size_bytes=file_size)
             
             # Check if we can also reuse embeddings (Only if RAG config matches exactly)
             if existing_vault_doc and existing_vault_doc.get("rag_config_hash") == rag_hash:
                  task_service.update_task(task_id, progress=90, message="Reusing compatible embeddings...")
                  # Link the existing vectors in Qdrant to this new workspace_id
-                 from qdrant_client.http import models as qmodels
-                 await qdrant.client.set_payload(
-                     collection_name=await qdrant.get_effective_collection("knowledge_base", workspace_id),
-                     payload={"shared_with": [workspace_id]}, # Simple link by adding to shared_with or mirroring
-                     points=qmodels.Filter(must=[qmodels.FieldCondition(key="content_hash", match=qmodels.MatchValue(value=file_hash))])
+                 await qdrant.set_payload(
+                     await qdrant.get_effective_collection("knowledge_base", workspace_id),
+                     {"shared_with": [workspace_id]}, # Simple link by adding to shared_with or mirroring
+                     qmodels.Filter(must=[qmodels.FieldCondition(key="content_hash", match=qmodels.MatchValue(value=file_hash))])
                  )
                  num_chunks = existing_vault_doc.get("chunks", 0)
                  await db.documents.update_one({"id": doc_id}, {"$set": {"status": "indexed", "chunks": num_chunks}})
+                 await workspace_stats.inc(workspace_id, chunk_count=num_chunks)
+                 await content_generations.bump(workspace_id)
                  task_service.update_task(task_id, status="completed", progress=100, message="Reused existing embeddings.")
                  return
 
@@ -133,10 +165,15 @@ class DocumentService:
 
             try:
                 await ingestion_pipeline.initialize(workspace_id=workspace_id)
+                # A vault copy indexed under another config leaves its parse output behind
+                documents = await ingestion_pipeline.parse(tmp_path, content_hash=file_hash)
+                if "text_artifact" not in doc_record:
+                    await DocumentService._store_text(minio_path, documents)
                 task_service.update_task(task_id, progress=70, message="Generating embeddings...")
                 
-                num_chunks = await ingestion_pipeline.process_file(
-                    tmp_path, 
+                num_chunks = await ingestion_pipeline.index_documents(
+                    documents,
+                    extension=extension,
                     metadata={
                         "filename": safe_filename, 
                         "workspace_id": workspace_id,
@@ -149,6 +186,8 @@ class DocumentService:
                 )
                 
                 await db.documents.update_one({"id": doc_id}, {"$set": {"status": "indexed", "chunks": num_chunks}})
+                await workspace_stats.inc(workspace_id, chunk_count=num_chunks)
+                await content_generations.bump(workspace_id)
                 task_service.update_task(task_id, status="completed", progress=100, message="Successfully indexed.")
             finally:
                 if os.path.exists(tmp_path):
@@ -167,40 +206,68 @@ class DocumentService:
             await db.documents.update_one({"id": doc_id}, {"$set": {"status": "failed"}})
 
     @staticmethod
-    async def list_by_workspace(workspace_id: str) -> List[Dict]:
-        db = mongodb_manager.get_async_database()
-        cursor = db.documents.find({
-            "$or": [
-                {"workspace_id": workspace_id},
-                {"shared_with": workspace_id}
-            ]
-        })
-        all_docs = await cursor.to_list(length=200)
-        for d in all_docs:
-            if d.get("shared_with") and workspace_id in d["shared_with"]:
-                d["is_shared"] = True
-            if "_id" in d:
-                d["_id"] = str(d["_id"])
+    def _page_query(base: Dict, sort: str, order: str, cursor: Optional[str]) -> Tuple[Dict, List[Tuple[str, int]]]:
+        """Filter and sort for one keyset page ordered by (sort, id)."""
+        if sort not in DOCUMENT_SORT_FIELDS:
+            raise ValidationError(f"Unsupported sort field '{sort}'.", params={"allowed": list(DOCUMENT_SORT_FIELDS)})
+        direction = -1 if order == "desc" else 1
+        query = dict(base)
+        if cursor:
+            value, last_id = _decode_cursor(cursor)
+            op = "$lt" if direction < 0 else "$gt"
+            query = {"$and": [base, {"$or": [{sort: {op: value}}, {sort: value, "id": {op: last_id}}]}]}
+        return query, [(sort, direction), ("id", direction)]
+
+    @staticmethod
+    def _page(docs: List[Dict], limit: int, sort: str) -> Dict:
+        for d in docs:
             d["name"] = d.get("filename")
-        return all_docs
+        # Pass next_cursor back as `cursor` to fetch the following page
+        next_cursor = _encode_cursor(docs[-1].get(sort), docs[-1]["id"]) if len(docs) == limit else None
+        return {"documents": docs, "next_cursor": next_cursor}
 
     @staticmethod
-    async def list_all() -> List[Dict]:
+    async def list_by_workspace(
+        workspace_id: str,
+        limit: int = DOCUMENT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        sort: str = "created_at",
+        order: str = "desc",
+        include_shared: bool = True
+    ) -> Dict:
+        """One page of the documents owned by (and optionally shared with) a workspace."""
         db = mongodb_manager.get_async_database()
-        cursor = db.documents.find()
-        docs = await cursor.to_list(length=1000)
-        
-        # Get all workspaces to map IDs to Names
-        ws_cursor = db.workspaces.find({}, {"id": 1, "name": 1})
-        workspaces = await ws_cursor.to_list(length=1000)
-        ws_map = {ws.get("id", ""): ws.get("name", "Unknown") for ws in workspaces if ws.get("id")}
-        
+        base = {"$or": [{"workspace_id": workspace_id}, {"shared_with": workspace_id}]} if include_shared \
+            else {"workspace_id": workspace_id}
+        query, sort_spec = DocumentService._page_query(base, sort, order, cursor)
+        docs = await db.documents.find(query, DOCUMENT_LIST_PROJECTION).sort(sort_spec).limit(limit).to_list(length=limit)
         for d in docs:
-            if "_id" in d:
-                d["_id"] = str(d["_id"])
-            d["name"] = d.get("filename")
-            d["workspace_name"] = ws_map.get(d.get("workspace_id", ""), "Unknown Workspace")
-        return docs
+            if workspace_id in d.get("shared_with", []):
+                d["is_shared"] = True
+        return DocumentService._page(docs, limit, sort)
+
+    @staticmethod
+    async def list_all(
+        limit: int = DOCUMENT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        sort: str = "created_at",
+        order: str = "desc"
+    ) -> Dict:
+        """One page of the whole vault, with owning workspace names joined server-side."""
+        db = mongodb_manager.get_async_database()
+        query, sort_spec = DocumentService._page_query({}, sort, order, cursor)
+        pipeline = [
+            {"$match": query},
+            {"$sort": dict(sort_spec)},
+            {"$limit": limit},
+            {"$lookup": {"from": "workspaces", "localField": "workspace_id", "foreignField": "id", "as": "workspace"}},
+            {"$project": {
+                **DOCUMENT_LIST_PROJECTION,
+                "workspace_name": {"$ifNull": [{"$arrayElemAt": ["$workspace.name", 0]}, "Unknown Workspace"]}
+            }}
+        ]
+        docs = await db.documents.aggregate(pipeline).to_list(length=limit)
+        return DocumentService._page(docs, limit, sort)
 
     @staticmethod
     async def get_by_id_or_name(name: str) -> Optional[Dict]:
@@ -216,20 +283,56 @@ class DocumentService:
         return doc
 
     @staticmethod
-    async def get_content(name: str) -> Optional[str]:
+    async def _store_text(minio_path: str, documents) -> Optional[Dict]:
+        """Persist the extracted text of a physical file and link it on every record using that file."""
         db = mongodb_manager.get_async_database()
-        # Try finding by ID first, then by filename
-        doc = await db.documents.find_one({
-            "$or": [
-                {"id": name},
-                {"filename": name}
-            ]
-        })
+        try:
+            meta = await text_artifacts.save(minio_path, documents_text(documents))
+        except Exception as e:
+            # Content views fall back to rebuilding from chunks
+            logger.error(f"Failed to store text artifact for {minio_path}: {e}")
+            return None
+        await db.documents.update_many({"minio_path": minio_path}, {"$set": {"text_artifact": meta}})
+        return meta
+
+    @staticmethod
+    async def get_text_artifact(name: str) -> Optional[Dict]:
+        """
+        Text artifact metadata of a document, extracting it from the original file
+        on first access for documents ingested before artifacts existed.
+        """
+        db = mongodb_manager.get_async_database()
+        doc = await db.documents.find_one(
+            {"$or": [{"id": name}, {"filename": name}]},
+            {"_id": 0, "minio_path": 1, "extension": 1, "content_hash": 1, "text_artifact": 1}
+        )
         if not doc:
+            raise NotFoundError(f"Document '{name}' not found")
+        if doc.get("text_artifact"):
+            return doc["text_artifact"]
+
+        try:
+            documents = await parse_cache.load(doc["content_hash"]) if doc.get("content_hash") else None
+            if documents is None:
+                documents = await DocumentService._parse_vault_file(doc)
+            return await DocumentService._store_text(doc["minio_path"], documents)
+        except Exception as e:
+            logger.error(f"Text extraction failed for {name}: {e}")
             return None
-            
-        workspace_id = doc.get("workspace_id")
-        return await qdrant.get_document_content("knowledge_base", doc["filename"], workspace_id=workspace_id)
+
+    @staticmethod
+    async def get_content(name: str) -> Optional[str]:
+        try:
+            meta = await DocumentService.get_text_artifact(name)
+        except NotFoundError:
+            return None
+        if meta:
+            return await asyncio.to_thread(text_artifacts.read, meta)
+
+        # Last resort: rebuild from the indexed chunks
+        db = mongodb_manager.get_async_database()
+        doc = await db.documents.find_one({"$or": [{"id": name}, {"filename": name}]}, {"filename": 1, "workspace_id": 1})
+        return await qdrant.get_document_content("knowledge_base", doc["filename"], workspace_id=doc.get("workspace_id"))
 
     @staticmethod
     async def delete(name: str, workspace_id: str, vault_delete: bool = False):
@@ -256,6 +359,10 @@ class DocumentService:
             if others == 0:
                 try:
                     minio_manager.delete_file(doc["minio_path"])
+                    if doc.get("text_artifact"):
+                        minio_manager.delete_file(doc["text_artifact"]["path"])
+                    if doc.get("content_hash"):
+                        minio_manager.delete_file(parsed_path(doc["content_hash"]))
                 except Exception as e:
                     logger.error(f"MinIO delete failed: {e}")
             
@@ -263,18 +370,27 @@ class DocumentService:
             for dim in [384, 768, 1024, 1536, 1792, 3072]:
                 coll = f"knowledge_base_{dim}"
                 if await qdrant.client.collection_exists(coll):
-                    await qdrant.client.delete(
-                        collection_name=coll,
-                        points_selector=qmodels.Filter(must=[qmodels.FieldCondition(key="content_hash", match=qmodels.MatchValue(value=doc["content_hash"]))])
+                    await qdrant.delete_points(
+                        coll,
+                        qmodels.Filter(must=[qmodels.FieldCondition(key="content_hash", match=qmodels.MatchValue(value=doc["content_hash"]))])
                     )
 
             # 3. Database removal: Delete ALL records sharing this file path
+            linked = await db.documents.find(
+                {"minio_path": doc["minio_path"]}, {"workspace_id": 1, "shared_with": 1, "chunks": 1, "size_bytes": 1}
+            ).to_list(None)
             await db.documents.delete_many({"minio_path": doc["minio_path"]})
+            affected = [doc["workspace_id"], *doc.get("shared_with", [])]
+            for record in linked:
+                affected += [record.get("workspace_id"), *record.get("shared_with", [])]
+                await workspace_stats.inc(record.get("workspace_id"), **DocumentService._owned_stats(record, -1))
+            await content_generations.bump(*affected)
         else:
             # LOCAL REMOVAL: Remove association from this workspace only
             if doc["workspace_id"] == workspace_id:
                 # Owner is removing. Unassign to 'vault' (system unassigned) instead of deleting
                 await db.documents.update_one({"id": doc["id"]}, {"$set": {"workspace_id": "vault"}})
+                await workspace_stats.inc(workspace_id, **DocumentService._owned_stats(doc, -1))
             else:
                 # Shared instance is removing. Remove from shared_with list
                 await db.documents.update_one({"id": doc["id"]}, {"$pull": {"shared_with": workspace_id}})
@@ -283,83 +399,95 @@ class DocumentService:
             target_settings = await settings_manager.get_settings(workspace_id)
             coll = qdrant.get_collection_name(target_settings.embedding_dim)
             if await qdrant.client.collection_exists(coll):
-                await qdrant.client.delete(
-                    collection_name=coll,
-                    points_selector=qmodels.Filter(must=[
+                await qdrant.delete_points(
+                    coll,
+                    qmodels.Filter(must=[
                         qmodels.FieldCondition(key="doc_id", match=qmodels.MatchValue(value=doc["id"])),
                         qmodels.FieldCondition(key="workspace_id", match=qmodels.MatchValue(value=workspace_id))
                     ])
                 )
+            await content_generations.bump(workspace_id, *doc.get("shared_with", []))
 
     @staticmethod
-    async def get_chunks(name: str, limit: int = 100) -> List[Dict]:
-        from qdrant_client.http import models as qmodels
+    async def _chunk_source(name: str) -> Tuple[Optional[Dict], Optional[str]]:
+        """The document record (by id or filename) and the collection holding its chunks."""
         db = mongodb_manager.get_async_database()
-        doc = await db.documents.find_one({
-            "$or": [
-                {"id": name},
-                {"filename": name}
-            ]
-        })
+        doc = await db.documents.find_one(
+            {"$or": [{"id": name}, {"filename": name}]},
+            {"_id": 0, "id": 1, "workspace_id": 1, "chunks": 1}
+        )
         if not doc:
-            return []
-            
-        workspace_id = doc.get("workspace_id")
-        collection_name = await qdrant.get_effective_collection("knowledge_base", workspace_id)
-        
+            return None, None
+        return doc, await qdrant.get_effective_collection("knowledge_base", doc.get("workspace_id"))
+
+    @staticmethod
+    async def get_chunks(name: str, limit: int = 100, start: int = 0) -> Dict:
+        """
+        One page of a document's chunks in reading order, starting at chunk index `start`.
+        Pass next_offset back as `start` to continue; it is None on the last page.
+        """
+        doc, collection_name = await DocumentService._chunk_source(name)
+        if not doc:
+            return {"chunks": [], "next_offset": None, "total": 0}
+
         try:
-            response = await qdrant.client.scroll(
-                collection_name=collection_name,
-                scroll_filter=qmodels.Filter(must=[qmodels.FieldCondition(key="doc_id", match=qmodels.MatchValue(value=doc["id"]))]),
-                limit=limit,
-                with_payload=True,
-                with_vectors=False
-            )
-            chunks = []
-            for p in response[0]:
-                chunks.append({
-                    "id": p.id,
-                    "text": p.payload.get("text", ""),
-                    "index": p.payload.get("index", 0),
-                    "metadata": {k: v for k, v in p.payload.items() if k not in ["text", "vector"]}
-                })
-            # Sort by index
-            chunks.sort(key=lambda x: x["index"])
-            return chunks
+            # One extra point tells whether another page follows
+            points = await qdrant.scroll_document_chunks(collection_name, doc["id"], start=start, limit=limit + 1)
         except Exception as e:
             logger.error(f"Get chunks failed for {name}: {e}")
-            return []
+            return {"chunks": [], "next_offset": None, "total": doc.get("chunks", 0)}
+
+        chunks = [
+            {
+                "id": p.id,
+                "text": p.payload.get("text", ""),
+                "index": p.payload.get("index", 0),
+                "metadata": {k: v for k, v in p.payload.items() if k not in ["text", "vector"]}
+            }
+            for p in points[:limit]
+        ]
+        next_offset = points[limit].payload.get("index") if len(points) > limit else None
+        return {"chunks": chunks, "next_offset": next_offset, "total": doc.get("chunks", 0)}
 
     @staticmethod
-    async def inspect(name: str) -> List[Dict]:
-        from qdrant_client.http import models as qmodels
-        db = mongodb_manager.get_async_database()
-        # Support both ID and Filename
-        doc = await db.documents.find_one({
-            "$or": [
-                {"id": name},
-                {"filename": name}
-            ]
-        })
+    async def inspect(name: str, limit: int = 100, start: int = 0) -> List[Dict]:
+        """Ordered points of a document with their payloads; the dimension comes from the collection config."""
+        doc, collection_name = await DocumentService._chunk_source(name)
         if not doc:
             return []
-            
-        workspace_id = doc.get("workspace_id")
-        collection_name = await qdrant.get_effective_collection("knowledge_base", workspace_id)
-        
+
         try:
-            response = await qdrant.client.scroll(
-                collection_name=collection_name,
-                scroll_filter=qmodels.Filter(must=[qmodels.FieldCondition(key="doc_id", match=qmodels.MatchValue(value=doc["id"]))]),
-                limit=100,
-                with_payload=True,
-                with_vectors=True
-            )
-            return [{"id": p.id, "payload": p.payload, "vector_size": len(p.vector) if p.vector else 0} for p in response[0]]
+            points = await qdrant.scroll_document_chunks(collection_name, doc["id"], start=start, limit=limit)
+            vector_size = await qdrant.get_vector_size(collection_name)
+            return [{"id": p.id, "payload": p.payload, "vector_size": vector_size} for p in points]
         except Exception as e:
             logger.error(f"Inspect failed for {name}: {e}")
             return []
 
+    @staticmethod
+    def _owned_stats(doc: Dict, sign: int) -> Dict[str, int]:
+        """Counter deltas for a document entering (+1) or leaving (-1) its owner workspace."""
+        return {
+            "doc_count": sign,
+            "chunk_count": sign * doc.get("chunks", 0),
+            "size_bytes": sign * doc.get("size_bytes", 0)
+        }
+
+    @staticmethod
+    async def _parse_vault_file(doc: Dict):
+        """Download and parse a stored original (parse-cache miss), filling the cache."""
+        file_data = await asyncio.to_thread(minio_manager.get_file, doc["minio_path"])
+        if not file_data:
+            raise ValueError("Source file missing in vault storage.")
+
+        with tempfile.NamedTemporaryFile(delete=False, suffix=doc.get("extension", ".tmp")) as tmp:
+            tmp.write(file_data)
+            tmp_path = tmp.name
+        try:
+            return await ingestion_pipeline.parse(tmp_path, content_hash=doc.get("content_hash"))
+        finally:
+            os.remove(tmp_path)
+
     @staticmethod
     async def update_workspaces(name: str, target_workspace_id: str, action: str, force_reindex: bool = False):
         """Cross-workspace orchestration (move/share) with RAG Config auditing."""
@@ -381,49 +509,46 @@ class DocumentService:
             )
 
         if force_reindex or (not is_config_compatible):
-            # Full Re-indexing Flow (Using shared vault document)
-            file_data = minio_manager.get_file(res["minio_path"])
-            if not file_data:
-                raise ValueError("Source file missing in vault storage.")
-                
-            suffix = res.get("extension", ".tmp")
-            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-                tmp.write(file_data)
-                tmp_path = tmp.name
+            # Full re-indexing flow: start from the cached parse output of the vault file
+            documents = await parse_cache.load(res["content_hash"])
+            if documents is None:
+                documents = await DocumentService._parse_vault_file(res)
+            if not res.get("text_artifact"):
+                await DocumentService._store_text(res["minio_path"], documents)
 
-            try:
-                await ingestion_pipeline.initialize(workspace_id=target_workspace_id)
-                await ingestion_pipeline.process_file(
-                    tmp_path, 
-                    metadata={
-                        "filename": res["filename"], 
-                        "workspace_id": target_workspace_id,
-                        "doc_id": res["id"],
-                        "version": res.get("current_version", 1),
-                        "minio_path": res["minio_path"],
-                        "content_hash": res["content_hash"],
-                        "rag_config_hash": target_rag_hash
-                    }
-                )
-                await db.documents.update_one({"id": res["id"]}, {"$set": {"rag_config_hash": target_rag_hash}})
-            finally:
-                if os.path.exists(tmp_path):
-                    os.remove(tmp_path)
+            await ingestion_pipeline.initialize(workspace_id=target_workspace_id)
+            await ingestion_pipeline.index_documents(
+                documents,
+                extension=res.get("extension", ""),
+                metadata={
+                    "filename": res["filename"], 
+                    "workspace_id": target_workspace_id,
+                    "doc_id": res["id"],
+                    "version": res.get("current_version", 1),
+                    "minio_path": res["minio_path"],
+                    "content_hash": res["content_hash"],
+                    "rag_config_hash": target_rag_hash
+                }
+            )
+            await db.documents.update_one({"id": res["id"]}, {"$set": {"rag_config_hash": target_rag_hash}})
 
         # Update MongoDB Association
         if action == "move":
             source_ws_id = res["workspace_id"]
             # 1. Update ownership in DB
             await db.documents.update_one({"id": res["id"]}, {"$set": {"workspace_id": target_workspace_id}})
+            if source_ws_id != target_workspace_id:
+                await workspace_stats.inc(source_ws_id, **DocumentService._owned_stats(res, -1))
+                await workspace_stats.inc(target_workspace_id, **DocumentService._owned_stats(res, 1))
             
             # 2. Cleanup source index (if it's a different workspace)
             if source_ws_id != target_workspace_id:
                 source_settings = await settings_manager.get_settings(source_ws_id)
                 source_coll = qdrant.get_collection_name(source_settings.embedding_dim)
                 if await qdrant.client.collection_exists(source_coll):
-                    await qdrant.client.delete(
-                        collection_name=source_coll,
-                        points_selector=qmodels.Filter(must=[
+                    await qdrant.delete_points(
+                        source_coll,
+                        qmodels.Filter(must=[
                             qmodels.FieldCondition(key="doc_id", match=qmodels.MatchValue(value=res["id"])),
                             qmodels.FieldCondition(key="workspace_id", match=qmodels.MatchValue(value=source_ws_id))
                         ])
@@ -431,4 +556,6 @@ class DocumentService:
         elif action == "share":
             await db.documents.update_one({"id": res["id"]}, {"$addToSet": {"shared_with": target_workspace_id}})
 
+        await content_generations.bump(res["workspace_id"], target_workspace_id)
+
 document_service = DocumentService()
@@ -1,77 +1,209 @@
+import re
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+from typing import AsyncGenerator, List, Dict, Any, Optional, Tuple
+from backend.app.core.config import ai_settings
 from backend.app.core.mongodb import mongodb_manager
+from backend.app.core.search_keys import query_keys, rank, tokenize
+from backend.app.rag.qdrant_provider import qdrant
 
 logger = logging.getLogger(__name__)
 
+# Matches fetched per entity before ranking; keeps ranking in-process cheap
+CANDIDATE_LIMIT = 50
+CHUNK_RESULTS = 10
+SNIPPET_CHARS = 200
+
 class SearchService:
     @staticmethod
     async def global_search(query: str, workspace_id: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
         """
-        Global search across workspaces, threads, and documents.
+        Global search across workspaces, threads, documents and chunk content.
+        Every word of the query must prefix a word of the entity (see core/search_keys.py);
+        the three lookups run concurrently on the `search_keys` indexes and are ranked in-process.
+        Chunk text is matched in every knowledge collection concurrently, each leg under
+        SEARCH_COLLECTION_TIMEOUT_SECONDS; collections that ran out of time are listed in `timed_out`.
         """
-        db = mongodb_manager.get_async_database()
         results = {
             "workspaces": [],
             "threads": [],
             "documents": []
         }
-        
-        if not query or len(query.strip()) < 2:
+
+        keys = query_keys(query or "")
+        if not keys:
             return results
 
-        # 1. Search Workspaces (Global)
-        workspace_cursor = db.workspaces.find({
-            "$or": [
-                {"name": {"$regex": query, "$options": "i"}},
-                {"description": {"$regex": query, "$options": "i"}},
-                {"id": {"$regex": query, "$options": "i"}}
-            ]
-        }).limit(5)
-        
-        async for ws in workspace_cursor:
-            results["workspaces"].append({
-                "id": ws["id"],
-                "name": ws["name"],
-                "description": ws.get("description", "")
+        metadata, chunk_legs = await asyncio.gather(
+            SearchService._search_metadata(query, keys, workspace_id),
+            SearchService._search_all_chunks(query, workspace_id)
+        )
+        results.update(metadata)
+        chunks = [hit for _, hits, _ in chunk_legs for hit in hits]
+        chunks.sort(key=lambda hit: hit["score"], reverse=True)
+        results["chunks"] = chunks[:CHUNK_RESULTS]
+        results["timed_out"] = [collection for collection, _, status in chunk_legs if status == "timeout"]
+        return results
+
+    @staticmethod
+    async def stream_search(query: str, workspace_id: Optional[str] = None) -> AsyncGenerator[Dict, None]:
+        """
+        Same search as global_search, emitted as partial results: one `metadata` event and
+        one `chunks` event per knowledge collection in completion order, then `done`.
+        A slow collection only delays its own event (bounded by the per-collection timeout).
+        """
+        keys = query_keys(query or "")
+        if not keys:
+            yield {"type": "done", "collections": 0, "timed_out": []}
+            return
+
+        collections = await SearchService._chunk_collections()
+        legs = [SearchService._search_metadata(query, keys, workspace_id)] + [
+            SearchService._search_chunks(collection, query, workspace_id) for collection in collections
+        ]
+        timed_out = []
+        for leg in asyncio.as_completed(legs):
+            result = await leg
+            if isinstance(result, dict):
+                yield {"type": "metadata", **result}
+                continue
+            collection, hits, status = result
+            if status == "timeout":
+                timed_out.append(collection)
+            yield {"type": "chunks", "collection": collection, "status": status, "results": hits}
+        yield {"type": "done", "collections": len(collections), "timed_out": timed_out}
+
+    @staticmethod
+    async def _search_metadata(query: str, keys: List[str], workspace_id: Optional[str]) -> Dict[str, List[Dict[str, Any]]]:
+        workspaces, threads, documents = await asyncio.gather(
+            SearchService._search_workspaces(query, keys),
+            SearchService._search_threads(query, keys, workspace_id),
+            SearchService._search_documents(query, keys, workspace_id)
+        )
+        return {"workspaces": workspaces[:5], "threads": threads[:10], "documents": documents[:10]}
+
+    @staticmethod
+    async def _chunk_collections() -> List[str]:
+        try:
+            return await qdrant.list_knowledge_collections()
+        except Exception as e:
+            logger.error(f"Could not list knowledge collections for search: {e}")
+            return []
+
+    @staticmethod
+    async def _search_all_chunks(query: str, workspace_id: Optional[str]) -> List[Tuple[str, List[Dict[str, Any]], str]]:
+        collections = await SearchService._chunk_collections()
+        return await asyncio.gather(*(SearchService._search_chunks(c, query, workspace_id) for c in collections))
+
+    @staticmethod
+    async def _search_chunks(collection: str, query: str, workspace_id: Optional[str]) -> Tuple[str, List[Dict[str, Any]], str]:
+        """One fan-out leg: (collection, ranked hits, status). Never raises."""
+        try:
+            async with asyncio.timeout(ai_settings.SEARCH_COLLECTION_TIMEOUT_SECONDS):
+                points = await qdrant.search_text(collection, query, limit=CANDIDATE_LIMIT, workspace_id=workspace_id)
+        except TimeoutError:
+            logger.warning(f"Chunk search in '{collection}' timed out")
+            return collection, [], "timeout"
+        except Exception as e:
+            logger.error(f"Chunk search in '{collection}' failed: {e}")
+            return collection, [], "error"
+
+        words = tokenize(query)
+        hits = []
+        for point in points:
+            payload = point.payload or {}
+            snippet, highlights = make_snippet(payload.get("text", ""), words)
+            hits.append({
+                "id": str(point.id),
+                "collection": collection,
+                "doc_id": payload.get("doc_id"),
+                "name": payload.get("source"),
+                "workspace_id": payload.get("workspace_id"),
+                "index": payload.get("index"),
+                "score": len(highlights),
+                "snippet": snippet,
+                "highlights": highlights
             })
+        hits.sort(key=lambda hit: hit["score"], reverse=True)
+        return collection, hits[:CHUNK_RESULTS], "ok"
 
-        # 2. Search Threads
-        thread_filter = {
-            "$or": [
-                {"title": {"$regex": query, "$options": "i"}},
-                {"tags": {"$regex": query, "$options": "i"}}
-            ]
-        }
+    @staticmethod
+    async def _search_workspaces(query: str, keys: List[str]) -> List[Dict[str, Any]]:
+        db = mongodb_manager.get_async_database()
+        cursor = db.workspaces.find(
+            {"search_keys": {"$all": keys}, "status": {"$ne": "deleting"}},
+            {"_id": 0, "id": 1, "name": 1, "description": 1}
+        ).limit(CANDIDATE_LIMIT)
+        found = await cursor.to_list(length=CANDIDATE_LIMIT)
+        found.sort(key=lambda ws: rank(query, ws["name"], [ws.get("description"), ws["id"]]), reverse=True)
+        return [
+            {"id": ws["id"], "name": ws["name"], "description": ws.get("description", "")}
+            for ws in found
+        ]
+
+    @staticmethod
+    async def _search_threads(query: str, keys: List[str], workspace_id: Optional[str]) -> List[Dict[str, Any]]:
+        db = mongodb_manager.get_async_database()
+        thread_filter = {"search_keys": {"$all": keys}}
         if workspace_id:
             thread_filter["workspace_id"] = workspace_id
-            
-        thread_cursor = db["thread_metadata"].find(thread_filter).limit(10)
-        async for thread in thread_cursor:
-            results["threads"].append({
+
+        cursor = db["thread_metadata"].find(
+            thread_filter,
+            {"_id": 0, "thread_id": 1, "title": 1, "workspace_id": 1, "tags": 1}
+        ).limit(CANDIDATE_LIMIT)
+        found = await cursor.to_list(length=CANDIDATE_LIMIT)
+        found.sort(key=lambda t: rank(query, t.get("title"), t.get("tags", [])), reverse=True)
+        return [
+            {
                 "id": thread["thread_id"],
                 "title": thread["title"],
                 "workspace_id": thread["workspace_id"],
                 "tags": thread.get("tags", [])
-            })
+            }
+            for thread in found
+        ]
 
-        # 3. Search Documents
-        doc_filter = {
-            "filename": {"$regex": query, "$options": "i"}
-        }
+    @staticmethod
+    async def _search_documents(query: str, keys: List[str], workspace_id: Optional[str]) -> List[Dict[str, Any]]:
+        db = mongodb_manager.get_async_database()
+        doc_filter = {"search_keys": {"$all": keys}}
         if workspace_id:
             doc_filter["workspace_id"] = workspace_id
-            
-        doc_cursor = db.documents.find(doc_filter).limit(10)
-        async for doc in doc_cursor:
-            results["documents"].append({
+
+        cursor = db.documents.find(
+            doc_filter,
+            {"_id": 1, "filename": 1, "workspace_id": 1, "extension": 1, "status": 1}
+        ).limit(CANDIDATE_LIMIT)
+        found = await cursor.to_list(length=CANDIDATE_LIMIT)
+        found.sort(key=lambda doc: rank(query, doc["filename"]), reverse=True)
+        return [
+            {
                 "id": str(doc["_id"]),
                 "name": doc["filename"],
                 "workspace_id": doc["workspace_id"],
                 "extension": doc.get("extension", ""),
                 "status": doc.get("status", "ready")
-            })
+            }
+            for doc in found
+        ]
 
-        return results
+def make_snippet(text: str, words: List[str], width: int = SNIPPET_CHARS) -> Tuple[str, List[List[int]]]:
+    """
+    Window of `text` around the first query-word hit, plus [start, end) offsets
+    of every word-prefix hit inside the window for the client to highlight.
+    """
+    if not words:
+        return text[:width], []
+    pattern = re.compile(r"\b(?:" + "|".join(re.escape(w) for w in words) + r")\w*", re.IGNORECASE)
+    first = pattern.search(text)
+    start = max(0, (first.start() if first else 0) - width // 4)
+    # Do not cut a word in half at the start of the window
+    if start:
+        space = text.find(" ", start)
+        start = space + 1 if 0 <= space < start + 20 else start
+    snippet = text[start:start + width]
+    highlights = [[m.start(), m.end()] for m in pattern.finditer(snippet)]
+    return snippet, highlights
 
 search_service = SearchService()
@@ -1,26 +1,35 @@
 import uuid
+import asyncio
 import logging
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 from backend.app.core.mongodb import mongodb_manager
+from backend.app.core.workspace_stats import empty_stats, workspace_stats
+from backend.app.core.search_keys import search_keys
+from backend.app.core.generations import content_generations
+from backend.app.core.minio import minio_manager
+from backend.app.core.text_artifacts import text_path
+from backend.app.rag.parse_cache import parsed_path
+from backend.app.rag.similarity_graph import similarity_edges, similarity_graph_cache
+from backend.app.services.task_service import task_service
+from qdrant_client.http import models as qmodels
 from backend.app.rag.qdrant_provider import qdrant
 from backend.app.core.exceptions import ValidationError, ConflictError, NotFoundError
 
+logger = logging.getLogger(__name__)
+
+TEARDOWN_BATCH_SIZE = 1000  # Values per MatchAny filter
+
 class WorkspaceService:
     @staticmethod
     async def list_all() -> List[Dict]:
+        """Single query: stats are counters kept on the workspace document (see core/workspace_stats.py)."""
         db = mongodb_manager.get_async_database()
-        cursor = db.workspaces.find()
+        cursor = db.workspaces.find({"status": {"$ne": "deleting"}})
         workspaces = await cursor.to_list(length=100)
-        
-        from qdrant_client.http import models as qmodels
-        enhanced = []
         for ws in workspaces:
-            thread_count = await db["thread_metadata"].count_documents({"workspace_id": ws["id"]})
-            doc_count = await db["documents"].count_documents({"workspace_id": ws["id"]})
-            ws["stats"] = {"thread_count": thread_count, "doc_count": doc_count}
-            enhanced.append(ws)
-        return enhanced
+            ws["stats"] = {**empty_stats(), **ws.get("stats", {})}
+        return workspaces
 
     @staticmethod
     async def create(data: Dict[str, Any]) -> Dict[str, Any]:
@@ -52,14 +61,16 @@ class WorkspaceService:
             "name": name,
             "description": data.get("description", ""),
             "created_at": timestamp,
-            "updated_at": timestamp
+            "updated_at": timestamp,
+            "stats": empty_stats(),
+            "search_keys": search_keys(name, data.get("description", ""), workspace_id)
         }
         
         await db.workspaces.insert_one(workspace)
 
         # Persist RAG settings via SettingsManager
         from backend.app.core.settings_manager import settings_manager
-        rag_fields = ["rag_engine", "embedding_provider", "embedding_model", "embedding_dim", "chunk_size", "chunk_overlap", "neo4j_uri", "neo4j_user"]
+        rag_fields = ["rag_engine", "embedding_provider", "embedding_model", "embedding_dim", "chunk_size", "chunk_overlap", "chunking_mode", "neo4j_uri", "neo4j_user"]
         settings_to_apply = {k: data[k] for k in rag_fields if k in data}
         
         # We bypass update_settings to avoid immutability check during initial creation
@@ -79,8 +90,10 @@ class WorkspaceService:
             new_ws = {
                 "id": "default", 
                 "name": "Default Workspace", 
-                "description": "The system fallback workspace. Cannot be deleted or edited."
+                "description": "The system fallback workspace. Cannot be deleted or edited.",
+                "stats": empty_stats()
             }
+            new_ws["search_keys"] = search_keys(new_ws["name"], new_ws["description"], "default")
             await db.workspaces.insert_one(new_ws)
             
             # Initialize default settings if missing
@@ -118,6 +131,14 @@ class WorkspaceService:
                 raise ConflictError(f"A workspace with the name '{new_name}' already exists.")
             data["name"] = new_name
 
+        if "name" in data or "description" in data:
+            current = await db.workspaces.find_one({"id": workspace_id}, {"name": 1, "description": 1}) or {}
+            data["search_keys"] = search_keys(
+                data.get("name", current.get("name")),
+                data.get("description", current.get("description")),
+                workspace_id
+            )
+
         data["updated_at"] = datetime.utcnow().isoformat()
                 
         result = await db.workspaces.find_one_and_update(
@@ -130,30 +151,112 @@ class WorkspaceService:
         return result
 
     @staticmethod
-    async def delete(workspace_id: str, vault_delete: bool = False):
+    async def delete(workspace_id: str, vault_delete: bool = False) -> str:
+        """
+        Hide the workspace and register its teardown task; the caller runs
+        run_teardown in the background. Returns the task id for progress polling.
+        """
         if workspace_id == "default":
             raise ValueError("The 'default' workspace is a system fallback and cannot be deleted.")
             
         db = mongodb_manager.get_async_database()
-        
-        # 1. Handle associated documents
-        # Fetch docs owned by or shared with this workspace
-        owned_docs = await db.documents.find({"workspace_id": workspace_id}).to_list(1000)
-        shared_docs = await db.documents.find({"shared_with": workspace_id}).to_list(1000)
-        
+        result = await db.workspaces.update_one({"id": workspace_id}, {"$set": {"status": "deleting"}})
+        if not result.matched_count:
+            raise NotFoundError(f"Workspace {workspace_id} not found.")
+        return task_service.create_task("workspace_teardown", {"workspace_id": workspace_id, "vault_delete": vault_delete})
+
+    @staticmethod
+    async def run_teardown(task_id: str, workspace_id: str, vault_delete: bool = False):
+        """
+        Remove a workspace and everything attached to it with bulk operations:
+        one filtered Qdrant delete per collection, set-based Mongo updates and
+        batched MinIO removals. Same outcome as deleting every document one by one.
+        """
+        from backend.app.core.settings_manager import settings_manager
         from backend.app.services.document_service import document_service
-        # For owned docs, apply chosen vault_delete logic
-        for doc in owned_docs:
-            await document_service.delete(doc["filename"], workspace_id, vault_delete=vault_delete)
+        
+        db = mongodb_manager.get_async_database()
+        try:
+            task_service.update_task(task_id, status="processing", progress=5, message="Collecting documents...")
+            owned = await db.documents.find(
+                {"workspace_id": workspace_id}, {"id": 1, "minio_path": 1, "content_hash": 1}
+            ).to_list(None)
+            shared = await db.documents.find({"shared_with": workspace_id}, {"id": 1}).to_list(None)
+            task_service.update_task(task_id, metadata={"owned_documents": len(owned), "shared_documents": len(shared)})
             
-        # For shared docs, we just remove the share association regardless
-        for doc in shared_docs:
-            await document_service.delete(doc["filename"], workspace_id, vault_delete=False)
-
-        # 2. Cleanup workspace meta
-        await db.workspaces.delete_one({"id": workspace_id})
-        await db["workspace_settings"].delete_one({"workspace_id": workspace_id})
-        await db["thread_metadata"].delete_many({"workspace_id": workspace_id})
+            settings = await settings_manager.get_settings(workspace_id)
+            ws_collection = qdrant.get_collection_name(settings.embedding_dim)
+            affected = {workspace_id}
+            
+            if vault_delete and owned:
+                task_service.update_task(task_id, progress=20, message="Purging vectors from all collections...")
+                hashes = list({d["content_hash"] for d in owned if d.get("content_hash")})
+                for collection in await qdrant.list_knowledge_collections():
+                    for start in range(0, len(hashes), TEARDOWN_BATCH_SIZE):
+                        await qdrant.delete_points(
+                            collection,
+                            qmodels.Filter(must=[qmodels.FieldCondition(
+                                key="content_hash", match=qmodels.MatchAny(any=hashes[start:start + TEARDOWN_BATCH_SIZE])
+                            )])
+                        )
+                
+                task_service.update_task(task_id, progress=50, message="Removing vault records...")
+                paths = list({d["minio_path"] for d in owned})
+                linked = await db.documents.find(
+                    {"minio_path": {"$in": paths}},
+                    {"minio_path": 1, "workspace_id": 1, "shared_with": 1, "chunks": 1, "size_bytes": 1}
+                ).to_list(None)
+                await db.documents.delete_many({"minio_path": {"$in": paths}})
+                
+                references: Dict[str, int] = {}
+                for record in linked:
+                    references[record["minio_path"]] = references.get(record["minio_path"], 0) + 1
+                    affected.update([record.get("workspace_id"), *record.get("shared_with", [])])
+                    if record.get("workspace_id") != workspace_id:
+                        await workspace_stats.inc(record.get("workspace_id"), **document_service._owned_stats(record, -1))
+                
+                # Like a single vault delete, files still referenced by another record are kept
+                task_service.update_task(task_id, progress=65, message="Deleting files from storage...")
+                orphaned = [path for path, count in references.items() if count == 1]
+                # Originals plus their derived text and parse cache objects (absent for legacy documents)
+                hashes_by_path = {d["minio_path"]: d.get("content_hash") for d in owned}
+                orphaned += [text_path(path) for path in orphaned] + [
+                    parsed_path(hashes_by_path[path]) for path in orphaned if hashes_by_path.get(path)
+                ]
+                failed = await asyncio.to_thread(minio_manager.delete_files, orphaned)
+                task_service.update_task(task_id, metadata={"files_deleted": len(orphaned) - failed, "files_failed": failed})
+            else:
+                task_service.update_task(task_id, progress=30, message="Returning documents to the vault...")
+                await db.documents.update_many({"workspace_id": workspace_id}, {"$set": {"workspace_id": "vault"}})
+            
+            task_service.update_task(task_id, progress=75, message="Removing workspace vectors...")
+            await db.documents.update_many({"shared_with": workspace_id}, {"$pull": {"shared_with": workspace_id}})
+            doc_ids = [d["id"] for d in owned + shared]
+            if doc_ids and await qdrant.client.collection_exists(ws_collection):
+                for start in range(0, len(doc_ids), TEARDOWN_BATCH_SIZE):
+                    await qdrant.delete_points(
+                        ws_collection,
+                        qmodels.Filter(must=[
+                            qmodels.FieldCondition(key="doc_id", match=qmodels.MatchAny(any=doc_ids[start:start + TEARDOWN_BATCH_SIZE])),
+                            qmodels.FieldCondition(key="workspace_id", match=qmodels.MatchValue(value=workspace_id))
+                        ])
+                    )
+            
+            task_service.update_task(task_id, progress=90, message="Removing threads and settings...")
+            thread_ids = await db["thread_metadata"].distinct("thread_id", {"workspace_id": workspace_id})
+            if thread_ids:
+                for collection in ("checkpoints", "checkpoint_writes", "chat_messages"):
+                    await db[collection].delete_many({"thread_id": {"$in": thread_ids}})
+            await db["thread_metadata"].delete_many({"workspace_id": workspace_id})
+            await db["workspace_settings"].delete_one({"workspace_id": workspace_id})
+            await db.workspaces.delete_one({"id": workspace_id})
+            
+            await content_generations.bump(*affected)
+            task_service.update_task(task_id, status="completed", progress=100, message="Workspace deleted.")
+        except Exception as e:
+            logger.error(f"Teardown of workspace {workspace_id} failed: {e}")
+            # Leave the workspace hidden; rerunning the teardown is safe
+            task_service.update_task(task_id, status="failed", message=str(e), error_code="TEARDOWN_FAILED")
 
     @staticmethod
     async def get_details(workspace_id: str) -> Optional[Dict]:
@@ -166,15 +269,14 @@ class WorkspaceService:
             t["id"] = t.get("thread_id", str(t.get("_id", "")))
             if "_id" in t: del t["_id"]
             
-        doc_cursor = db.documents.find({"workspace_id": workspace_id})
-        docs = await doc_cursor.to_list(length=100)
-        for d in docs:
-            if "_id" in d: d["_id"] = str(d["_id"])
-            d["name"] = d.get("filename")
+        # First page only; GET /documents continues from documents_next_cursor
+        from backend.app.services.document_service import document_service
+        page = await document_service.list_by_workspace(workspace_id, include_shared=False)
         
         ws["threads"] = threads
-        ws["documents"] = docs
-        ws["stats"] = {"thread_count": len(threads), "doc_count": len(docs)}
+        ws["documents"] = page["documents"]
+        ws["documents_next_cursor"] = page["next_cursor"]
+        ws["stats"] = {**empty_stats(), **ws.get("stats", {})}
         
         from backend.app.core.settings_manager import settings_manager
         settings = await settings_manager.get_settings(workspace_id)
@@ -184,40 +286,29 @@ class WorkspaceService:
 
     @staticmethod
     async def get_graph_data(workspace_id: str) -> Dict:
-        """Generate a semantic graph of documents within a workspace."""
+        """
+        Semantic graph of the documents within a workspace: kNN similarity edges between
+        document centroids, cached until the workspace content changes.
+        """
+        from backend.app.core.settings_manager import settings_manager
+        settings = await settings_manager.get_settings(workspace_id)
+        generation = await content_generations.get(workspace_id)
+        cache_key = (workspace_id, settings.embedding_dim, generation)
+        cached = similarity_graph_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         centroids = await qdrant.get_document_centroids(workspace_id)
-        
-        nodes = []
-        for doc_id, data in centroids.items():
-            nodes.append({
-                "id": doc_id,
-                "name": data["name"],
-                "val": 10,
-                "type": "document"
-            })
-            
-        import numpy as np
-        edges = []
         doc_ids = list(centroids.keys())
-        
-        # O(N^2) but N is small for a workspace
-        for i in range(len(doc_ids)):
-            for j in range(i + 1, len(doc_ids)):
-                id1, id2 = doc_ids[i], doc_ids[j]
-                v1 = np.array(centroids[id1]["vector"])
-                v2 = np.array(centroids[id2]["vector"])
-                
-                # Cosine similarity
-                sim = np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2))
-                
-                if sim > 0.75: # Moderate similarity threshold for graph visualization
-                    edges.append({
-                        "source": id1,
-                        "target": id2,
-                        "value": float(sim),
-                        "distance": float(1.0 - sim) # Used for layout distance
-                    })
-        
-        return {"nodes": nodes, "edges": edges}
+        nodes = [
+            {"id": doc_id, "name": centroids[doc_id]["name"], "val": 10, "type": "document"}
+            for doc_id in doc_ids
+        ]
+        # Matrix products release the GIL, keep them off the event loop
+        edges = await asyncio.to_thread(similarity_edges, doc_ids, [centroids[d]["vector"] for d in doc_ids])
+
+        graph = {"nodes": nodes, "edges": edges}
+        similarity_graph_cache.put(cache_key, graph)
+        return graph
 
 workspace_service = WorkspaceService()
@@ -0,0 +1,84 @@
+"""
+Explain the MongoDB queries issued by the services and flag any that still run
+as a collection scan (COLLSCAN). Exits with status 1 when one is found.
+
+    python -m backend.scripts.audit_queries [--ensure-indexes]
+
+Keep AUDITED_QUERIES in step with the filters used in app/services and app/core.
+"""
+import argparse
+import asyncio
+import sys
+from typing import Dict, List, Optional, Tuple
+from backend.app.core.mongodb import mongodb_manager
+from backend.app.core.indexes import ensure_indexes
+
+WS = "__audit_ws__"
+NAME = "__audit_name__"
+
+# (label, collection, filter, sort)
+AUDITED_QUERIES: List[Tuple[str, str, Dict, Optional[Dict]]] = [
+    ("upload duplicate check", "documents", {"workspace_id": WS, "filename": NAME}, None),
+    ("vault dedup by hash", "documents", {"content_hash": "0" * 64}, None),
+    ("document by id", "documents", {"id": NAME}, None),
+    ("document by id or name", "documents", {"$or": [{"id": NAME}, {"filename": NAME}]}, None),
+    ("vault delete lookup", "documents", {"filename": NAME}, None),
+    ("workspace document scope", "documents", {"filename": NAME, "$or": [{"workspace_id": WS}, {"shared_with": WS}]}, None),
+    ("documents of workspace", "documents", {"$or": [{"workspace_id": WS}, {"shared_with": WS}]}, None),
+    ("document page", "documents", {"$or": [{"workspace_id": WS}, {"shared_with": WS}]}, {"created_at": -1, "id": -1}),
+    ("document page by name", "documents", {"$or": [{"workspace_id": WS}, {"shared_with": WS}]}, {"filename": 1, "id": 1}),
+    ("vault page", "documents", {}, {"created_at": -1, "id": -1}),
+    ("shared documents", "documents", {"shared_with": WS}, None),
+    ("physical file references", "documents", {"minio_path": NAME, "id": {"$ne": NAME}}, None),
+    ("document search", "documents", {"search_keys": {"$all": ["au", "audit"]}}, None),
+    ("workspace document search", "documents", {"search_keys": {"$all": ["au"]}, "workspace_id": WS}, None),
+    ("workspace by id", "workspaces", {"id": WS}, None),
+    ("workspace name uniqueness", "workspaces", {"name": NAME, "id": {"$ne": WS}}, None),
+    ("workspace search", "workspaces", {"search_keys": {"$all": ["au"]}, "status": {"$ne": "deleting"}}, None),
+    ("workspace settings", "workspace_settings", {"workspace_id": WS}, None),
+    ("content generation", "workspace_generations", {"workspace_id": WS}, None),
+    ("thread metadata", "thread_metadata", {"thread_id": NAME}, None),
+    ("thread listing", "thread_metadata", {"workspace_id": WS}, {"last_active": -1, "thread_id": -1}),
+    ("thread search", "thread_metadata", {"search_keys": {"$all": ["au"]}}, None),
+    ("workspace thread search", "thread_metadata", {"search_keys": {"$all": ["au"]}, "workspace_id": WS}, None),
+    ("thread count", "thread_metadata", {"workspace_id": WS}, None),
+    ("history page", "chat_messages", {"thread_id": NAME, "seq": {"$lt": 100}}, {"seq": -1}),
+    ("thread checkpoints", "checkpoints", {"thread_id": NAME}, None),
+    ("latest checkpoint", "checkpoints", {"thread_id": NAME, "checkpoint_ns": ""}, {"checkpoint_id": -1}),
+    ("checkpoint writes", "checkpoint_writes", {"thread_id": NAME, "checkpoint_ns": "", "checkpoint_id": NAME}, None),
+]
+
+def collect_stages(plan: Dict) -> List[str]:
+    """Flatten the stage names of a (possibly nested) query plan."""
+    stages = [plan.get("stage", "")]
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            stages += collect_stages(plan[key])
+    for child in plan.get("inputStages", []):
+        stages += collect_stages(child)
+    return stages
+
+async def audit(apply_indexes: bool) -> int:
+    db = mongodb_manager.get_async_database()
+    if apply_indexes:
+        await ensure_indexes()
+
+    scans = 0
+    for label, collection, query, sort in AUDITED_QUERIES:
+        command: Dict = {"find": collection, "filter": query}
+        if sort:
+            command["sort"] = sort
+        explained = await db.command("explain", command, verbosity="queryPlanner")
+        stages = collect_stages(explained["queryPlanner"]["winningPlan"])
+        is_scan = "COLLSCAN" in stages or ("SORT" in stages and sort is not None)
+        scans += is_scan
+        print(f"{'SCAN' if is_scan else 'ok  '}  {collection:<22} {label:<28} {' <- '.join(s for s in stages if s)}")
+
+    print(f"\n{scans} of {len(AUDITED_QUERIES)} queries scan or sort in memory.")
+    return scans
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ensure-indexes", action="store_true", help="Apply the index registry before auditing")
+    args = parser.parse_args()
+    sys.exit(1 if asyncio.run(audit(args.ensure_indexes)) else 0)
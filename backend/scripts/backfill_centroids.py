@@ -0,0 +1,39 @@
+"""
+Build the per-document centroid collections (doc_centroids_{dim}) from the chunks
+already stored in the knowledge collections, for data indexed before centroids were
+maintained at ingestion. Each centroid collection is dropped and rebuilt, so the
+script is safe to re-run; run it while no ingestion is in progress.
+
+    python -m backend.scripts.backfill_centroids
+"""
+import asyncio
+from backend.app.rag.qdrant_provider import qdrant
+
+PAGE_SIZE = 256
+
+async def backfill():
+    for collection in await qdrant.list_knowledge_collections():
+        centroid_collection = qdrant.get_centroid_collection_name(collection)
+        if await qdrant.client.collection_exists(centroid_collection):
+            await qdrant.client.delete_collection(centroid_collection)
+
+        offset, chunks = None, 0
+        while True:
+            points, offset = await qdrant.client.scroll(
+                collection_name=collection,
+                limit=PAGE_SIZE,
+                offset=offset,
+                with_payload=["doc_id", "workspace_id", "shared_with", "content_hash", "source"],
+                with_vectors=True
+            )
+            points = [p for p in points if p.vector is not None]
+            if points:
+                # Pages are folded in like ingestion batches, so memory stays bounded
+                await qdrant.update_centroids(collection, [p.vector for p in points], [p.payload for p in points])
+                chunks += len(points)
+            if offset is None:
+                break
+        print(f"{collection}: {chunks} chunks folded into {centroid_collection}")
+
+if __name__ == "__main__":
+    asyncio.run(backfill())
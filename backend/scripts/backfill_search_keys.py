@@ -0,0 +1,53 @@
+"""
+Populate the `search_keys` arrays used by the global search on workspaces,
+threads and documents written before they were maintained on every write.
+Safe to re-run; pass --all to rebuild keys that already exist.
+
+    python -m backend.scripts.backfill_search_keys [--all]
+"""
+import argparse
+import asyncio
+from pymongo import UpdateOne
+from backend.app.core.mongodb import mongodb_manager
+from backend.app.core.indexes import ensure_indexes
+from backend.app.core.search_keys import search_keys
+
+BATCH_SIZE = 500
+
+# collection -> (projection, key builder)
+SOURCES = {
+    "workspaces": (
+        {"id": 1, "name": 1, "description": 1},
+        lambda d: search_keys(d.get("name"), d.get("description"), d.get("id"))
+    ),
+    "thread_metadata": (
+        {"title": 1, "tags": 1},
+        lambda d: search_keys(d.get("title"), *d.get("tags", []))
+    ),
+    "documents": (
+        {"filename": 1},
+        lambda d: search_keys(d.get("filename"))
+    ),
+}
+
+async def backfill(rebuild: bool):
+    db = mongodb_manager.get_async_database()
+    await ensure_indexes()
+
+    query = {} if rebuild else {"search_keys": {"$exists": False}}
+    for collection, (projection, build) in SOURCES.items():
+        ops, updated = [], 0
+        async for doc in db[collection].find(query, projection):
+            ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"search_keys": build(doc)}}))
+            if len(ops) >= BATCH_SIZE:
+                updated += (await db[collection].bulk_write(ops, ordered=False)).modified_count
+                ops = []
+        if ops:
+            updated += (await db[collection].bulk_write(ops, ordered=False)).modified_count
+        print(f"{collection}: {updated} updated")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--all", action="store_true", help="Rebuild keys on every document")
+    args = parser.parse_args()
+    asyncio.run(backfill(args.all))
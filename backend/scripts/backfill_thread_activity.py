@@ -0,0 +1,55 @@
+"""
+Populate last_active, message_count and preview on thread_metadata documents
+written before these fields were maintained per turn, and seed the chat_messages
+log from the checkpointed state. Run it before serving traffic after upgrading,
+so new turns continue the seeded sequence.
+
+    python -m backend.scripts.backfill_thread_activity
+"""
+import asyncio
+from backend.app.core.mongodb import mongodb_manager
+from backend.app.core.indexes import ensure_indexes
+from backend.app.graph.builder import app as graph_app
+from backend.app.services.chat_service import chat_service, PREVIEW_CHARS
+
+async def backfill():
+    db = mongodb_manager.get_async_database()
+    await ensure_indexes()
+
+    updated = 0
+    async for meta in db.thread_metadata.find({"last_active": {"$exists": False}}, {"thread_id": 1}):
+        thread_id = meta["thread_id"]
+        latest = await db.checkpoints.find_one({"thread_id": thread_id}, {"_id": 1}, sort=[("_id", -1)])
+        if not latest:
+            continue
+
+        state = await graph_app.aget_state({"configurable": {"thread_id": thread_id}})
+        messages = [m for m in state.values.get("messages", []) if m.type in ("human", "ai")]
+        if messages and not await db.chat_messages.find_one({"thread_id": thread_id}, {"_id": 1}):
+            await db.chat_messages.insert_many([
+                {
+                    **chat_service._message_entry(m),
+                    "thread_id": thread_id,
+                    "workspace_id": state.values.get("workspace_id"),
+                    "seq": seq,
+                    "created_at": latest["_id"].generation_time.replace(tzinfo=None)
+                }
+                for seq, m in enumerate(messages)
+            ])
+        preview = " ".join(str(messages[-1].content).split())[:PREVIEW_CHARS] if messages else ""
+
+        await db.thread_metadata.update_one(
+            {"_id": meta["_id"]},
+            {"$set": {
+                # The newest checkpoint's ObjectId timestamp is the thread's last write
+                "last_active": latest["_id"].generation_time.replace(tzinfo=None),
+                "message_count": len(messages),
+                "preview": preview
+            }}
+        )
+        updated += 1
+
+    print(f"Backfilled {updated} threads.")
+
+if __name__ == "__main__":
+    asyncio.run(backfill())
@@ -0,0 +1,81 @@
+"""
+Benchmark hierarchical (centroid-first) retrieval against the flat chunk search on a
+real workspace. Queries are sampled chunk vectors of the workspace, so no embedding
+calls are made (the chunk text is the keyword query); recall@k of the vector ranking
+is measured against the flat search, which is the reference. Requires the centroid
+collection (scripts/backfill_centroids.py).
+
+    python -m backend.scripts.bench_retrieval --workspace <id> --queries 200 --top-documents 5,10,20,50
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from qdrant_client.http import models as qmodels
+from backend.app.rag.qdrant_provider import qdrant
+
+async def sample_queries(collection: str, workspace_id: str, count: int):
+    points, _ = await qdrant.client.scroll(
+        collection_name=collection,
+        scroll_filter=qmodels.Filter(should=[
+            qmodels.FieldCondition(key="workspace_id", match=qmodels.MatchValue(value=workspace_id)),
+            qmodels.FieldCondition(key="shared_with", match=qmodels.MatchValue(value=workspace_id))
+        ]),
+        limit=count * 10,
+        with_payload=["text"],
+        with_vectors=True
+    )
+    points = [p for p in points if p.vector is not None]
+    return random.sample(points, min(count, len(points)))
+
+async def flat(query, workspace_id, limit, top_documents):
+    return await qdrant.hybrid_search(
+        "knowledge_base", query.vector, query.payload.get("text", ""), limit=limit, mode="vector", workspace_id=workspace_id
+    )
+
+async def hierarchical(query, workspace_id, limit, top_documents):
+    doc_ids = await qdrant.search_centroids("knowledge_base", query.vector, top_documents, workspace_id)
+    return await qdrant.hybrid_search(
+        "knowledge_base", query.vector, query.payload.get("text", ""), limit=limit, mode="vector",
+        workspace_id=workspace_id, doc_ids=doc_ids or None
+    )
+
+async def run(label, search, queries, workspace_id, limit, top_documents, reference=None):
+    latencies, hits, results = [], [], []
+    for query in queries:
+        start = time.perf_counter()
+        found = await search(query, workspace_id, limit, top_documents)
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append({r["id"] for r in found})
+    if reference:
+        hits = [len(r & ref) / len(ref) for r, ref in zip(results, reference) if ref]
+    latencies.sort()
+    print(
+        f"{label:<18} p50={statistics.median(latencies):>7.2f}ms  "
+        f"p95={latencies[int(len(latencies) * 0.95) - 1]:>7.2f}ms  "
+        f"recall@{limit}={statistics.mean(hits) if hits else 1.0:.3f}"
+    )
+    return results
+
+async def main(args):
+    collection = await qdrant.get_effective_collection("knowledge_base", args.workspace)
+    queries = await sample_queries(collection, args.workspace, args.queries)
+    if not queries:
+        print(f"No chunks found for workspace {args.workspace} in {collection}")
+        return
+    print(f"{len(queries)} queries on {collection}, top {args.limit} chunks")
+    reference = await run("flat", flat, queries, args.workspace, args.limit, 0)
+    for top_documents in args.top_documents:
+        await run(f"hierarchical M={top_documents}", hierarchical, queries, args.workspace, args.limit, top_documents, reference)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workspace", required=True)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--top-documents", type=lambda v: [int(x) for x in v.split(",")], default=[5, 10, 20, 50])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    random.seed(args.seed)
+    asyncio.run(main(args))
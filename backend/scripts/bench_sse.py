@@ -0,0 +1,78 @@
+"""
+Benchmark SSE framing for token streams: per-token json.dumps frames (legacy)
+versus the coalescing SSEEncoder. Every frame is written to a loopback socket,
+as uvicorn would, so syscall and transport costs are part of the measurement.
+
+    python -m backend.scripts.bench_sse --streams 200 --tokens 500 --interval-ms 2
+"""
+import argparse
+import asyncio
+import json
+import socket
+import time
+from backend.app.core.sse import SSEEncoder
+
+async def token_events(tokens: int, interval: float):
+    yield {"type": "reasoning", "steps": ["Retrieved context", "Reasoning about the query and context"]}
+    for i in range(tokens):
+        if interval:
+            await asyncio.sleep(interval)
+        yield {"type": "content", "delta": f"tok{i % 97} "}
+
+async def legacy_frames(events):
+    async for event in events:
+        yield f"data: {json.dumps(event)}\n\n"
+
+async def drain(reader: asyncio.StreamReader):
+    while await reader.read(65536):
+        pass
+
+async def consume(frames) -> tuple:
+    rsock, wsock = socket.socketpair()
+    reader, reader_side = await asyncio.open_connection(sock=rsock)
+    _, writer = await asyncio.open_connection(sock=wsock)
+    drainer = asyncio.create_task(drain(reader))
+
+    count, size = 0, 0
+    async for frame in frames:
+        data = frame.encode()
+        writer.write(data)
+        await writer.drain()
+        count += 1
+        size += len(data)
+
+    writer.close()
+    await writer.wait_closed()
+    await drainer
+    reader_side.close()
+    return count, size
+
+async def run(label: str, make_frames, streams: int, tokens: int, interval: float):
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    results = await asyncio.gather(*[
+        consume(make_frames(token_events(tokens, interval))) for _ in range(streams)
+    ])
+    cpu, wall = time.process_time() - cpu_start, time.perf_counter() - wall_start
+    frames = sum(r[0] for r in results)
+    size = sum(r[1] for r in results)
+    print(
+        f"{label:<10} frames={frames:>8}  frames/stream={frames / streams:>7.1f}  "
+        f"frames/sec={frames / wall:>10.0f}  bytes={size:>10}  "
+        f"cpu/stream={cpu / streams * 1000:>7.2f}ms  wall={wall:.2f}s"
+    )
+
+async def main(args):
+    interval = args.interval_ms / 1000
+    encoder = SSEEncoder(coalesce_ms=args.coalesce_ms, coalesce_bytes=args.coalesce_bytes)
+    print(f"{args.streams} streams x {args.tokens} tokens, {args.interval_ms}ms between tokens")
+    await run("legacy", legacy_frames, args.streams, args.tokens, interval)
+    await run("coalesced", encoder.frames, args.streams, args.tokens, interval)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--streams", type=int, default=200)
+    parser.add_argument("--tokens", type=int, default=500)
+    parser.add_argument("--interval-ms", type=float, default=2)
+    parser.add_argument("--coalesce-ms", type=float, default=20)
+    parser.add_argument("--coalesce-bytes", type=int, default=256)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,19 @@
+import pytest
+
+class WhitespaceTokenizer:
+    """Deterministic stand-in for a model tokenizer: one token per word."""
+    def encode(self, text):
+        return text.split()
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+    def count(self, text):
+        return len(text.split())
+
+    def count_batch(self, texts):
+        return [len(t.split()) for t in texts]
+
+@pytest.fixture
+def whitespace_tokenizer():
+    return WhitespaceTokenizer()
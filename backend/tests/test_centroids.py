@@ -0,0 +1,87 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from qdrant_client.http import models as qmodels
+from backend.app.rag.qdrant_provider import qdrant
+
+@pytest.fixture
+def centroid_client(mocker):
+    mocker.patch.object(qdrant, "_indexed", {"doc_centroids_2"})
+    mocker.patch.object(qdrant.client, "upsert", new=AsyncMock())
+    return qdrant.client
+
+@pytest.mark.asyncio
+async def test_upsert_folds_chunks_into_running_centroid(mocker, centroid_client):
+    previous = SimpleNamespace(id=qdrant.centroid_id("d1", "ws1"), payload={"sum": [2.0, 0.0], "count": 2})
+    retrieve = mocker.patch.object(centroid_client, "retrieve", new=AsyncMock(return_value=[previous]))
+    payloads = [
+        {"doc_id": "d1", "workspace_id": "ws1", "source": "a.pdf", "content_hash": "h1", "shared_with": []},
+        {"doc_id": "d1", "workspace_id": "ws1", "source": "a.pdf", "content_hash": "h1", "shared_with": []},
+        {"workspace_id": "ws1"},  # Raw text chunk without a document: no centroid
+    ]
+
+    await qdrant.upsert_documents("knowledge_base_2", vectors=[[0.0, 1.0], [0.0, 3.0], [5.0, 5.0]], ids=["a", "b", "c"], payloads=payloads)
+
+    assert retrieve.await_args.kwargs["collection_name"] == "doc_centroids_2"
+    centroid_upsert = centroid_client.upsert.await_args_list[-1].kwargs
+    assert centroid_upsert["collection_name"] == "doc_centroids_2"
+    [point] = centroid_upsert["points"]
+    assert point.id == qdrant.centroid_id("d1", "ws1")
+    assert point.payload["sum"] == [2.0, 4.0] and point.payload["count"] == 4
+    assert point.vector == [0.5, 1.0]
+
+@pytest.mark.asyncio
+async def test_delete_points_removes_matching_centroids(mocker):
+    mocker.patch.object(qdrant.client, "collection_exists", new=AsyncMock(return_value=True))
+    delete = mocker.patch.object(qdrant.client, "delete", new=AsyncMock())
+    points_filter = qmodels.Filter(must=[qmodels.FieldCondition(key="doc_id", match=qmodels.MatchValue(value="d1"))])
+
+    await qdrant.delete_points("knowledge_base_768", points_filter)
+
+    assert [c.kwargs for c in delete.await_args_list] == [
+        {"collection_name": "knowledge_base_768", "points_selector": points_filter},
+        {"collection_name": "doc_centroids_768", "points_selector": points_filter},
+    ]
+
+@pytest.mark.asyncio
+async def test_get_document_centroids_pages_through_centroid_collection(mocker):
+    mocker.patch.object(qdrant, "get_effective_collection", new=AsyncMock(return_value="knowledge_base_768"))
+    mocker.patch.object(qdrant.client, "collection_exists", new=AsyncMock(return_value=True))
+    pages = [
+        ([SimpleNamespace(payload={"doc_id": "d1", "source": "a.pdf", "count": 3}, vector=[1.0, 0.0])], "next"),
+        ([SimpleNamespace(payload={"doc_id": "d2", "source": "b.pdf", "count": 1}, vector=[0.0, 1.0])], None),
+    ]
+    scroll = mocker.patch.object(qdrant.client, "scroll", new=AsyncMock(side_effect=pages))
+
+    centroids = await qdrant.get_document_centroids("ws1")
+
+    assert centroids == {
+        "d1": {"vector": [1.0, 0.0], "name": "a.pdf", "chunks": 3},
+        "d2": {"vector": [0.0, 1.0], "name": "b.pdf", "chunks": 1},
+    }
+    assert [c.kwargs["collection_name"] for c in scroll.await_args_list] == ["doc_centroids_768"] * 2
+    assert scroll.await_args_list[1].kwargs["offset"] == "next"
+
+@pytest.mark.asyncio
+async def test_hierarchical_search_restricts_chunks_to_centroid_documents(mocker):
+    from backend.app.rag.rag_service import rag_service
+    from backend.app.rag.retrieval_cache import RetrievalCache
+
+    settings = MagicMock(rag_engine="basic", search_limit=5, retrieval_mode="vector", hybrid_alpha=0.5,
+                         retrieval_strategy="hierarchical", hierarchical_top_documents=3)
+    settings.get_retrieval_hash.return_value = "hash"
+    mocker.patch("backend.app.core.settings_manager.settings_manager.get_settings", new=AsyncMock(return_value=settings))
+    mocker.patch("backend.app.rag.rag_service.content_generations.get", new=AsyncMock(return_value=0))
+    mocker.patch("backend.app.rag.rag_service.retrieval_cache", RetrievalCache(max_size=0))
+    mocker.patch("backend.app.rag.rag_service.RAGService.get_query_embedding", new=AsyncMock(return_value=[0.1]))
+    centroids = mocker.patch.object(qdrant, "search_centroids", new=AsyncMock(return_value=["d1", "d2"]))
+    hybrid = mocker.patch.object(qdrant, "hybrid_search", new=AsyncMock(return_value=[]))
+
+    await rag_service.search("query", "ws1")
+    centroids.assert_awaited_once_with("knowledge_base", [0.1], 3, "ws1")
+    assert hybrid.await_args.kwargs["doc_ids"] == ["d1", "d2"]
+
+    # Workspaces without centroids yet fall back to the flat search
+    centroids.return_value = []
+    await rag_service.search("query", "ws1")
+    assert hybrid.await_args.kwargs["doc_ids"] is None
@@ -0,0 +1,21 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from backend.app.graph.checkpointer import LazyMongoDBSaver
+
+@pytest.mark.asyncio
+async def test_saver_is_created_on_first_use_and_delegates(mocker):
+    inner = MagicMock()
+    inner.aget_tuple = AsyncMock(return_value="tuple")
+    inner.aput = AsyncMock(return_value={"configurable": {"checkpoint_id": "c1"}})
+    factory = mocker.patch("backend.app.graph.checkpointer.MongoDBSaver", return_value=inner)
+    mocker.patch("backend.app.graph.checkpointer.mongodb_manager")
+
+    saver = LazyMongoDBSaver(db_name="test_db")
+    factory.assert_not_called()
+
+    config = {"configurable": {"thread_id": "t1"}}
+    assert await saver.aget_tuple(config) == "tuple"
+    assert await saver.aput(config, {}, {}, {}) == {"configurable": {"checkpoint_id": "c1"}}
+    factory.assert_called_once()
+    assert factory.call_args.kwargs["db_name"] == "test_db"
+    inner.aget_tuple.assert_awaited_once_with(config)
@@ -0,0 +1,38 @@
+from backend.app.rag.context_packer import context_packer, get_context_window, format_source
+
+def _source(i, content, doc_id="doc", index=None):
+    return {"id": i, "name": "a.txt", "content": content, "doc_id": doc_id, "index": index}
+
+def test_context_window_lookup():
+    assert get_context_window("llama-cpp", "anything") == 2048
+    assert get_context_window("openai", "gpt-4o-mini") == 128000
+    assert get_context_window("openai", "gpt-4") == 8192
+    assert get_context_window("anthropic", "claude-3-5-sonnet") == 200000
+
+def test_pack_drops_duplicates_and_trims_adjacent_overlap(whitespace_tokenizer):
+    shared = "alpha beta gamma delta epsilon zeta eta"
+    sources = [
+        _source(1, f"one two three {shared}", index=0),
+        _source(2, f"{shared} four five six", index=1),
+        _source(3, f"one two  three {shared}", doc_id="other"),  # whitespace-only duplicate
+    ]
+
+    packed, stats = context_packer.pack(sources, whitespace_tokenizer, budget=1000)
+
+    assert [s["id"] for s in packed] == [1, 2]
+    assert packed[1]["content"] == "four five six"
+    assert stats["dropped_sources"] == 1
+    assert stats["redundant_chars"] > len(shared)
+
+def test_pack_respects_budget_and_truncates_last_source(whitespace_tokenizer):
+    sources = [_source(i, " ".join(f"d{i}w{j}" for j in range(100)), doc_id=f"d{i}") for i in range(1, 4)]
+    tokenizer = whitespace_tokenizer
+    per_source = tokenizer.count(format_source(sources[0]))
+
+    packed, stats = context_packer.pack(sources, tokenizer, budget=per_source + 80)
+
+    assert len(packed) == 2
+    assert packed[1].get("truncated") is True
+    assert stats["packed_tokens"] <= per_source + 80
+    assert stats["dropped_sources"] == 1
+    assert stats["packed_tokens"] + stats["dropped_tokens"] == per_source * 3
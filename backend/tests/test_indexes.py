@@ -0,0 +1,35 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from pymongo.errors import OperationFailure
+from backend.app.core.indexes import INDEXES, ensure_indexes
+
+def test_registry_declares_unique_keys():
+    unique = {
+        (collection, tuple(model.document["key"])) for collection, models in INDEXES.items()
+        for model in models if model.document.get("unique")
+    }
+    assert ("documents", ("id",)) in unique
+    assert ("workspace_settings", ("workspace_id",)) in unique
+    assert ("thread_metadata", ("thread_id",)) in unique
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_survives_conflicts(mocker):
+    mock_db = MagicMock()
+    mock_col = MagicMock()
+    calls = {"n": 0}
+
+    async def create_indexes(models):
+        calls["n"] += 1
+        if calls["n"] == 1:
+            raise OperationFailure("duplicate key", code=11000)
+        return ["ok"]
+
+    mock_col.create_indexes = AsyncMock(side_effect=create_indexes)
+    mock_db.__getitem__.return_value = mock_col
+    mocker.patch("backend.app.core.indexes.mongodb_manager.get_async_database", return_value=mock_db)
+
+    applied = await ensure_indexes()
+
+    total = sum(len(models) for models in INDEXES.values())
+    assert mock_col.create_indexes.await_count == total
+    assert sum(len(names) for names in applied.values()) == total - 1
@@ -0,0 +1,46 @@
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from backend.app.graph.prompt import build_prompt, cache_usage
+
+HISTORY = [
+    HumanMessage(content="first question", id="h1"),
+    AIMessage(content="first answer", id="a1"),
+    HumanMessage(content="second question", id="h2"),
+]
+
+def test_context_goes_last_and_prefix_is_stable():
+    turn_one = build_prompt("openai", "INSTRUCTIONS", "", HISTORY, "[1] ctx A")
+    turn_two = build_prompt("openai", "INSTRUCTIONS", "", HISTORY + [AIMessage(content="x"), HumanMessage(content="third")], "[1] ctx B")
+
+    assert isinstance(turn_one[0], SystemMessage)
+    assert "ctx" not in turn_one[0].content
+    assert turn_one[-1].content.startswith("--- CONTEXT ---\n[1] ctx A")
+    assert turn_one[-1].content.endswith("second question")
+    # The earlier conversation is byte-identical between turns
+    assert [m.content for m in turn_two[:3]] == [m.content for m in turn_one[:3]]
+    # State is not mutated
+    assert HISTORY[-1].content == "second question"
+
+def test_tool_messages_follow_the_context_turn():
+    messages = HISTORY + [
+        AIMessage(content="", tool_calls=[{"name": "web_search", "args": {}, "id": "t1"}]),
+        ToolMessage(content="result", tool_call_id="t1"),
+    ]
+    prompt = build_prompt("openai", "I", "", messages, "ctx")
+    assert isinstance(prompt[-1], ToolMessage)
+    assert "ctx" in prompt[-3].content
+
+def test_anthropic_breakpoints():
+    prompt = build_prompt("anthropic", "INSTRUCTIONS", "summary", HISTORY, "ctx")
+
+    assert prompt[0].content[-1]["cache_control"] == {"type": "ephemeral"}
+    assert "summary" in prompt[0].content[-1]["text"]
+    assert prompt[2].content[-1]["cache_control"] == {"type": "ephemeral"}
+    assert isinstance(prompt[-1].content, str)
+
+def test_cache_usage_reads_input_token_details():
+    message = AIMessage(content="", usage_metadata={
+        "input_tokens": 1200, "output_tokens": 10, "total_tokens": 1210,
+        "input_token_details": {"cache_read": 1024}
+    })
+    assert cache_usage(message) == {"input_tokens": 1200, "cache_read": 1024, "cache_creation": 0}
+    assert cache_usage(AIMessage(content=""))["cache_read"] == 0
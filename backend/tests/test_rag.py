@@ -18,3 +18,71 @@ async def test_get_embeddings(mocker):
     result = await rag_service.get_embeddings(["test chunk"])
     assert len(result) == 1
     assert len(result[0]) == 1536
+
+@pytest.mark.asyncio
+async def test_chunk_tokens_exact_budget(mocker, whitespace_tokenizer):
+    mocker.patch("backend.app.rag.rag_service.get_tokenizer", return_value=whitespace_tokenizer)
+    text = " ".join(f"w{i}" for i in range(25))
+
+    chunks = await rag_service.chunk_tokens(text, chunk_size=10, chunk_overlap=2)
+    assert [len(c.split()) for c in chunks] == [10, 10, 9]
+    # Consecutive windows share exactly `chunk_overlap` tokens
+    assert chunks[0].split()[-2:] == chunks[1].split()[:2]
+
+def test_token_batches_respect_budget():
+    texts = ["a"] * 5
+    batches = rag_service._token_batches(texts, [40, 40, 40, 10, 90], max_tokens=100)
+    assert [len(b) for b in batches] == [2, 2, 1]
+
+@pytest.mark.asyncio
+async def test_hydrate_sources_batches_cache_misses(mocker):
+    from types import SimpleNamespace
+    from backend.app.rag.chunk_texts import chunk_texts
+    from backend.app.rag.qdrant_provider import qdrant
+
+    chunk_texts.clear()
+    rag_service._remember_chunks([{"id": "p1", "payload": {"text": "cached text", "workspace_id": "default"}}])
+    mocker.patch.object(qdrant, "get_effective_collection", return_value="knowledge_base_1536")
+    scroll = mocker.patch.object(
+        qdrant.client, "scroll", return_value=([SimpleNamespace(id="p2", payload={"text": "fetched text", "workspace_id": "default"})], None)
+    )
+
+    refs = [
+        {"id": 1, "point_id": "p1", "name": "a.txt"},
+        {"id": 2, "point_id": "p2", "name": "b.txt"},
+        {"id": 3, "point_id": "p3", "name": "deleted.txt"},
+        {"id": 4, "name": "legacy.txt", "content": "stored inline"},
+    ]
+    hydrated = await rag_service.hydrate_sources(refs, "default")
+
+    assert [s["content"] for s in hydrated] == ["cached text", "fetched text", "", "stored inline"]
+    scroll.assert_awaited_once()
+    points_filter = scroll.call_args.kwargs["scroll_filter"]
+    assert sorted(points_filter.must[0].has_id) == ["p2", "p3"]
+    # Only chunks owned by or shared with the requesting workspace are fetched
+    assert {c.match.value for c in points_filter.should} == {"default"}
+    assert rag_service.source_ref(hydrated[0]) == {"id": 1, "point_id": "p1", "name": "a.txt"}
+
+@pytest.mark.asyncio
+async def test_cached_texts_are_scoped_and_dropped_on_delete(mocker):
+    from qdrant_client.http import models as qmodels
+    from backend.app.rag.chunk_texts import chunk_texts
+    from backend.app.rag.qdrant_provider import qdrant
+
+    chunk_texts.clear()
+    rag_service._remember_chunks([
+        {"id": "p1", "payload": {"text": "one", "workspace_id": "ws1", "shared_with": ["ws2"], "doc_id": "d1"}},
+        {"id": "p2", "payload": {"text": "two", "workspace_id": "ws1", "doc_id": "d2"}},
+    ])
+    refs = [{"id": 1, "point_id": "p1"}, {"id": 2, "point_id": "p2"}]
+
+    assert [s["content"] for s in rag_service.hydrate_cached(refs, "ws2")] == ["one", ""]
+    assert [s["content"] for s in rag_service.hydrate_cached(refs, "ws3")] == ["", ""]
+
+    mocker.patch.object(qdrant.client, "delete", new=mocker.AsyncMock())
+    mocker.patch.object(qdrant.client, "collection_exists", new=mocker.AsyncMock(return_value=False))
+    await qdrant.delete_points("knowledge_base_1536", qmodels.Filter(must=[
+        qmodels.FieldCondition(key="doc_id", match=qmodels.MatchValue(value="d1")),
+        qmodels.FieldCondition(key="workspace_id", match=qmodels.MatchValue(value="ws1")),
+    ]))
+    assert [s["content"] for s in rag_service.hydrate_cached(refs, "ws1")] == ["", "two"]
@@ -0,0 +1,49 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from backend.app.rag.retrieval_cache import RetrievalCache
+from backend.app.rag.rag_service import rag_service
+
+def test_cache_lru_and_stats():
+    cache = RetrievalCache(max_size=2)
+    k1 = cache.make_key("ws", "What is RAG?", "h", 5, 0)
+    k2 = cache.make_key("ws", "other", "h", 5, 0)
+    k3 = cache.make_key("ws", "third", "h", 5, 0)
+
+    # Normalization folds case and whitespace
+    assert k1 == cache.make_key("ws", "  what is   rag? ", "h", 5, 0)
+    # A new generation is a different key
+    assert k1 != cache.make_key("ws", "What is RAG?", "h", 5, 1)
+
+    cache.put(k1, [{"id": 1}])
+    cache.put(k2, [{"id": 2}])
+    assert cache.get(k1) == [{"id": 1}]
+    cache.put(k3, [{"id": 3}])  # evicts k2, the least recently used
+
+    assert cache.get(k2) is None
+    assert cache.get(k3) == [{"id": 3}]
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+@pytest.mark.asyncio
+async def test_search_served_from_cache(mocker):
+    settings = MagicMock(rag_engine="basic", search_limit=5, retrieval_mode="hybrid", hybrid_alpha=0.5)
+    settings.get_retrieval_hash.return_value = "hash"
+    mocker.patch("backend.app.core.settings_manager.settings_manager.get_settings", new=AsyncMock(return_value=settings))
+    generation = mocker.patch("backend.app.rag.rag_service.content_generations.get", new=AsyncMock(return_value=3))
+    mocker.patch("backend.app.rag.rag_service.retrieval_cache", RetrievalCache(max_size=8))
+    embed = mocker.patch("backend.app.rag.rag_service.RAGService.get_query_embedding", new=AsyncMock(return_value=[0.1]))
+    hybrid = mocker.patch(
+        "backend.app.rag.qdrant_provider.QdrantProvider.hybrid_search",
+        new=AsyncMock(return_value=[{"id": "p1", "payload": {"text": "t"}, "score": 1.0}])
+    )
+
+    first = await rag_service.search("Same question", "ws_cache")
+    second = await rag_service.search("same  question", "ws_cache")
+    assert first == second
+    assert embed.await_count == 1
+    assert hybrid.await_count == 1
+
+    # Content changed: the generation moves on and the cached entry is bypassed
+    generation.return_value = 4
+    await rag_service.search("Same question", "ws_cache")
+    assert hybrid.await_count == 2
@@ -0,0 +1,143 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from backend.app.core.search_keys import search_keys, query_keys, rank
+from backend.app.services.search_service import search_service, make_snippet
+
+def test_search_keys_are_word_prefixes():
+    keys = search_keys("Quarterly_Report-2024.pdf")
+    assert {"qu", "quarterly", "re", "report", "20", "2024", "pd", "pdf"} <= set(keys)
+    assert "eport" not in keys
+    assert query_keys("Quart r  REP") == ["quart", "rep"]
+
+def test_rank_prefers_closer_names():
+    names = ["Annual report", "Report", "Reporting tools", "Misc"]
+    ranked = sorted(names, key=lambda n: rank("report", n, ["report"] if n == "Misc" else []), reverse=True)
+    assert ranked == ["Report", "Reporting tools", "Annual report", "Misc"]
+
+def _cursor(docs):
+    cursor = MagicMock()
+    cursor.limit.return_value = cursor
+    cursor.to_list = AsyncMock(return_value=docs)
+    return cursor
+
+@pytest.mark.asyncio
+async def test_global_search_queries_search_keys(mocker):
+    db = MagicMock()
+    db.workspaces.find.return_value = _cursor([{"id": "w1", "name": "Team reports"}, {"id": "w2", "name": "Reports"}])
+    db.documents.find.return_value = _cursor([{"_id": "x", "filename": "report.pdf", "workspace_id": "w1"}])
+    threads = MagicMock()
+    threads.find.return_value = _cursor([])
+    db.__getitem__.return_value = threads
+    mocker.patch("backend.app.services.search_service.mongodb_manager.get_async_database", return_value=db)
+    mocker.patch("backend.app.services.search_service.qdrant.list_knowledge_collections", new=AsyncMock(return_value=[]))
+
+    results = await search_service.global_search("Repor", workspace_id="w1")
+
+    assert [ws["id"] for ws in results["workspaces"]] == ["w2", "w1"]
+    assert results["documents"][0]["name"] == "report.pdf"
+    assert db.documents.find.call_args[0][0] == {"search_keys": {"$all": ["repor"]}, "workspace_id": "w1"}
+    assert threads.find.call_args[0][0]["search_keys"] == {"$all": ["repor"]}
+
+@pytest.mark.asyncio
+async def test_global_search_ignores_short_queries(mocker):
+    get_db = mocker.patch("backend.app.services.search_service.mongodb_manager.get_async_database")
+    results = await search_service.global_search("a b")
+    assert results == {"workspaces": [], "threads": [], "documents": []}
+    get_db.assert_not_called()
+
+def test_snippet_highlights_word_prefixes():
+    text = "Intro. " + "filler " * 40 + "The Reporting pipeline writes a report daily."
+    snippet, highlights = make_snippet(text, ["report"], width=80)
+    assert [snippet[s:e] for s, e in highlights] == ["Reporting", "report"]
+    assert not snippet.startswith("iller")
+
+@pytest.mark.asyncio
+async def test_stream_search_does_not_wait_for_slow_collections(mocker):
+    mocker.patch("backend.app.services.search_service.SearchService._search_metadata", new=AsyncMock(return_value={"workspaces": [], "threads": [], "documents": []}))
+    mocker.patch("backend.app.services.search_service.qdrant.list_knowledge_collections", new=AsyncMock(return_value=["knowledge_base_768", "knowledge_base_1536"]))
+    mocker.patch("backend.app.services.search_service.ai_settings.SEARCH_COLLECTION_TIMEOUT_SECONDS", 0.2)
+
+    async def search_text(collection, query, limit, workspace_id):
+        if collection == "knowledge_base_1536":
+            await asyncio.sleep(5)
+        return [SimpleNamespace(id=1, payload={"text": "report on budgets", "doc_id": "d1", "source": "a.pdf", "index": 0})]
+
+    mocker.patch("backend.app.services.search_service.qdrant.search_text", side_effect=search_text)
+
+    events = [e async for e in search_service.stream_search("report")]
+
+    # Metadata and the fast collection arrive before the slow one times out
+    assert {e["type"] for e in events[:2]} == {"metadata", "chunks"}
+    fast = next(e for e in events[:2] if e["type"] == "chunks")
+    assert fast["collection"] == "knowledge_base_768"
+    assert fast["results"][0]["highlights"] == [[0, 6]]
+    assert events[2]["status"] == "timeout"
+    assert events[3]["timed_out"] == ["knowledge_base_1536"]
+
+def test_fuse_normalized_scales_each_leg():
+    from backend.app.rag.rag_service import fuse_normalized
+    rrf = [{"id": "a", "collection": "kb_1536", "score": 0.032}, {"id": "b", "collection": "kb_1536", "score": 0.016}]
+    cosine = [{"id": "a", "collection": "kb_768", "score": 0.91}, {"id": "c", "collection": "kb_768", "score": 0.55}, {"id": "d", "collection": "kb_768", "score": 0.73}]
+
+    fused = fuse_normalized([rrf, cosine, []], limit=4)
+
+    assert [(h["collection"], h["id"]) for h in fused[:2]] == [("kb_1536", "a"), ("kb_768", "a")]
+    assert [h["score"] for h in fused] == [1.0, 1.0, pytest.approx(0.5), 0.0]
+    assert fused[0]["raw_score"] == 0.032
+
+@pytest.mark.asyncio
+async def test_federated_search_embeds_once_per_model(mocker):
+    from backend.app.rag.rag_service import rag_service
+    from backend.app.rag.qdrant_provider import qdrant
+
+    def settings(dim, model):
+        return SimpleNamespace(embedding_provider="openai", embedding_model=model, embedding_dim=dim,
+                               retrieval_mode="hybrid", hybrid_alpha=0.5, search_limit=5)
+    by_workspace = {"w1": settings(1536, "small"), "w2": settings(1536, "small"), "w3": settings(768, "nomic"), "w4": settings(384, "minilm")}
+    mocker.patch("backend.app.core.settings_manager.settings_manager.get_settings", new=AsyncMock(side_effect=lambda ws: by_workspace[ws]))
+    embed = mocker.patch("backend.app.rag.rag_service.RAGService.get_query_embedding", new=AsyncMock(return_value=[0.1]))
+
+    async def hybrid(collection_name, workspace_ids, **kwargs):
+        if collection_name == "knowledge_base_384":
+            await asyncio.sleep(1)
+        return [{"id": f"{collection_name}-p", "payload": {"workspace_id": workspace_ids[0]}, "score": 0.5}]
+    search = mocker.patch.object(qdrant, "hybrid_search", new=AsyncMock(side_effect=hybrid))
+    mocker.patch("backend.app.rag.rag_service.ai_settings.FEDERATED_LEG_TIMEOUT_SECONDS", 0.2)
+
+    result = await rag_service.federated_search("query", ["w1", "w2", "w3", "w4", "w1"])
+
+    assert embed.await_count == 3
+    # w1 and w2 share a collection and settings: a single leg filtering on both
+    calls = {c.kwargs["collection_name"]: c.kwargs["workspace_ids"] for c in search.await_args_list}
+    assert calls["knowledge_base_1536"] == ["w1", "w2"]
+    status = {leg["collection"]: leg["status"] for leg in result["legs"]}
+    assert status == {"knowledge_base_1536": "ok", "knowledge_base_768": "ok", "knowledge_base_384": "timeout"}
+    assert {hit["collection"] for hit in result["results"]} == {"knowledge_base_1536", "knowledge_base_768"}
+
+@pytest.mark.asyncio
+async def test_federated_leg_deadline_includes_embedding(mocker):
+    from backend.app.rag.rag_service import rag_service
+    from backend.app.rag.qdrant_provider import qdrant
+
+    settings = SimpleNamespace(embedding_provider="openai", embedding_model="small", embedding_dim=1536,
+                               retrieval_mode="vector", hybrid_alpha=0.5, search_limit=5)
+    mocker.patch("backend.app.core.settings_manager.settings_manager.get_settings", new=AsyncMock(return_value=settings))
+
+    async def embed(*args):
+        await asyncio.sleep(0.15)
+        return [0.1]
+
+    async def search(**kwargs):
+        await asyncio.sleep(0.15)
+        return []
+    mocker.patch("backend.app.rag.rag_service.RAGService.get_query_embedding", new=AsyncMock(side_effect=embed))
+    mocker.patch.object(qdrant, "hybrid_search", new=AsyncMock(side_effect=search))
+    mocker.patch("backend.app.rag.rag_service.ai_settings.FEDERATED_LEG_TIMEOUT_SECONDS", 0.2)
+
+    result = await rag_service.federated_search("query", ["w1"])
+
+    # Each step fits the budget on its own, together they exceed it
+    assert [leg["status"] for leg in result["legs"]] == ["timeout"]
+    assert result["legs"][0]["elapsed_ms"] < 290
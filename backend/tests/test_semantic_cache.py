@@ -0,0 +1,37 @@
+from backend.app.rag.semantic_cache import SemanticCache
+
+def test_lookup_matches_similar_queries_only():
+    cache = SemanticCache(max_entries_per_workspace=4)
+    cache.store("ws", [1.0, 0.0, 0.0], generation=1, answer="A", sources=[{"id": 1}], reasoning_steps=[], tokens=120)
+
+    hit = cache.lookup("ws", [0.99, 0.05, 0.0], generation=1, threshold=0.95)
+    assert hit["answer"] == "A"
+    assert hit["source_ids"] == [1]
+
+    assert cache.lookup("ws", [0.0, 1.0, 0.0], generation=1, threshold=0.95) is None
+    assert cache.lookup("other_ws", [1.0, 0.0, 0.0], generation=1, threshold=0.95) is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["saved_tokens"] == 120
+
+def test_entries_expire_with_content_generation():
+    cache = SemanticCache()
+    cache.store("ws", [1.0, 0.0], generation=1, answer="A", sources=[], reasoning_steps=[])
+
+    assert cache.lookup("ws", [1.0, 0.0], generation=2, threshold=0.9) is None
+    assert cache.stats()["entries"] == 0
+
+def test_store_is_bounded_per_workspace():
+    cache = SemanticCache(max_entries_per_workspace=2)
+    for i in range(3):
+        cache.store("ws", [1.0, float(i)], generation=0, answer=str(i), sources=[], reasoning_steps=[])
+    assert cache.stats()["entries"] == 2
+
+def test_entries_are_scoped_to_the_answering_model():
+    cache = SemanticCache()
+    cache.store("ws", [1.0, 0.0], generation=0, answer="A", sources=[], reasoning_steps=[], model="openai:gpt-4o")
+
+    assert cache.lookup("ws", [1.0, 0.0], generation=0, threshold=0.9, model="openai:gpt-4o-mini") is None
+    assert cache.lookup("ws", [1.0, 0.0], generation=0, threshold=0.9, model="openai:gpt-4o")["answer"] == "A"
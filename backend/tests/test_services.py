@@ -47,12 +47,41 @@ async def test_document_service_list_all(mocker):
         "shared_with": []
     }
     
-    mock_col.find.return_value.to_list.return_value = [mock_doc]
+    mock_doc["workspace_name"] = "Workspace One"
+    mock_col.aggregate.return_value.to_list = AsyncMock(return_value=[mock_doc])
     mocker.patch("backend.app.core.mongodb.mongodb_manager.get_async_database", return_value=mock_db)
     
-    docs = await document_service.list_all()
+    page = await document_service.list_all(limit=1)
+    docs = page["documents"]
     assert len(docs) == 1
-    assert docs[0]["filename"] == "test.pdf"
+    assert docs[0]["name"] == "test.pdf"
+    assert docs[0]["workspace_name"] == "Workspace One"
+
+    # A full page hands out a cursor; following it adds the keyset condition
+    pipeline = mock_col.aggregate.call_args[0][0]
+    assert pipeline[0] == {"$match": {}}
+    assert any("$lookup" in stage for stage in pipeline)
+    await document_service.list_all(limit=1, cursor=page["next_cursor"])
+    match = mock_col.aggregate.call_args[0][0][0]["$match"]
+    assert match["$and"][1]["$or"][1] == {"created_at": None, "id": {"$lt": "test-id"}}
+
+@pytest.mark.asyncio
+async def test_document_service_list_by_workspace_pages(mocker):
+    mock_db, mock_col = get_mock_db()
+    mock_col.find.return_value.limit = MagicMock(return_value=mock_col.find.return_value)
+    mock_col.find.return_value.to_list.return_value = [
+        {"id": "a", "filename": "a.pdf", "workspace_id": "ws-1", "shared_with": []},
+        {"id": "b", "filename": "b.pdf", "workspace_id": "ws-2", "shared_with": ["ws-1"]}
+    ]
+    mocker.patch("backend.app.core.mongodb.mongodb_manager.get_async_database", return_value=mock_db)
+
+    page = await document_service.list_by_workspace("ws-1", limit=5, sort="filename", order="asc")
+
+    assert page["next_cursor"] is None
+    assert page["documents"][1]["is_shared"] is True
+    query, projection = mock_col.find.call_args[0]
+    assert "minio_path" not in projection and projection["_id"] == 0
+    mock_col.find.return_value.sort.assert_called_with([("filename", 1), ("id", 1)])
 
 @pytest.mark.asyncio
 async def test_workspace_service_create(mocker):
@@ -85,3 +114,80 @@ async def test_document_service_delete(mocker):
     
     mock_minio.assert_called_once_with("ws/doc/v1/test.pdf")
     mock_col.delete_one.assert_called_once_with({"id": "doc-123"})
+
+@pytest.mark.asyncio
+async def test_document_service_get_chunks_pages_in_order(mocker):
+    from types import SimpleNamespace
+    from backend.app.rag.qdrant_provider import qdrant
+    mock_db, mock_col = get_mock_db()
+    mock_col.find_one = AsyncMock(return_value={"id": "doc-1", "workspace_id": "ws-1", "chunks": 1000})
+    mocker.patch("backend.app.core.mongodb.mongodb_manager.get_async_database", return_value=mock_db)
+    mocker.patch.object(qdrant, "get_effective_collection", new=AsyncMock(return_value="knowledge_base_768"))
+    points = [SimpleNamespace(id=f"p{i}", payload={"text": f"chunk {i}", "index": i}) for i in range(900, 903)]
+    scroll = mocker.patch.object(qdrant.client, "scroll", new=AsyncMock(return_value=(points, None)))
+
+    page = await document_service.get_chunks("doc-1", limit=2, start=900)
+
+    assert [c["index"] for c in page["chunks"]] == [900, 901]
+    assert page["next_offset"] == 902 and page["total"] == 1000
+    kwargs = scroll.call_args.kwargs
+    assert kwargs["order_by"].key == "index" and kwargs["order_by"].start_from == 900
+    assert kwargs["limit"] == 3 and kwargs["with_vectors"] is False
+
+@pytest.mark.asyncio
+async def test_document_service_inspect_reads_dimension_from_config(mocker):
+    from types import SimpleNamespace
+    from backend.app.rag.qdrant_provider import qdrant
+    mock_db, mock_col = get_mock_db()
+    mock_col.find_one = AsyncMock(return_value={"id": "doc-1", "workspace_id": "ws-1"})
+    mocker.patch("backend.app.core.mongodb.mongodb_manager.get_async_database", return_value=mock_db)
+    mocker.patch.object(qdrant, "get_effective_collection", new=AsyncMock(return_value="knowledge_base_768"))
+    scroll = mocker.patch.object(qdrant.client, "scroll", new=AsyncMock(return_value=([SimpleNamespace(id="p0", payload={"index": 0})], None)))
+    config = SimpleNamespace(config=SimpleNamespace(params=SimpleNamespace(vectors=SimpleNamespace(size=768))))
+    mocker.patch.object(qdrant.client, "get_collection", new=AsyncMock(return_value=config))
+
+    points = await document_service.inspect("doc-1")
+
+    assert points == [{"id": "p0", "payload": {"index": 0}, "vector_size": 768}]
+    assert scroll.call_args.kwargs["with_vectors"] is False
+
+@pytest.mark.asyncio
+async def test_reindex_uses_parse_cache(mocker):
+    from types import SimpleNamespace
+    from langchain_core.documents import Document
+    from backend.app.rag.ingestion import ingestion_pipeline
+    mock_db, mock_col = get_mock_db()
+    mock_col.find_one = AsyncMock(return_value={
+        "id": "doc-1", "filename": "paper.pdf", "extension": ".pdf", "workspace_id": "ws-1",
+        "minio_path": "vault/doc-1/v1/paper.pdf", "content_hash": "h1", "rag_config_hash": "old",
+        "text_artifact": {"path": "vault/doc-1/v1/paper.pdf.text.gz"}
+    })
+    mocker.patch("backend.app.core.mongodb.mongodb_manager.get_async_database", return_value=mock_db)
+    mocker.patch("backend.app.services.document_service.settings_manager.get_settings", new=AsyncMock(return_value=SimpleNamespace(get_rag_hash=lambda: "new")))
+    pages = [Document(page_content="page one", metadata={"page": 0})]
+    mocker.patch("backend.app.services.document_service.parse_cache.load", new=AsyncMock(return_value=pages))
+    get_file = mocker.patch("backend.app.services.document_service.minio_manager.get_file")
+    mocker.patch.object(ingestion_pipeline, "initialize", new=AsyncMock())
+    index = mocker.patch.object(ingestion_pipeline, "index_documents", new=AsyncMock(return_value=1))
+    mocker.patch("backend.app.services.document_service.content_generations.bump", new=AsyncMock())
+
+    await document_service.update_workspaces("paper.pdf", "ws-2", "share", force_reindex=True)
+
+    get_file.assert_not_called()
+    assert index.call_args.args[0] is pages
+    assert index.call_args.kwargs["metadata"]["workspace_id"] == "ws-2"
+
+@pytest.mark.asyncio
+async def test_parse_cache_miss_is_not_an_error(mocker, caplog):
+    from minio.error import S3Error
+    from backend.app.core.minio import minio_manager
+    from backend.app.rag.parse_cache import parse_cache
+    client = MagicMock()
+    client.stat_object.side_effect = S3Error(None, "NoSuchKey", "Object does not exist", "parsed/h1", "req", "host")
+    mocker.patch.object(type(minio_manager), "client", new=client)
+
+    with caplog.at_level("ERROR"):
+        assert await parse_cache.load("h1") is None
+
+    client.get_object.assert_not_called()
+    assert not caplog.records
@@ -0,0 +1,62 @@
+import pytest
+import numpy as np
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from backend.app.rag.similarity_graph import similarity_edges, similarity_graph_cache
+from backend.app.services.workspace_service import workspace_service
+
+def _pairwise_edges(doc_ids, vectors, threshold):
+    """Reference: the full O(N^2) comparison."""
+    edges = set()
+    for i in range(len(doc_ids)):
+        for j in range(i + 1, len(doc_ids)):
+            v1, v2 = np.array(vectors[i]), np.array(vectors[j])
+            if np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2)) > threshold:
+                edges.add((doc_ids[i], doc_ids[j]))
+    return edges
+
+def test_blockwise_edges_match_pairwise_when_k_covers_all():
+    rng = np.random.default_rng(0)
+    base = rng.normal(size=(4, 16))
+    # Clusters of near-duplicate documents around a few topics
+    vectors = [(base[i % 4] + rng.normal(scale=0.3, size=16)).tolist() for i in range(40)]
+    doc_ids = [f"d{i}" for i in range(40)]
+
+    edges = similarity_edges(doc_ids, vectors, threshold=0.75, top_k=39, block_size=7)
+
+    assert {(e["source"], e["target"]) for e in edges} == _pairwise_edges(doc_ids, vectors, 0.75)
+    assert all(e["value"] > 0.75 for e in edges)
+
+def test_top_k_bounds_edges_per_document():
+    doc_ids = [f"d{i}" for i in range(20)]
+    vectors = [[1.0, 0.01 * i] for i in range(20)]  # Everything is similar to everything
+
+    edges = similarity_edges(doc_ids, vectors, top_k=2, block_size=8)
+
+    # Each document contributes at most k edges, pairs chosen by both ends count once
+    assert len(edges) <= 20 * 2
+    assert len({(e["source"], e["target"]) for e in edges}) == len(edges)
+    assert similarity_edges(["d0"], [[1.0, 0.0]]) == []
+
+@pytest.mark.asyncio
+async def test_graph_is_cached_per_content_generation(mocker):
+    similarity_graph_cache.clear()
+    mocker.patch("backend.app.core.settings_manager.settings_manager.get_settings", new=AsyncMock(return_value=SimpleNamespace(embedding_dim=2)))
+    generation = mocker.patch("backend.app.services.workspace_service.content_generations.get", new=AsyncMock(return_value=1))
+    centroids = mocker.patch(
+        "backend.app.services.workspace_service.qdrant.get_document_centroids",
+        new=AsyncMock(return_value={
+            "d1": {"vector": [1.0, 0.0], "name": "a.pdf"},
+            "d2": {"vector": [0.9, 0.1], "name": "b.pdf"},
+        })
+    )
+
+    first = await workspace_service.get_graph_data("ws1")
+    second = await workspace_service.get_graph_data("ws1")
+    assert [n["id"] for n in first["nodes"]] == ["d1", "d2"]
+    assert [(e["source"], e["target"]) for e in first["edges"]] == [("d1", "d2")]
+    assert second is first and centroids.await_count == 1
+
+    generation.return_value = 2
+    await workspace_service.get_graph_data("ws1")
+    assert centroids.await_count == 2
@@ -0,0 +1,47 @@
+import asyncio
+import json
+import pytest
+from backend.app.core.sse import SSEEncoder, HEARTBEAT_FRAME
+
+async def collect(encoder, events):
+    async def source():
+        for event in events:
+            if event == "pause":
+                await asyncio.sleep(0.05)
+            else:
+                yield event
+    return [frame async for frame in encoder.frames(source())]
+
+def parse(frame):
+    return json.loads(frame[len("data: "):])
+
+@pytest.mark.asyncio
+async def test_content_deltas_are_coalesced_in_order():
+    encoder = SSEEncoder(coalesce_ms=1000, coalesce_bytes=1024, heartbeat_seconds=60)
+    frames = await collect(encoder, [
+        {"type": "reasoning", "steps": ["a"]},
+        {"type": "content", "delta": "Hel"},
+        {"type": "content", "delta": "lo"},
+        {"type": "tool_start", "tool": "calculator"},
+        {"type": "content", "delta": "!"},
+    ])
+    assert [parse(f) for f in frames] == [
+        {"type": "reasoning", "steps": ["a"]},
+        {"type": "content", "delta": "Hello"},
+        {"type": "tool_start", "tool": "calculator"},
+        {"type": "content", "delta": "!"},
+    ]
+
+@pytest.mark.asyncio
+async def test_size_window_flushes_early():
+    encoder = SSEEncoder(coalesce_ms=1000, coalesce_bytes=4, heartbeat_seconds=60)
+    frames = await collect(encoder, [{"type": "content", "delta": "ab"}] * 4)
+    assert [parse(f)["delta"] for f in frames] == ["abab", "abab"]
+
+@pytest.mark.asyncio
+async def test_heartbeat_sent_when_idle():
+    encoder = SSEEncoder(coalesce_ms=5, coalesce_bytes=1024, heartbeat_seconds=0.01)
+    frames = await collect(encoder, [{"type": "content", "delta": "x"}, "pause", {"type": "content", "delta": "y"}])
+    assert parse(frames[0])["delta"] == "x"
+    assert HEARTBEAT_FRAME in frames
+    assert parse(frames[-1])["delta"] == "y"
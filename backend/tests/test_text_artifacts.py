@@ -0,0 +1,37 @@
+import gzip
+import pytest
+from backend.app.core import text_artifacts as module
+from backend.app.core.text_artifacts import text_artifacts, text_path
+
+def test_blocks_form_a_valid_gzip_file(mocker):
+    mocker.patch.object(module, "BLOCK_SIZE", 16)
+    text = "Überblick: " + "abcdefghij" * 10
+    data, index = text_artifacts.build(text)
+    assert gzip.decompress(data).decode("utf-8") == text
+    assert index["offsets"][-1] == len(data) and len(index["offsets"]) == -(-index["length"] // 16) + 1
+
+def test_range_reads_only_covering_blocks(mocker):
+    mocker.patch.object(module, "BLOCK_SIZE", 16)
+    text = "".join(chr(ord("a") + i % 26) for i in range(100))
+    data, index = text_artifacts.build(text)
+    meta = {"path": text_path("vault/d1/v1/a.txt"), **index}
+    reads = []
+
+    def get_file_range(name, offset, length):
+        reads.append(offset)
+        return data[offset:offset + length]
+
+    mocker.patch.object(module.minio_manager, "get_file_range", side_effect=get_file_range)
+
+    assert b"".join(text_artifacts.iter_range(meta, 20, 40)).decode() == text[20:41]
+    assert reads == [index["offsets"][1], index["offsets"][2]]
+    assert text_artifacts.read(meta) == text
+
+def test_parse_range():
+    assert text_artifacts.parse_range(None, 100) is None
+    assert text_artifacts.parse_range("bytes=10-19", 100) == (10, 19)
+    assert text_artifacts.parse_range("bytes=90-", 100) == (90, 99)
+    assert text_artifacts.parse_range("bytes=-5", 100) == (95, 99)
+    assert text_artifacts.parse_range("bytes=0-1,5-6", 100) is None
+    with pytest.raises(ValueError):
+        text_artifacts.parse_range("bytes=100-", 100)
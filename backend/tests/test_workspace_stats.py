@@ -0,0 +1,48 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from backend.app.core.workspace_stats import workspace_stats
+
+class AsyncCursor:
+    def __init__(self, rows):
+        self._rows = list(rows)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self._rows:
+            raise StopAsyncIteration
+        return self._rows.pop(0)
+
+@pytest.mark.asyncio
+async def test_inc_uses_atomic_increment(mocker):
+    mock_db = MagicMock()
+    mock_db.workspaces.update_one = AsyncMock()
+    mocker.patch("backend.app.core.workspace_stats.mongodb_manager.get_async_database", return_value=mock_db)
+
+    await workspace_stats.inc("ws1", doc_count=1, chunk_count=0, size_bytes=2048)
+
+    mock_db.workspaces.update_one.assert_awaited_once_with(
+        {"id": "ws1"}, {"$inc": {"stats.doc_count": 1, "stats.size_bytes": 2048}}
+    )
+
+@pytest.mark.asyncio
+async def test_reconcile_corrects_drift_only(mocker):
+    mock_db = MagicMock()
+    mock_db.documents.aggregate.return_value = AsyncCursor([
+        {"_id": "ws1", "doc_count": 2, "chunk_count": 30, "size_bytes": 500},
+    ])
+    mock_db.thread_metadata.aggregate.return_value = AsyncCursor([{"_id": "ws1", "n": 4}])
+    mock_db.workspaces.find.return_value = AsyncCursor([
+        {"_id": 1, "id": "ws1", "stats": {"doc_count": 3, "thread_count": 4, "chunk_count": 30, "size_bytes": 500}},
+        {"_id": 2, "id": "ws2", "stats": {"doc_count": 0, "thread_count": 0, "chunk_count": 0, "size_bytes": 0}},
+        {"_id": 3, "id": "ws3"},
+    ])
+    mock_db.workspaces.bulk_write = AsyncMock()
+    mocker.patch("backend.app.core.workspace_stats.mongodb_manager.get_async_database", return_value=mock_db)
+
+    assert await workspace_stats.reconcile() == 1
+
+    ops = mock_db.workspaces.bulk_write.call_args.args[0]
+    assert ops[0]._filter == {"_id": 1}
+    assert ops[0]._doc["$set"]["stats"]["doc_count"] == 2
@@ -0,0 +1,75 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from backend.app.services.workspace_service import workspace_service
+from backend.app.services.task_service import task_service
+
+def _find_result(docs):
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(return_value=docs)
+    return cursor
+
+@pytest.fixture
+def mock_db(mocker):
+    db = MagicMock()
+    owned = [
+        {"id": "d1", "minio_path": "vault/d1/a.pdf", "content_hash": "h1"},
+        {"id": "d2", "minio_path": "vault/d2/b.pdf", "content_hash": "h2"},
+    ]
+    linked = [
+        {"minio_path": "vault/d1/a.pdf", "workspace_id": "ws1", "chunks": 3, "size_bytes": 10},
+        {"minio_path": "vault/d2/b.pdf", "workspace_id": "ws1", "chunks": 4, "size_bytes": 20},
+        # Another workspace's copy of b.pdf
+        {"minio_path": "vault/d2/b.pdf", "workspace_id": "ws2", "chunks": 4, "size_bytes": 20},
+    ]
+
+    def documents_find(query, projection=None):
+        if "minio_path" in query:
+            return _find_result(linked)
+        if "shared_with" in query:
+            return _find_result([{"id": "d9"}])
+        return _find_result(owned)
+
+    db.documents.find.side_effect = documents_find
+    for col in (db.documents, db.workspaces):
+        col.update_many = AsyncMock()
+        col.delete_many = AsyncMock()
+        col.delete_one = AsyncMock()
+    thread_col = MagicMock()
+    thread_col.distinct = AsyncMock(return_value=["t1"])
+    thread_col.delete_many = AsyncMock()
+    thread_col.delete_one = AsyncMock()
+    db.__getitem__.return_value = thread_col
+    mocker.patch("backend.app.services.workspace_service.mongodb_manager.get_async_database", return_value=db)
+    return db
+
+@pytest.mark.asyncio
+async def test_vault_teardown_uses_bulk_operations(mocker, mock_db):
+    from backend.app.rag.qdrant_provider import qdrant
+
+    mocker.patch("backend.app.core.settings_manager.settings_manager.get_settings", new=AsyncMock(return_value=SimpleNamespace(embedding_dim=1536)))
+    collections = [SimpleNamespace(name=n) for n in ("knowledge_base_1536", "knowledge_base_768", "doc_other")]
+    mocker.patch.object(qdrant.client, "get_collections", new=AsyncMock(return_value=SimpleNamespace(collections=collections)))
+    mocker.patch.object(qdrant.client, "collection_exists", new=AsyncMock(return_value=True))
+    qdrant_delete = mocker.patch.object(qdrant.client, "delete", new=AsyncMock())
+    delete_files = mocker.patch("backend.app.services.workspace_service.minio_manager.delete_files", return_value=0)
+    stats_inc = mocker.patch("backend.app.services.workspace_service.workspace_stats.inc", new=AsyncMock())
+    mocker.patch("backend.app.services.workspace_service.content_generations.bump", new=AsyncMock())
+
+    task_id = task_service.create_task("workspace_teardown")
+    await workspace_service.run_teardown(task_id, "ws1", vault_delete=True)
+
+    task = task_service.get_task(task_id)
+    assert task["status"] == "completed" and task["progress"] == 100
+    # One content_hash delete per knowledge collection, plus one workspace-scoped delete,
+    # each mirrored on the matching centroid collection
+    deleted = [c.kwargs["collection_name"] for c in qdrant_delete.await_args_list]
+    assert sorted(deleted) == sorted([
+        "knowledge_base_1536", "knowledge_base_768", "knowledge_base_1536",
+        "doc_centroids_1536", "doc_centroids_768", "doc_centroids_1536",
+    ])
+    # The file still referenced by ws2's record is kept
+    delete_files.assert_called_once_with(["vault/d1/a.pdf", "vault/d1/a.pdf.text.gz", "parsed/h1/v1.json.gz"])
+    mock_db.documents.delete_many.assert_awaited_once_with({"minio_path": {"$in": mocker.ANY}})
+    stats_inc.assert_awaited_once_with("ws2", doc_count=-1, chunk_count=-4, size_bytes=-20)
+    mock_db.workspaces.delete_one.assert_awaited_once_with({"id": "ws1"})
@@ -17,7 +17,7 @@ import Link from 'next/link';
 interface InspectedPoint {
     id: string | number;
     vector_size: number;
-    vector_preview: number[];
+    vector_preview?: number[];
     payload: {
         text?: string;
         [key: string]: unknown;
@@ -25,7 +25,7 @@ interface InspectedPoint {
 }
 
 export default function DocumentsPage() {
-    const { documents, isLoading, deleteDocument, updateWorkspaceAction, inspectDocument } = useDocuments();
+    const { documents, isLoading, hasMore, loadMore, deleteDocument, updateWorkspaceAction, inspectDocument } = useDocuments();
     const { workspaces } = useWorkspaces();
 
     const [searchTerm, setSearchTerm] = useState('');
@@ -302,6 +302,17 @@ export default function DocumentsPage() {
                                 )}
                             </tbody>
                         </table>
+                        {hasMore && (
+                            <div className="flex justify-center p-4 border-t border-white/5">
+                                <button
+                                    onClick={loadMore}
+                                    disabled={isLoading}
+                                    className="px-4 py-2 rounded-xl text-tiny font-bold uppercase tracking-widest text-gray-400 hover:text-white hover:bg-white/5 transition-all disabled:opacity-50"
+                                >
+                                    {isLoading ? 'Loading...' : 'Load more'}
+                                </button>
+                            </div>
+                        )}
                     </div>
                 </div>
             </div>
@@ -378,12 +389,14 @@ export default function DocumentsPage() {
                                                     </span>
                                                 </div>
                                                 <div className="space-y-4">
-                                                    <div>
-                                                        <div className="text-tiny font-black text-gray-600 uppercase tracking-widest mb-2 pr-2">Vector Preview</div>
-                                                        <div className="bg-[#121214] p-3 rounded-xl text-indigo-300/60 overflow-x-auto whitespace-nowrap text-tiny">
-                                                            [{point.vector_preview.map((v: number) => v.toFixed(4)).join(', ')} ... ]
+                                                    {point.vector_preview && point.vector_preview.length > 0 && (
+                                                        <div>
+                                                            <div className="text-tiny font-black text-gray-600 uppercase tracking-widest mb-2 pr-2">Vector Preview</div>
+                                                            <div className="bg-[#121214] p-3 rounded-xl text-indigo-300/60 overflow-x-auto whitespace-nowrap text-tiny">
+                                                                [{point.vector_preview.map((v: number) => v.toFixed(4)).join(', ')} ... ]
+                                                            </div>
                                                         </div>
-                                                    </div>
+                                                    )}
                                                     <div>
                                                         <div className="text-tiny font-black text-gray-600 uppercase tracking-widest mb-2 pr-2">Payload Content</div>
                                                         <div className="bg-[#121214] p-4 rounded-xl text-gray-400 leading-relaxed max-h-32 overflow-y-auto custom-scrollbar whitespace-pre-wrap">
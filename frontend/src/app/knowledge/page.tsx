@@ -21,6 +21,7 @@ import { motion, AnimatePresence } from 'framer-motion';
 import { cn } from '@/lib/utils';
 import { API_ROUTES } from '@/lib/api-config';
 import { SourceViewer } from '@/components/source-viewer';
+import { fetchAllDocuments } from '@/hooks/use-documents';
 
 interface Document {
     name: string;
@@ -38,11 +39,8 @@ export default function KnowledgePage() {
 
     const fetchDocuments = async () => {
         try {
-            const res = await fetch(API_ROUTES.DOCUMENTS);
-            if (res.ok) {
-                const data = await res.json();
-                setDocuments(data);
-            }
+            const docs = await fetchAllDocuments<Document>(API_ROUTES.DOCUMENTS);
+            if (docs) setDocuments(docs);
         } catch (err) {
             console.error('Failed to fetch documents', err);
         } finally {
@@ -3,6 +3,7 @@
 import React, { useState, useRef, useEffect, useCallback } from 'react';
 import { useParams } from 'next/navigation';
 import { useChat, Message } from '@/hooks/use-chat';
+import { fetchAllThreads, Thread } from '@/hooks/use-threads';
 import { useSettings } from '@/hooks/use-settings';
 import { cn } from '@/lib/utils';
 import { API_BASE_URL } from '@/lib/api-config';
@@ -15,13 +16,6 @@ import { CitationModal } from '@/components/chat/citation';
 
 type ChatMode = 'fast' | 'thinking' | 'reasoning';
 
-interface Thread {
-    id: string;
-    title: string;
-    last_active: string;
-    message_count: number;
-}
-
 interface Source {
     id: number;
     name: string;
@@ -32,7 +26,10 @@ export default function ChatPage() {
     const params = useParams();
     const workspaceId = params.id as string;
 
-    const { messages, isLoading, sendMessage, clearChat, threadId, setThreadId } = useChat(workspaceId);
+    const {
+        messages, isLoading, sendMessage, clearChat, threadId, setThreadId,
+        hasEarlier, isLoadingEarlier, loadEarlier
+    } = useChat(workspaceId);
     const { settings, updateSettings } = useSettings();
 
     const [input, setInput] = useState('');
@@ -42,22 +39,33 @@ export default function ChatPage() {
     const [threads, setThreads] = useState<Thread[]>([]);
     const [isLoadingThreads, setIsLoadingThreads] = useState(false);
     const scrollRef = useRef<HTMLDivElement>(null);
+    // Distance from the bottom to keep while older messages are prepended
+    const keepOffsetRef = useRef<number | null>(null);
 
     useEffect(() => {
-        if (scrollRef.current) {
-            scrollRef.current.scrollTop = scrollRef.current.scrollHeight;
+        const el = scrollRef.current;
+        if (!el) return;
+        if (keepOffsetRef.current !== null) {
+            el.scrollTop = el.scrollHeight - keepOffsetRef.current;
+            keepOffsetRef.current = null;
+        } else {
+            el.scrollTop = el.scrollHeight;
         }
     }, [messages]);
 
+    const handleLoadEarlier = async () => {
+        if (scrollRef.current) {
+            keepOffsetRef.current = scrollRef.current.scrollHeight - scrollRef.current.scrollTop;
+        }
+        await loadEarlier();
+    };
+
     // Fetch threads when history panel opens
     const fetchThreads = useCallback(async () => {
         setIsLoadingThreads(true);
         try {
-            const res = await fetch(`${API_BASE_URL}/chat/threads?workspace_id=${workspaceId}`);
-            if (res.ok) {
-                const data = await res.json();
-                setThreads(data.threads || []);
-            }
+            const all = await fetchAllThreads(workspaceId);
+            if (all) setThreads(all);
         } catch {
             // ignore
         } finally {
@@ -216,7 +224,7 @@ export default function ChatPage() {
                                             </p>
                                         </div>
                                         <div className="flex items-center gap-2 text-tiny text-gray-500 font-medium">
-                                            <span>{formatDate(thread.last_active)}</span>
+                                            <span>{thread.last_active ? formatDate(thread.last_active) : 'No activity'}</span>
                                             <span className="w-1 h-1 rounded-full bg-gray-800" />
                                             <span>{thread.message_count} messages</span>
                                         </div>
@@ -303,15 +311,29 @@ export default function ChatPage() {
                             </div>
                         </div>
                     ) : (
-                        messages.map((message) => (
-                            <ChatMessage
-                                key={message.id}
-                                message={message}
-                                showReasoning={mode === 'reasoning'}
-                                isLoading={isLoading && message.id === messages[messages.length - 1].id}
-                                onCitationClick={(id) => handleCitationClick(id, message)}
-                            />
-                        ))
+                        <>
+                            {hasEarlier && (
+                                <div className="flex justify-center">
+                                    <button
+                                        onClick={handleLoadEarlier}
+                                        disabled={isLoadingEarlier}
+                                        className="flex items-center gap-2 px-4 py-2 rounded-xl bg-white/5 hover:bg-white/10 border border-white/5 text-caption text-gray-400 hover:text-white transition-all disabled:opacity-50"
+                                    >
+                                        {isLoadingEarlier ? <Loader2 size={14} className="animate-spin" /> : <History size={14} />}
+                                        Load earlier messages
+                                    </button>
+                                </div>
+                            )}
+                            {messages.map((message) => (
+                                <ChatMessage
+                                    key={message.id}
+                                    message={message}
+                                    showReasoning={mode === 'reasoning'}
+                                    isLoading={isLoading && message.id === messages[messages.length - 1].id}
+                                    onCitationClick={(id) => handleCitationClick(id, message)}
+                                />
+                            ))}
+                        </>
                     )}
 
                     {/* Loading Indicator */}
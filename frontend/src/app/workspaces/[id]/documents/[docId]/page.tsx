@@ -1,6 +1,6 @@
 'use client';
 
-import React, { useEffect, useState } from 'react';
+import React, { useCallback, useEffect, useState } from 'react';
 import { useParams, useRouter } from 'next/navigation';
 import {
     FileText, ArrowLeft, Database, Calendar,
@@ -51,6 +51,7 @@ export default function DocumentDetailPage() {
     const [error, setError] = useState<string | null>(null);
     const [activeTab, setActiveTab] = useState<'info' | 'chunks'>('info');
     const [chunks, setChunks] = useState<Chunk[]>([]);
+    const [nextChunkOffset, setNextChunkOffset] = useState<number | null>(null);
     const [isChunksLoading, setIsChunksLoading] = useState(false);
 
     useEffect(() => {
@@ -73,26 +74,28 @@ export default function DocumentDetailPage() {
         fetchDocument();
     }, [docId, workspaceId]);
 
-    useEffect(() => {
-        const fetchChunks = async () => {
-            setIsChunksLoading(true);
-            try {
-                const res = await fetch(`${API_BASE_URL}/documents/${docId}/chunks?workspace_id=${workspaceId}`);
-                if (res.ok) {
-                    const data = await res.json();
-                    setChunks(data);
-                }
-            } catch (err) {
-                console.error('Failed to fetch chunks', err);
-            } finally {
-                setIsChunksLoading(false);
+    // Chunks come in reading order; next_offset is the chunk index the following page starts at
+    const fetchChunks = useCallback(async (start: number = 0) => {
+        setIsChunksLoading(true);
+        try {
+            const res = await fetch(`${API_BASE_URL}/documents/${docId}/chunks?workspace_id=${workspaceId}&start=${start}`);
+            if (res.ok) {
+                const data = await res.json();
+                setChunks(prev => start > 0 ? [...prev, ...data.chunks] : data.chunks);
+                setNextChunkOffset(data.next_offset);
             }
-        };
+        } catch (err) {
+            console.error('Failed to fetch chunks', err);
+        } finally {
+            setIsChunksLoading(false);
+        }
+    }, [docId, workspaceId]);
 
+    useEffect(() => {
         if (activeTab === 'chunks' && chunks.length === 0) {
             fetchChunks();
         }
-    }, [activeTab, chunks.length, docId, workspaceId]);
+    }, [activeTab, chunks.length, fetchChunks]);
 
     if (isLoading) {
         return (
@@ -241,11 +244,11 @@ export default function DocumentDetailPage() {
                                 Index Chunks ({document.chunks})
                             </h2>
                             <div className="text-tiny text-gray-500 bg-white/5 px-2 py-1 rounded border border-white/5">
-                                Showing first {chunks.length} chunks
+                                Showing {chunks.length} of {document.chunks} chunks
                             </div>
                         </div>
 
-                        {isChunksLoading ? (
+                        {isChunksLoading && chunks.length === 0 ? (
                             <div className="flex flex-col items-center justify-center py-24 gap-4">
                                 <Loader2 className="w-8 h-8 text-blue-500 animate-spin" />
                                 <p className="text-caption text-gray-500">Retrieving chunks from vector store...</p>
@@ -255,6 +258,15 @@ export default function DocumentDetailPage() {
                                 {chunks.map((chunk) => (
                                     <ChunkCard key={chunk.id} chunk={chunk} />
                                 ))}
+                                {nextChunkOffset !== null && (
+                                    <button
+                                        onClick={() => fetchChunks(nextChunkOffset)}
+                                        disabled={isChunksLoading}
+                                        className="px-4 py-2 rounded-lg bg-white/5 hover:bg-white/10 text-caption text-gray-400 disabled:opacity-50"
+                                    >
+                                        {isChunksLoading ? 'Loading...' : 'Load more chunks'}
+                                    </button>
+                                )}
                             </div>
                         ) : (
                             <div className="text-center py-24 bg-[#121214] rounded-3xl border border-dashed border-white/5">
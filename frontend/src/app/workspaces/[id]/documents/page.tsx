@@ -11,6 +11,7 @@ import { API_BASE_URL } from '@/lib/api-config';
 import { useError } from '@/context/error-context';
 import { cn } from '@/lib/utils';
 import { DocumentGraph } from '@/components/documents/document-graph';
+import { fetchAllDocuments } from '@/hooks/use-documents';
 
 interface Document {
     id: string;
@@ -40,11 +41,8 @@ export default function DocumentsPage() {
     const fetchDocuments = useCallback(async (showLoading = true) => {
         if (showLoading) setIsLoading(true);
         try {
-            const res = await fetch(`${API_BASE_URL}/documents?workspace_id=${workspaceId}`);
-            if (res.ok) {
-                const data = await res.json();
-                setDocuments(data);
-            }
+            const docs = await fetchAllDocuments<Document>(`${API_BASE_URL}/documents?workspace_id=${workspaceId}`);
+            if (docs) setDocuments(docs);
         } catch (err) {
             console.error('Failed to fetch documents', err);
         } finally {
@@ -13,6 +13,7 @@ import { SourceViewer } from '@/components/source-viewer';
 import { cn } from '@/lib/utils';
 import { motion, AnimatePresence } from 'framer-motion';
 import { useError } from '@/context/error-context';
+import { fetchAllDocuments } from '@/hooks/use-documents';
 
 interface Document {
     id?: string;
@@ -79,10 +80,9 @@ export function KnowledgeBase({ workspaceId = "default", isSidebar = false, isGl
                 ? API_ROUTES.DOCUMENTS_ALL
                 : `${API_ROUTES.DOCUMENTS}?workspace_id=${encodeURIComponent(workspaceId)}`;
 
-            const res = await fetch(url);
-            if (res.ok) {
-                const data: BackendDocument[] = await res.json();
-                const mappedDocs = data.map((doc) => ({
+            const docs = await fetchAllDocuments<BackendDocument>(url);
+            if (docs) {
+                const mappedDocs = docs.map((doc) => ({
                     id: doc.id,
                     name: doc.filename,
                     extension: doc.extension,
@@ -12,13 +12,22 @@ export interface Message {
     sources?: Array<{ id: number, name: string, content: string }>;
 }
 
+export interface HistoryPage {
+    messages: Message[];
+    next_cursor: number | null;
+}
+
 export function useChat(workspaceId: string = "default") {
     const [messages, setMessages] = useState<Message[]>([]);
     const [threadId, setThreadId] = useState<string>('default');
+    // `before` cursor of the next older history page, null once the thread start is loaded
+    const [historyCursor, setHistoryCursor] = useState<number | null>(null);
+    const [isLoadingEarlier, setIsLoadingEarlier] = useState(false);
 
     // Clear messages when workspaceId changes
     useEffect(() => {
         setMessages([]);
+        setHistoryCursor(null);
     }, [workspaceId]);
 
     // Initialize or sync threadId from localStorage when workspaceId changes
@@ -38,12 +47,18 @@ export function useChat(workspaceId: string = "default") {
     const [isLoading, setIsLoading] = useState(false);
     const { showError } = useError();
 
-    const fetchHistory = useCallback(async (id: string) => {
+    // Pages are keyset-based: pass the previous page's next_cursor as `before` to load older messages
+    const fetchHistory = useCallback(async (id: string, before: number | null = null) => {
         try {
-            const res = await fetch(API_ROUTES.CHAT_HISTORY(id));
+            const url = new URL(API_ROUTES.CHAT_HISTORY(id));
+            url.searchParams.append('limit', '50');
+            url.searchParams.append('include_details', 'true');
+            if (before !== null) url.searchParams.append('before', String(before));
+            const res = await fetch(url.toString());
             if (res.ok) {
-                const data = await res.json();
-                setMessages(data.messages);
+                const data: HistoryPage = await res.json();
+                setMessages(prev => before !== null ? [...data.messages, ...prev] : data.messages);
+                setHistoryCursor(data.next_cursor);
             } else {
                 showError("History Retrieval Failed", "The server could not retrieve chat history for this thread.", `ID: ${id}`);
             }
@@ -60,8 +75,19 @@ export function useChat(workspaceId: string = "default") {
         }
     }, [threadId, fetchHistory]);
 
+    const loadEarlier = useCallback(async () => {
+        if (historyCursor === null || isLoadingEarlier) return;
+        setIsLoadingEarlier(true);
+        try {
+            await fetchHistory(threadId, historyCursor);
+        } finally {
+            setIsLoadingEarlier(false);
+        }
+    }, [threadId, historyCursor, isLoadingEarlier, fetchHistory]);
+
     const clearChat = useCallback(() => {
         setMessages([]);
+        setHistoryCursor(null);
         const newId = Math.random().toString(36).substring(7);
         setThreadId(newId);
         if (typeof window !== 'undefined') {
@@ -185,5 +211,15 @@ export function useChat(workspaceId: string = "default") {
         }
     }, [threadId, workspaceId, showError]);
 
-    return { messages, isLoading, sendMessage, clearChat, threadId, setThreadId };
+    return {
+        messages,
+        isLoading,
+        sendMessage,
+        clearChat,
+        threadId,
+        setThreadId,
+        hasEarlier: historyCursor !== null,
+        isLoadingEarlier,
+        loadEarlier
+    };
 }
@@ -18,21 +18,48 @@ export interface Document {
     points: DocumentPoint[];
 }
 
+export interface DocumentPage<T> {
+    documents: T[];
+    next_cursor: string | null;
+}
+
+// Follows next_cursor until the listing is exhausted, for views that filter or graph
+// every document client-side. Resolves to null when a page request fails.
+export async function fetchAllDocuments<T>(url: string): Promise<T[] | null> {
+    const documents: T[] = [];
+    let cursor: string | null = null;
+    do {
+        const pageUrl = new URL(url);
+        if (cursor) pageUrl.searchParams.set('cursor', cursor);
+        const res = await fetch(pageUrl.toString());
+        if (!res.ok) return null;
+        const data: DocumentPage<T> = await res.json();
+        documents.push(...data.documents);
+        cursor = data.next_cursor;
+    } while (cursor);
+    return documents;
+}
+
 export function useDocuments() {
     const [documents, setDocuments] = useState<Document[]>([]);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
     const [isLoading, setIsLoading] = useState(true);
     const { showError } = useError();
 
-    const fetchDocuments = useCallback(async () => {
+    // Pages are keyset-based: pass the previous page's next_cursor to continue
+    const fetchDocuments = useCallback(async (cursor: string | null = null) => {
         try {
             setIsLoading(true);
-            const res = await fetch(API_ROUTES.DOCUMENTS_ALL);
+            const url = new URL(API_ROUTES.DOCUMENTS_ALL);
+            if (cursor) url.searchParams.append('cursor', cursor);
+            const res = await fetch(url.toString());
             if (!res.ok) {
                 showError("Retrieval Failed", "The system could not load the global document vault.");
                 return;
             }
-            const data = await res.json();
-            setDocuments(data);
+            const data: DocumentPage<Document> = await res.json();
+            setDocuments(prev => cursor ? [...prev, ...data.documents] : data.documents);
+            setNextCursor(data.next_cursor);
         } catch (err) {
             console.error('Failed to fetch all documents:', err);
             showError("Connection Error", "Intelligence vault link offline.");
@@ -115,10 +142,16 @@ export function useDocuments() {
         return null;
     };
 
+    const loadMore = useCallback(async () => {
+        if (nextCursor) await fetchDocuments(nextCursor);
+    }, [nextCursor, fetchDocuments]);
+
     return {
         documents,
         isLoading,
-        refreshDocuments: fetchDocuments,
+        hasMore: nextCursor !== null,
+        loadMore,
+        refreshDocuments: () => fetchDocuments(),
         deleteDocument,
         updateWorkspaceAction,
         inspectDocument
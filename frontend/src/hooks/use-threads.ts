@@ -7,6 +7,32 @@ export interface Thread {
     title: string;
     has_thinking?: boolean;
     tags?: string[];
+    last_active: string | null;
+    message_count: number;
+    preview: string;
+}
+
+export interface ThreadPage {
+    threads: Thread[];
+    next_cursor: string | null;
+}
+
+// Follows next_cursor until every thread of the workspace is listed (most recently active first).
+// Resolves to null when a page request fails.
+export async function fetchAllThreads(workspaceId: string): Promise<Thread[] | null> {
+    const threads: Thread[] = [];
+    let cursor: string | null = null;
+    do {
+        const url = new URL(API_ROUTES.CHAT_THREADS);
+        url.searchParams.set('workspace_id', workspaceId);
+        if (cursor) url.searchParams.set('cursor', cursor);
+        const res = await fetch(url.toString());
+        if (!res.ok) return null;
+        const data: ThreadPage = await res.json();
+        threads.push(...data.threads);
+        cursor = data.next_cursor;
+    } while (cursor);
+    return threads;
 }
 
 export function useThreads(workspaceId: string = "default") {
@@ -17,11 +43,8 @@ export function useThreads(workspaceId: string = "default") {
     const fetchThreads = useCallback(async () => {
         setIsLoading(true);
         try {
-            const res = await fetch(`${API_ROUTES.CHAT_THREADS}?workspace_id=${encodeURIComponent(workspaceId)}`);
-            if (res.ok) {
-                const data = await res.json();
-                setThreads(data.threads || []);
-            }
+            const all = await fetchAllThreads(workspaceId);
+            if (all) setThreads(all);
         } catch (err) {
             console.error('Failed to fetch threads:', err);
         } finally {